@@ -1,10 +1,16 @@
-from .embed_articles import get_embeddings, prepare_article_texts
+from .embed_articles import get_embeddings, get_article_embeddings, prepare_article_texts
+from .embedding_matrix import EmbeddingMatrix
+from .embedding_providers import EmbeddingProvider, get_embedding_provider
 from .cluster_articles import cluster_articles
 from .summarize_clusters import analyze_cluster_topics, analyze_media_bias, generate_report
 from .bias_calculator import calculate_all_clusters_bias, calculate_cluster_bias_score, calculate_cluster_bias_percentage, get_bias_summary_text
 
 __all__ = [
     'get_embeddings',
+    'get_article_embeddings',
+    'EmbeddingMatrix',
+    'EmbeddingProvider',
+    'get_embedding_provider',
     'prepare_article_texts',
     'cluster_articles',
     'analyze_cluster_topics',
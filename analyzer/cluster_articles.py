@@ -1,5 +1,5 @@
 from sklearn.cluster import KMeans
-from .embed_articles import get_embeddings, prepare_article_texts
+from .embed_articles import get_article_embeddings
 
 def find_optimal_clusters(embeddings, max_clusters=10):
     """간단한 방법으로 최적 클러스터 수 찾기"""
@@ -28,17 +28,22 @@ def find_optimal_clusters(embeddings, max_clusters=10):
     print(f"🎯 자동 계산된 최적 클러스터 수: {optimal_k}개")
     return optimal_k
 
-def cluster_articles(openai_client, articles, n_clusters=None):
-    """기사들을 주제별로 클러스터링"""
+def cluster_articles(openai_client, articles, n_clusters=None, supabase=None):
+    """기사들을 주제별로 클러스터링 (supabase를 넘기면 저장된 임베딩 재사용)
+
+    기사에는 cluster_id와 임베딩 행렬의 행 번호(embedding_row)만 붙이고,
+    벡터는 함께 반환하는 EmbeddingMatrix에서 뷰로 꺼내 씁니다.
+
+    Returns:
+        tuple: (clustered_articles, cluster_centers, embedding_matrix), 실패 시 None
+    """
     print(f"\n🎯 {len(articles)}개 기사 클러스터링 시작...")
     
-    # 기사 텍스트 준비
-    texts = prepare_article_texts(articles)
-    
-    # OpenAI 임베딩 생성
-    embeddings = get_embeddings(openai_client, texts)
-    if embeddings is None:
+    # OpenAI 임베딩 생성 (새 기사 / 내용이 바뀐 기사만)
+    embedding_matrix = get_article_embeddings(openai_client, articles, supabase)
+    if embedding_matrix is None:
         return None
+    embeddings = embedding_matrix.array
     
     # 최적 클러스터 수 결정
     if n_clusters is None:
@@ -55,8 +60,8 @@ def cluster_articles(openai_client, articles, n_clusters=None):
     for i, article in enumerate(articles):
         article_with_cluster = article.copy()
         article_with_cluster['cluster_id'] = int(cluster_labels[i])
-        article_with_cluster['embedding'] = embeddings[i].tolist()
+        article_with_cluster['embedding_row'] = i
         clustered_articles.append(article_with_cluster)
     
     print(f"✅ 클러스터링 완료!")
-    return clustered_articles, kmeans.cluster_centers_ 
\ No newline at end of file
+    return clustered_articles, kmeans.cluster_centers_, embedding_matrix
@@ -1,42 +1,133 @@
-import openai
-import numpy as np
-import os
-
-def get_embeddings(openai_client, texts, model=None):
-    """OpenAI Embeddings API로 텍스트 벡터화"""
-    if model is None:
-        model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
+import hashlib
+from db import load_article_embeddings, save_article_embeddings
+from .embedding_cache import get_embedding_cache
+from .embedding_matrix import EmbeddingMatrix
+from .embedding_providers import embedding_model, get_embedding_provider
+from .text_prep import MAX_INPUT_TOKENS, count_tokens, prepare_text, token_usage, truncate_to_tokens
+
+# DB에서 로드하는 본문 앞부분 길이 (상투 문구를 빼고도 토큰 예산을 채울 만큼)
+CONTENT_PREFIX_CHARS = 1000
+
+def get_embeddings(openai_client, texts, model=None, cache=None, provider=None):
+    """텍스트 벡터화 (기본 OpenAI Embeddings API, EMBEDDING_PROVIDER=local이면 로컬 계산)
+
+    디스크 캐시(analyzer/embedding_cache.py)에 있는 텍스트는 API를 호출하지 않고,
+    새로 받은 벡터는 캐시에 저장합니다. cache를 넘기지 않으면 공유 캐시를 사용합니다.
+
+    Returns:
+        EmbeddingMatrix: texts 순서대로의 float32 행렬 (실패 시 None)
+    """
+    provider = provider or get_embedding_provider(openai_client, model)
+    model = provider.name
+    if not provider.persistent:
+        cache = False  # 다시 계산하는 편이 빠름
+    elif cache is None:
+        cache = get_embedding_cache()
     try:
-        # 텍스트가 너무 길면 자르기 (토큰 제한)
-        processed_texts = []
-        for text in texts:
-            # 제목과 본문 앞부분만 사용 (약 8000자 제한)
-            truncated = text[:8000] if len(text) > 8000 else text
-            processed_texts.append(truncated)
+        # 텍스트가 너무 길면 자르기 (모델의 입력 하나당 토큰 제한)
+        processed_texts = [truncate_to_tokens(text, MAX_INPUT_TOKENS, model) for text in texts]
         
-        print(f"🔄 {len(processed_texts)}개 텍스트의 임베딩 생성 중...")
+        embeddings = [cache.get(model, text) if cache else None for text in processed_texts]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
         
-        response = openai_client.embeddings.create(
-            input=processed_texts,
-            model=model,
-        )
-        
-        embeddings = [data.embedding for data in response.data]
+        if missing:
+            print(f"🔄 {len(missing)}개 텍스트의 임베딩 생성 중... (캐시 적중 {len(processed_texts) - len(missing)}개)")
+            missing_texts = [processed_texts[i] for i in missing]
+            
+            def store_batch(indices, batch_embeddings):
+                # 성공한 배치는 바로 캐시에 저장 (다른 배치가 실패해도 다음 실행 때 재사용)
+                if cache:
+                    for index, embedding in zip(indices, batch_embeddings):
+                        cache.put(model, missing_texts[index], embedding)
+            
+            new_embeddings = provider.embed(missing_texts, on_batch=store_batch)
+            for i, embedding in zip(missing, new_embeddings):
+                embeddings[i] = embedding
+            
+            failed = sum(1 for embedding in new_embeddings if embedding is None)
+            if failed:
+                print(f"❌ 임베딩 생성 실패: {failed}개 텍스트 (성공한 배치는 캐시에 저장됨)")
+                return None
         print(f"✅ 임베딩 생성 완료: {len(embeddings)}개")
+        if cache:
+            cache.print_stats()
         
-        return np.array(embeddings)
+        return EmbeddingMatrix.from_rows(embeddings)
         
     except Exception as e:
         print(f"❌ 임베딩 생성 실패: {e}")
         return None
 
-def prepare_article_texts(articles):
-    """기사 텍스트 준비 (제목 + 본문 앞부분)"""
+def prepare_article_texts(articles, token_budget=None, model=None):
+    """기사 텍스트 준비 (제목 + 상투 문구를 뺀 앞 문단, 토큰 예산 EMBEDDING_TOKEN_BUDGET까지)"""
+    model = embedding_model(model)
     texts = []
     for article in articles:
-        title = article.get('title', '')
-        content = article.get('content', '')
-        # 제목과 본문 앞 500자를 합쳐서 사용
-        combined_text = f"{title}\n\n{content[:500]}"
-        texts.append(combined_text)
-    return texts 
\ No newline at end of file
+        title = article.get('title') or ''
+        content = article.get('content') or ''
+        texts.append(prepare_text(title, content, token_budget, model))
+    token_usage.record('prepare', model, sum(count_tokens(text, model) for text in texts), texts=len(texts))
+    return texts 
+
+def content_hash(text):
+    """임베딩한 텍스트의 해시 (기사 내용이 바뀌었는지 확인용)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def get_article_embeddings(openai_client, articles, supabase=None, model=None):
+    """기사 임베딩 반환 (저장된 임베딩 재사용, 새 기사나 내용이 바뀐 기사만 API 호출)
+
+    supabase가 없거나 기사에 id가 없으면 저장소를 쓰지 않고 모두 새로 임베딩합니다.
+    로컬 임베딩(EMBEDDING_PROVIDER=local)은 저장소를 쓰지 않고 매번 계산합니다.
+
+    Returns:
+        EmbeddingMatrix: 기사 순서대로의 float32 임베딩 행렬, i번째 행이 articles[i] (실패 시 None)
+    """
+    texts = prepare_article_texts(articles)
+    provider = get_embedding_provider(openai_client, model)
+    if supabase is None or not provider.persistent:
+        return get_embeddings(openai_client, texts, provider=provider)
+
+    model = provider.name
+    hashes = [content_hash(text) for text in texts]
+    article_ids = [article.get('id') for article in articles]
+    stored = load_article_embeddings(supabase, [i for i in article_ids if i is not None], model)
+
+    reused = {}
+    missing = []
+    for index, (article_id, text_hash) in enumerate(zip(article_ids, hashes)):
+        cached = stored.get(article_id)
+        if cached and cached[0] == text_hash:
+            reused[index] = cached[1]
+        else:
+            missing.append(index)
+    print(f"📦 저장된 임베딩 재사용 {len(reused)}개, 새로 임베딩 {len(missing)}개")
+
+    new_embeddings = None
+    if missing:
+        new_embeddings = get_embeddings(openai_client, [texts[i] for i in missing], provider=provider)
+        if new_embeddings is None:
+            return None
+        save_article_embeddings(supabase, [
+            {
+                'article_id': article_ids[index],
+                'model': model,
+                'content_hash': hashes[index],
+                'embedding': new_embeddings.row(position).tolist(),
+            }
+            for position, index in enumerate(missing) if article_ids[index] is not None
+        ])
+        if not reused:
+            return new_embeddings  # 모두 새로 임베딩했으면 순서가 같으므로 그대로 사용
+
+    # 저장된 벡터와 새 벡터를 결과 행렬에 바로 채움 (중간 리스트 없이)
+    try:
+        dim = new_embeddings.shape[1] if new_embeddings is not None else len(next(iter(reused.values()), ()))
+        matrix = EmbeddingMatrix.allocate(len(articles), dim)
+        for index, vector in reused.items():
+            matrix.array[index] = vector
+        if new_embeddings is not None:
+            matrix.array[missing] = new_embeddings.array
+        return matrix
+    finally:
+        if new_embeddings is not None:
+            new_embeddings.close()
@@ -0,0 +1,108 @@
+"""
+임베딩 요청 배치 분할 + 동시 실행
+
+Embeddings API는 요청 하나당 입력 개수와 토큰 수에 상한이 있어서
+카테고리 기사가 많으면 한 번에 보내는 요청이 통째로 실패합니다.
+입력을 개수/토큰 예산으로 나눈 배치를 제한된 스레드 풀로 동시에 보내고,
+일시적인 에러(속도 제한, 시간 초과, 연결, 5xx)로 실패한 배치만 지수 백오프로 다시 시도하고
+(입력이 너무 긴 400, 인증 401 같은 에러는 바로 실패) 원래 순서대로 벡터를 돌려줍니다.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+
+# 요청 하나의 최대 입력 개수 (API 상한 2048보다 작게)
+MAX_BATCH_INPUTS = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+# 요청 하나의 최대 토큰 수 (API 상한 300,000보다 작게)
+MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "250000"))
+# 동시에 보내는 요청 수
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+# 배치 하나의 최대 시도 횟수와 재시도 대기 (초): RETRY_BASE * 2^(시도 - 1), 최대 RETRY_MAX
+MAX_ATTEMPTS = 5
+RETRY_BASE = 1.0
+RETRY_MAX = 30.0
+# 다시 시도하면 성공할 수 있는 에러
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def estimate_tokens(text):
+    """토크나이저 없이 어림한 토큰 수 (UTF-8 2바이트당 1토큰, 한글은 글자당 약 1.5토큰으로 넉넉하게)"""
+    return len(text.encode('utf-8')) // 2 + 1
+
+
+def split_batches(texts, max_inputs=MAX_BATCH_INPUTS, max_tokens=MAX_BATCH_TOKENS, count_tokens=estimate_tokens,
+                  token_counts=None):
+    """입력 순서를 유지하며 개수/토큰 예산 안의 배치로 나눔 (token_counts가 있으면 그 토큰 수 사용)
+
+    Returns:
+        list: 배치별 texts 인덱스 리스트
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for index, text in enumerate(texts):
+        tokens = token_counts[index] if token_counts is not None else count_tokens(text)
+        if current and (len(current) >= max_inputs or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _embed_batch(openai_client, texts, model, label):
+    """배치 하나를 보내고 일시적인 에러면 백오프 후 재시도 (끝내 실패하면 None)"""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            response = openai_client.embeddings.create(input=texts, model=model)
+            data = sorted(response.data, key=lambda item: item.index)
+            return [item.embedding for item in data]
+        except RETRYABLE_ERRORS as e:
+            if attempt == MAX_ATTEMPTS:
+                print(f"❌ 임베딩 배치 {label} 실패 ({MAX_ATTEMPTS}회 시도): {e}")
+                return None
+            delay = min(RETRY_MAX, RETRY_BASE * 2 ** (attempt - 1))
+            print(f"⚠️ 임베딩 배치 {label} 실패, {delay:.0f}초 후 재시도 ({attempt}/{MAX_ATTEMPTS}): {e}")
+            time.sleep(delay)
+        except Exception as e:
+            print(f"❌ 임베딩 배치 {label} 실패 (재시도하지 않는 에러): {e}")
+            return None
+
+
+def embed_in_batches(openai_client, texts, model, on_batch=None, concurrency=EMBEDDING_CONCURRENCY, batches=None):
+    """texts를 배치로 나눠 동시에 임베딩
+
+    Args:
+        on_batch: 배치가 성공할 때마다 (인덱스 리스트, 벡터 리스트)로 호출 (캐시 저장용)
+        batches: 미리 나눈 배치 (없으면 split_batches 기본 설정으로 나눔)
+
+    Returns:
+        list: texts 순서대로의 벡터 (실패한 배치의 항목은 None)
+    """
+    batches = split_batches(texts) if batches is None else batches
+    vectors = [None] * len(texts)
+    start = time.monotonic()
+
+    def run(numbered_batch):
+        number, indices = numbered_batch
+        label = f"{number + 1}/{len(batches)}"
+        embeddings = _embed_batch(openai_client, [texts[i] for i in indices], model, label)
+        if embeddings is not None:
+            for index, embedding in zip(indices, embeddings):
+                vectors[index] = embedding
+            if on_batch:
+                on_batch(indices, embeddings)
+        return embeddings is not None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches)))) as executor:
+        succeeded = sum(executor.map(run, enumerate(batches)))
+    print(
+        f"📦 임베딩 요청 {len(batches)}개 배치 (성공 {succeeded}개, 동시 {concurrency}개), "
+        f"{time.monotonic() - start:.1f}초"
+    )
+    return vectors
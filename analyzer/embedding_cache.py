@@ -0,0 +1,133 @@
+"""
+임베딩 디스크 캐시
+
+(모델, 임베딩할 텍스트의 해시)를 키로 벡터를 float32 바이너리 파일로 저장해서
+같은 텍스트를 다시 분석할 때 Embeddings API를 호출하지 않습니다.
+캐시만으로 모든 벡터를 채울 수 있으면 네트워크 없이도 분석을 다시 돌릴 수 있습니다.
+전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다 (LRU, 파일 mtime 기준).
+"""
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "embeddings")
+)
+DEFAULT_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "500")) * 1024 * 1024
+# EMBEDDING_CACHE=0이면 캐시를 쓰지 않음
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "1") != "0"
+
+
+def _cache_key(model, text):
+    return hashlib.sha256(f"{model}\0{text}".encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """(모델, 텍스트 해시) 키 기반, 크기 제한 LRU 디스크 캐시"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._scan()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.f32")
+
+    def _scan(self):
+        """시작 시 디렉토리를 훑어 항목별 크기 파악"""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".f32"):
+                try:
+                    self._sizes[name[:-4]] = os.path.getsize(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+        self._total_bytes = sum(self._sizes.values())
+
+    def get(self, model, text):
+        """저장된 벡터 반환 (없으면 None, 있으면 사용 시각 갱신)"""
+        path = self._path(_cache_key(model, text))
+        try:
+            vector = np.fromfile(path, dtype=np.float32)
+        except (OSError, ValueError):
+            vector = None
+        with self._lock:
+            if vector is None or not len(vector):
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return vector
+
+    def put(self, model, text, vector):
+        key = _cache_key(model, text)
+        path = self._path(key)
+        data = np.asarray(vector, dtype=np.float32).tobytes()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._total_bytes += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            self.stats['stored'] += 1
+            self._evict()
+
+    def _evict(self):
+        """크기 한도를 넘으면 가장 오래 쓰지 않은 항목부터 삭제"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        def last_used(key):
+            try:
+                return os.path.getmtime(self._path(key))
+            except OSError:
+                return 0
+
+        for key in sorted(self._sizes, key=last_used):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._total_bytes -= self._sizes.pop(key)
+            self.stats['evicted'] += 1
+
+    def print_stats(self):
+        stats = self.stats
+        total = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / total * 100 if total else 0
+        print(
+            f"🗃️ 임베딩 캐시: 적중 {stats['hits']}개 / 미스 {stats['misses']}개 ({hit_rate:.0f}%), "
+            f"저장 {stats['stored']}개, 삭제 {stats['evicted']}개, 크기 {self._total_bytes / 1024 / 1024:.1f}MB"
+        )
+
+
+# 프로세스 전체에서 공유하는 캐시 (처음 사용할 때 생성)
+_cache_lock = threading.Lock()
+_shared_cache = None
+
+
+def get_embedding_cache():
+    """공유 임베딩 캐시 반환 (EMBEDDING_CACHE=0이면 None)"""
+    global _shared_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _shared_cache is None:
+        with _cache_lock:
+            if _shared_cache is None:
+                _shared_cache = EmbeddingCache()
+    return _shared_cache
@@ -0,0 +1,81 @@
+"""
+임베딩 행렬
+
+기사 임베딩을 기사 dict마다 리스트로 붙이지 않고 하나의 연속된 float32 행렬로 보관합니다.
+기사에는 행 번호(embedding_row)만 넣고, 벡터가 필요한 코드는 행렬의 뷰를 받아 씁니다.
+EMBEDDING_MATRIX_DIR을 지정하면 행렬을 그 디렉토리의 파일에 memory-map해서
+기사가 많아도 프로세스 메모리 대신 페이지 캐시를 씁니다 (파일은 close()에서 삭제).
+"""
+import os
+import tempfile
+
+import numpy as np
+
+# 지정하면 행렬을 이 디렉토리의 임시 파일에 memory-map (비어 있으면 메모리에 할당)
+EMBEDDING_MATRIX_DIR = os.getenv("EMBEDDING_MATRIX_DIR", "")
+
+DTYPE = np.float32
+
+
+class EmbeddingMatrix:
+    """기사 순서대로의 float32 임베딩 행렬 (행 번호로 접근, 필요하면 디스크에 memory-map)"""
+
+    def __init__(self, array, path=None):
+        self.array = array
+        self.path = path
+
+    @classmethod
+    def allocate(cls, rows, dim, directory=None):
+        """rows x dim 행렬 할당 (directory가 있으면 그 아래 임시 파일에 memory-map)"""
+        directory = EMBEDDING_MATRIX_DIR if directory is None else directory
+        if not directory or not rows:
+            return cls(np.empty((rows, dim), dtype=DTYPE))
+        os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="embeddings-", suffix=".f32", dir=directory)
+        os.close(fd)
+        return cls(np.memmap(path, dtype=DTYPE, mode='w+', shape=(rows, dim)), path)
+
+    @classmethod
+    def from_rows(cls, vectors, directory=None):
+        """벡터 목록(리스트/배열 혼합 가능)을 한 행렬로 복사 (중간에 float64 리스트를 만들지 않음)"""
+        dim = len(vectors[0]) if vectors else 0
+        matrix = cls.allocate(len(vectors), dim, directory)
+        for index, vector in enumerate(vectors):
+            matrix.array[index] = vector
+        return matrix
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    def __len__(self):
+        return len(self.array)
+
+    def row(self, index):
+        """행 하나의 뷰 (복사하지 않음)"""
+        return self.array[index]
+
+    def rows(self, indices):
+        """여러 행 (연속 구간이면 뷰, 아니면 그 행들만 복사)"""
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) and np.array_equal(indices, np.arange(indices[0], indices[0] + len(indices))):
+            return self.array[indices[0]:indices[0] + len(indices)]
+        return self.array[indices]
+
+    def for_articles(self, articles):
+        """기사들의 embedding_row에 해당하는 행들"""
+        return self.rows([article['embedding_row'] for article in articles])
+
+    def close(self):
+        """memory-map 파일 삭제 (메모리 행렬이면 아무것도 하지 않음)
+
+        이미 꺼내 간 뷰는 매핑이 살아 있는 동안 계속 읽을 수 있습니다 (마지막 참조가 사라지면 해제).
+        """
+        if self.path is None:
+            return
+        self.array = np.empty((0, self.array.shape[1]), dtype=DTYPE)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.path = None
@@ -0,0 +1,111 @@
+"""
+임베딩 제공자
+
+get_embeddings가 벡터를 어디서 얻을지 EMBEDDING_PROVIDER 환경변수로 고릅니다.
+- openai (기본): OpenAI Embeddings API (배치 분할 + 동시 요청, analyzer/embedding_batcher.py)
+- local: 네트워크 없이 CPU에서 계산하는 문자 n-gram 해싱 임베딩 (CI, 벤치마크, 증분 분석용)
+
+local 임베딩은 학습 단계가 없어서 (해싱 + 고정 시드 랜덤 사영) 실행이 달라도 같은 텍스트는
+같은 벡터가 되므로, 저장된 클러스터 중심과 그대로 비교할 수 있습니다.
+"""
+import abc
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.random_projection import SparseRandomProjection
+
+from .embedding_batcher import embed_in_batches, split_batches
+from .text_prep import count_tokens, token_usage
+
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+
+# local 임베딩 설정: 문자 2~4-gram, 2^18 해시 버킷 → LOCAL_EMBEDDING_DIM 차원 사영
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "256"))
+LOCAL_NGRAM_RANGE = (2, 4)
+LOCAL_HASH_FEATURES = 2 ** 18
+LOCAL_PROJECTION_SEED = 42
+
+
+def embedding_model(model=None):
+    """사용할 OpenAI 임베딩 모델 이름 (지정하지 않으면 OPENAI_EMBEDDING_MODEL 환경변수)"""
+    return model or os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
+
+
+class EmbeddingProvider(abc.ABC):
+    """텍스트 → 벡터 변환기
+
+    name은 디스크 캐시와 article_embeddings 저장소의 모델 키로 쓰이고,
+    persistent가 False면 다시 계산하는 편이 빨라서 캐시/저장소를 쓰지 않습니다.
+    """
+    name = None
+    persistent = True
+
+    @abc.abstractmethod
+    def embed(self, texts, on_batch=None):
+        """texts 순서대로의 벡터 리스트 (실패한 항목은 None)
+
+        on_batch: 벡터가 준비될 때마다 (인덱스 리스트, 벡터 리스트)로 호출
+        """
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI Embeddings API"""
+
+    def __init__(self, openai_client, model=None):
+        self.openai_client = openai_client
+        self.name = embedding_model(model)
+
+    def embed(self, texts, on_batch=None):
+        # 개수/토큰 예산으로 나눈 배치를 동시에 요청
+        token_counts = [count_tokens(text, self.name) for text in texts]
+        batches = split_batches(texts, token_counts=token_counts)
+        vectors = embed_in_batches(self.openai_client, texts, self.name, on_batch=on_batch, batches=batches)
+        token_usage.record('embedding', self.name, sum(token_counts), texts=len(texts), requests=len(batches))
+        return vectors
+
+
+class LocalHashingEmbeddingProvider(EmbeddingProvider):
+    """문자 n-gram 해싱 + 고정 시드 희소 랜덤 사영 (학습 없음, 실행 간 같은 벡터)"""
+    persistent = False
+
+    def __init__(self, dim=LOCAL_EMBEDDING_DIM, ngram_range=LOCAL_NGRAM_RANGE, n_features=LOCAL_HASH_FEATURES,
+                 seed=LOCAL_PROJECTION_SEED):
+        self.name = f"local-char{ngram_range[0]}{ngram_range[1]}-{dim}"
+        self._vectorizer = HashingVectorizer(
+            analyzer='char_wb', ngram_range=ngram_range, n_features=n_features, alternate_sign=False, norm=None
+        )
+        # 사영 행렬은 입력 차원과 시드로만 정해짐 (데이터로 학습하지 않음)
+        self._projection = SparseRandomProjection(n_components=dim, dense_output=True, random_state=seed)
+        self._projection.fit(sparse.csr_matrix((1, n_features)))
+
+    def embed(self, texts, on_batch=None):
+        counts = self._vectorizer.transform(texts)
+        counts.data = np.log1p(counts.data)  # 자주 나오는 n-gram 영향 줄이기 (sublinear tf)
+        vectors = np.asarray(self._projection.transform(counts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        if on_batch:
+            on_batch(list(range(len(texts))), vectors)
+        return list(vectors)
+
+
+_local_provider_lock = threading.Lock()
+_local_provider = None
+
+
+def get_embedding_provider(openai_client=None, model=None, provider=None):
+    """설정(EMBEDDING_PROVIDER)에 맞는 임베딩 제공자 반환 (local은 프로세스에서 한 번만 생성)"""
+    global _local_provider
+    provider = provider or EMBEDDING_PROVIDER
+    if provider == "local":
+        with _local_provider_lock:
+            if _local_provider is None:
+                _local_provider = LocalHashingEmbeddingProvider()
+        return _local_provider
+    if provider != "openai":
+        raise ValueError(f"알 수 없는 EMBEDDING_PROVIDER: {provider} (openai / local)")
+    return OpenAIEmbeddingProvider(openai_client, model)
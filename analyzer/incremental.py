@@ -0,0 +1,119 @@
+"""
+증분 분석: 새 기사만 임베딩해서 기존 클러스터에 합치는 모듈
+
+지난 분석 이후 들어온 기사를 기존 클러스터 중심(centroid)과 비교해
+충분히 가까우면 그 클러스터에 넣고, 남은 기사들로만 새 클러스터를 만듭니다.
+"""
+from typing import List, Dict, Any
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+from .embed_articles import get_article_embeddings
+
+# 기존 클러스터에 합칠 최소 코사인 유사도
+MERGE_SIMILARITY = 0.85
+# 새 클러스터 하나당 기사 수 (남은 기사 수 / 이 값 = 새 클러스터 수)
+ARTICLES_PER_NEW_CLUSTER = 5
+# 남은 기사가 이보다 적으면 새 클러스터를 만들지 않고 가장 가까운 클러스터에 넣음
+MIN_NEW_CLUSTER_ARTICLES = 3
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def update_centroid(centroid: np.ndarray, count: int, new_vectors: np.ndarray) -> np.ndarray:
+    """기존 중심(기사 count개 평균)에 새 벡터들을 더한 평균"""
+    return (centroid * count + new_vectors.sum(axis=0)) / (count + len(new_vectors))
+
+
+def merge_bias(old_bias: Dict[str, int], old_count: int, new_bias: Dict[str, int], new_count: int) -> Dict[str, int]:
+    """두 편향성 비율(%)을 기사 수로 가중 평균 (합계 100 보정)"""
+    total = old_count + new_count
+    if not total:
+        return {'left': 0, 'center': 100, 'right': 0}
+    old_bias = old_bias or {}
+    merged = {
+        key: round((old_bias.get(key, 0) * old_count + new_bias.get(key, 0) * new_count) / total)
+        for key in ('left', 'center', 'right')
+    }
+    diff = 100 - sum(merged.values())
+    if diff:
+        max_key = max(merged, key=merged.get)
+        merged[max_key] += diff
+    return merged
+
+
+def merge_new_articles(openai_client, articles: List[Dict[str, Any]], clusters: List[Dict[str, Any]],
+                       threshold: float = MERGE_SIMILARITY, supabase=None) -> Dict[str, Any]:
+    """새 기사들을 기존 클러스터에 배정하고 나머지로 새 클러스터 생성
+
+    Args:
+        articles: 지난 분석 이후 새로 들어온 기사들
+        clusters: 기존 클러스터 (cluster_id, centroid, article_count 포함)
+        threshold: 기존 클러스터에 합칠 최소 코사인 유사도
+        supabase: 넘기면 저장된 기사 임베딩 재사용
+
+    Returns:
+        dict: 임베딩 실패 시 None
+        {
+            'merged': {cluster_id: {'articles': [...], 'centroid': list, 'article_count': int}},
+            'new_clusters': [{'articles': [...], 'centroid': list}]
+        }
+    """
+    print(f"\n🧩 새 기사 {len(articles)}개를 기존 클러스터 {len(clusters)}개에 병합 시작...")
+    embedding_matrix = get_article_embeddings(openai_client, articles, supabase)
+    if embedding_matrix is None:
+        return None
+    embeddings = embedding_matrix.array
+
+    # 다른 임베딩 제공자/모델로 만든 중심은 차원이 달라 비교할 수 없음
+    clusters = [cluster for cluster in clusters if cluster.get('centroid') and len(cluster['centroid']) == embeddings.shape[1]]
+    labels = np.full(len(articles), -1)
+    if clusters:
+        centroids = np.array([cluster['centroid'] for cluster in clusters], dtype=embeddings.dtype)
+        similarities = _normalize(embeddings) @ _normalize(centroids).T
+        best = similarities.argmax(axis=1)
+        best_similarity = similarities[np.arange(len(articles)), best]
+        labels = np.where(best_similarity >= threshold, best, -1)
+        leftover = np.flatnonzero(labels == -1)
+        if 0 < len(leftover) < MIN_NEW_CLUSTER_ARTICLES:
+            # 새 클러스터를 만들기엔 너무 적으면 가장 가까운 클러스터로
+            labels[leftover] = best[leftover]
+
+    merged = {}
+    for index, cluster in enumerate(clusters):
+        members = np.flatnonzero(labels == index)
+        if not len(members):
+            continue
+        count = cluster.get('article_count') or 0
+        merged[cluster['cluster_id']] = {
+            'articles': [articles[i] for i in members],
+            'centroid': update_centroid(np.array(cluster['centroid'], dtype=float), count, embedding_matrix.rows(members)).tolist(),
+            'article_count': count + len(members),
+        }
+
+    new_clusters = []
+    leftover = np.flatnonzero(labels == -1)
+    if len(leftover):
+        n_new = max(1, len(leftover) // ARTICLES_PER_NEW_CLUSTER)
+        if n_new > 1:
+            kmeans = KMeans(n_clusters=n_new, random_state=42)
+            new_labels = kmeans.fit_predict(embedding_matrix.rows(leftover))
+        else:
+            new_labels = np.zeros(len(leftover), dtype=int)
+        for label in range(n_new):
+            members = leftover[new_labels == label]
+            if len(members):
+                new_clusters.append({
+                    'articles': [articles[i] for i in members],
+                    'centroid': embedding_matrix.rows(members).mean(axis=0, dtype=np.float64).tolist(),
+                })
+
+    embedding_matrix.close()
+    merged_count = sum(len(data['articles']) for data in merged.values())
+    print(f"✅ 병합 완료: 기존 클러스터 {len(merged)}개에 {merged_count}개, 새 클러스터 {len(new_clusters)}개")
+    return {'merged': merged, 'new_clusters': new_clusters}
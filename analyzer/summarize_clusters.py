@@ -1,6 +1,7 @@
 from datetime import datetime
 import re
 import os
+from .text_prep import token_usage
 
 def analyze_cluster_topics(openai_client, clustered_articles):
     """GPT를 사용해서 각 클러스터의 주제 분석"""
@@ -38,12 +39,16 @@ def analyze_cluster_topics(openai_client, clustered_articles):
 """
         
         try:
+            chat_model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
             response = openai_client.chat.completions.create(
-                model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+                model=chat_model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=300,
                 temperature=0.3
             )
+            if getattr(response, 'usage', None):
+                token_usage.record('summarize', chat_model, response.usage.prompt_tokens,
+                                   response.usage.completion_tokens, texts=len(titles), requests=1)
             analysis = response.choices[0].message.content
             print(f"\n[GPT 응답] analysis:\n{analysis}\n")  # 실제 GPT 응답 전체 출력
             
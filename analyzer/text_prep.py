@@ -0,0 +1,172 @@
+"""
+임베딩 입력 준비 + 토큰 집계
+
+글자 수 대신 모델 토크나이저 기준으로 입력 길이를 맞춥니다.
+기사 본문에서 기자 서명, 저작권 문구 같은 상투 문구를 빼고
+제목 + 앞 문단을 토큰 예산(EMBEDDING_TOKEN_BUDGET)만큼 채웁니다.
+모델 토크나이저(tiktoken, requirements.txt)로 토큰을 세고, 설치되지 않은 환경에서는 UTF-8 바이트 기준 추정치를 씁니다.
+
+단계별(준비/임베딩/요약)로 보낸 토큰 수와 예상 비용을 모아 실행 끝에 출력합니다.
+"""
+import os
+import re
+import threading
+
+try:
+    import tiktoken
+except ImportError:  # 설치되지 않은 환경에서는 추정치 사용 (정확도 낮음)
+    tiktoken = None
+
+from .embedding_batcher import estimate_tokens
+
+# 기사 하나의 임베딩 입력 토큰 예산 (제목 포함)
+EMBEDDING_TOKEN_BUDGET = int(os.getenv("EMBEDDING_TOKEN_BUDGET", "256"))
+# 임베딩 모델의 입력 하나당 최대 토큰 수
+MAX_INPUT_TOKENS = 8191
+
+# 본문에서 지우는 상투 문구 (기자 서명, 이메일, 저작권, 사진 설명, 관련 기사 링크 등)
+# 줄 단위 문구는 짧은 줄이나 줄 끝부분만 지움 (본문이 한 줄로 들어와도 통째로 지우지 않도록)
+BOILERPLATE_PATTERNS = [
+    re.compile(r"[가-힣]{2,4}\s*(?:기자|특파원|앵커)\s*[\w.+-]+@[\w.-]+"),
+    re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"),
+    re.compile(r"https?://\S+"),
+    re.compile(r"(?:저작권자|[ⓒ©]|무단\s*전재|재배포\s*금지)[^\n]{0,80}$", re.MULTILINE),
+    re.compile(r"^[^\n]{0,80}(?:무단\s*전재|재배포\s*금지)[^\n]{0,80}$", re.MULTILINE),
+    re.compile(r"^\s*[▶■◆※☞][^\n]{0,120}$", re.MULTILINE),
+    re.compile(r"\[(?:사진|영상|그래픽|포토)[^\]]*\]"),
+]
+# 상투 문구를 지운 결과가 이보다 짧고 원문의 절반도 안 되면 (패턴이 본문을 지운 것으로 보고) 원문 사용
+MIN_STRIPPED_CHARS = 100
+_blank_lines = re.compile(r"\n\s*\n+")
+_spaces = re.compile(r"[ \t ]+")
+
+# 모델별 100만 토큰당 가격 (입력, 출력) - 달러
+MODEL_PRICES = {
+    "text-embedding-ada-002": (0.10, 0.0),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+_encodings = {}
+
+
+def _encoding(model):
+    if tiktoken is None:
+        return None
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("cl100k_base")
+    return _encodings[model]
+
+
+def count_tokens(text, model=None):
+    """모델 토크나이저 기준 토큰 수 (tiktoken이 없으면 추정치)"""
+    encoding = _encoding(model or "text-embedding-ada-002")
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, max_tokens, model=None):
+    """max_tokens 토큰 안에 들어가도록 뒤를 자름"""
+    encoding = _encoding(model or "text-embedding-ada-002")
+    if encoding is None:
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        # 추정치 기준: 2바이트당 1토큰이 되도록 앞에서부터 자름
+        encoded = text.encode('utf-8')[:max(0, (max_tokens - 1) * 2)]
+        return encoded.decode('utf-8', errors='ignore')
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def _paragraphs(content):
+    paragraphs = [_spaces.sub(" ", paragraph).strip() for paragraph in _blank_lines.split(content)]
+    if len(paragraphs) <= 1:
+        paragraphs = [_spaces.sub(" ", line).strip() for line in content.splitlines()]
+    return [paragraph for paragraph in paragraphs if paragraph]
+
+
+def strip_boilerplate(content):
+    """본문에서 상투 문구를 지우고 문단 목록으로 반환 (거의 다 지워지면 원문 문단)"""
+    stripped = content
+    for pattern in BOILERPLATE_PATTERNS:
+        stripped = pattern.sub("", stripped)
+    paragraphs = _paragraphs(stripped)
+    kept = sum(len(paragraph) for paragraph in paragraphs)
+    if kept < MIN_STRIPPED_CHARS and kept < len(content.strip()) / 2:
+        return _paragraphs(content)
+    return paragraphs
+
+
+def prepare_text(title, content, token_budget=None, model=None):
+    """제목 + 상투 문구를 뺀 앞 문단들을 token_budget 토큰까지 채운 임베딩 입력"""
+    token_budget = token_budget or EMBEDDING_TOKEN_BUDGET
+    parts = [title.strip()] if title else []
+    used = count_tokens(parts[0], model) if parts else 0
+    for paragraph in strip_boilerplate(content or ''):
+        remaining = token_budget - used
+        if remaining <= 0:
+            break
+        tokens = count_tokens(paragraph, model) + 1
+        if tokens > remaining:
+            # 구분자 몫(1토큰)을 빼고 남는 예산이 있을 때만 잘라서 추가
+            truncated = truncate_to_tokens(paragraph, remaining - 1, model) if remaining > 1 else ""
+            if truncated:
+                parts.append(truncated)
+            break
+        parts.append(paragraph)
+        used += tokens
+    return "\n\n".join(parts)
+
+
+class TokenUsage:
+    """단계별 토큰 사용량과 예상 비용 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def record(self, stage, model, input_tokens, output_tokens=0, texts=0, requests=0):
+        with self._lock:
+            entry = self.stages.setdefault((stage, model), {
+                'texts': 0, 'requests': 0, 'input_tokens': 0, 'output_tokens': 0,
+            })
+            entry['texts'] += texts
+            entry['requests'] += requests
+            entry['input_tokens'] += input_tokens
+            entry['output_tokens'] += output_tokens
+
+    def cost(self, model, input_tokens, output_tokens):
+        input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+    def print_summary(self):
+        if not self.stages:
+            return
+        counter = "tiktoken" if tiktoken else "추정치"
+        print(f"\n🧮 토큰 사용량 ({counter} 기준)")
+        total_cost = 0.0
+        for (stage, model), entry in self.stages.items():
+            if stage == 'prepare':
+                # 준비 단계는 API로 보내지 않음 (embedding 단계와의 차이 = 캐시/저장소로 아낀 토큰)
+                print(f"   {stage} [{model}]: 텍스트 {entry['texts']}개, {entry['input_tokens']:,} 토큰")
+                continue
+            cost = self.cost(model, entry['input_tokens'], entry['output_tokens'])
+            total_cost += cost
+            print(
+                f"   {stage} [{model}]: 텍스트 {entry['texts']}개, 요청 {entry['requests']}건, "
+                f"입력 {entry['input_tokens']:,} / 출력 {entry['output_tokens']:,} 토큰, 약 ${cost:.4f}"
+            )
+        print(f"   이번 실행 예상 비용: 약 ${total_cost:.4f}")
+
+
+# 프로세스 전체 실행의 토큰 집계
+token_usage = TokenUsage()
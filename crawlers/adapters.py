@@ -0,0 +1,164 @@
+"""
+언론사별 크롤링 사양 (사이트 어댑터)
+
+언론사마다 다른 것은 카테고리 URL, 링크 셀렉터, 제목/본문 셀렉터 목록,
+페이지 넘김 방식뿐이므로 이 값들만 선언하고 실제 크롤링은 site_crawler가 담당합니다.
+
+페이지 넘김 방식 (pagination):
+- "pages":  카테고리 URL의 {page}를 1..max_pages로 바꿔가며 목록 수집 (정적 HTML 우선)
+- "scroll": 스크롤 후 더보기 버튼이 보이면 클릭, 새 링크가 안 늘면 중단
+- "more":   더보기 버튼 클릭을 우선하고 버튼이 없으면 스크롤, 목표 개수가 로드되면 중단
+
+scroll/more 방식도 먼저 정적 HTML로 첫 화면을 받아 보고(static_listing, 기본 True),
+이미 저장된 기사까지 보이면 브라우저 확장을 생략합니다.
+
+셀렉터 문자열의 {path}는 카테고리의 path 값으로 치환됩니다.
+
+"tracking_params"(선택)에 적은 쿼리 파라미터는 이 언론사 URL을 비교할 때 빠집니다 (crawlers/dedup.py).
+utm_*, fbclid 같은 공통 추적 파라미터 외에 언론사만 쓰는 추적용 파라미터가 있을 때 추가합니다.
+"""
+
+HANI = {
+    "name": "한겨레",
+    "base_url": "https://www.hani.co.kr",
+    "categories": [
+        {"name": "정치", "url": "https://www.hani.co.kr/arti/politics?page={page}"},
+        {"name": "경제", "url": "https://www.hani.co.kr/arti/economy?page={page}"},
+        {"name": "사회", "url": "https://www.hani.co.kr/arti/society?page={page}"},
+    ],
+    "pagination": "pages",
+    "max_pages": 5,
+    "link_selectors": ["article a"],
+    "link_patterns": ["/arti/"],
+    "content_selectors": [".article-text"],
+    "min_content_length": 0,
+    "skip_short_content": True,
+    "extra_fields": {"bias": "left"},
+}
+
+KBS = {
+    "name": "KBS뉴스",
+    "base_url": "https://news.kbs.co.kr",
+    "categories": [
+        {"name": "정치", "url": "https://news.kbs.co.kr/news/pc/category/category.do?ctcd=0003"},
+        {"name": "경제", "url": "https://news.kbs.co.kr/news/pc/category/category.do?ctcd=0004"},
+        {"name": "사회", "url": "https://news.kbs.co.kr/news/pc/category/category.do?ctcd=0005"},
+    ],
+    "pagination": "scroll",
+    "max_expansions": 5,
+    "more_button_selectors": ["button:has-text('더보기')", ".more-btn", ".btn-more"],
+    "link_count_selector": "a[href*='/news/view/'], a[href*='ncd=']",
+    "link_selectors": [
+        "a[href*='/news/view/']",
+        "a[href*='ncd=']",
+        ".headline a",
+        ".news-item a",
+        ".title a",
+        "h3 a",
+        "h4 a",
+        ".subject a"
+    ],
+    "link_patterns": ["/news/view/", "ncd="],
+    "max_links": 50,
+    "content_selectors": [
+        ".detail-body",
+        ".article-body",
+        ".news-content",
+        ".content-area",
+        ".article-text",
+        ".view-cont",
+        ".txt",
+        "#content",
+        ".article_txt"
+    ],
+    "min_content_length": 100,
+    "skip_short_content": True,
+}
+
+YTN = {
+    "name": "YTN",
+    "base_url": "https://www.ytn.co.kr",
+    "categories": [
+        {"name": "정치", "url": "https://www.ytn.co.kr/news/list.php?mcd=0101"},
+        {"name": "경제", "url": "https://www.ytn.co.kr/news/list.php?mcd=0102"},
+        {"name": "사회", "url": "https://www.ytn.co.kr/news/list.php?mcd=0103"},
+    ],
+    "pagination": "scroll",
+    "max_expansions": 5,
+    "more_button_selectors": ["button:has-text('더보기')", ".more-btn", ".btn-more", ".more"],
+    "link_count_selector": "a[href*='/news/']",
+    "link_selectors": ["a[href*='/news/']"],
+    "link_patterns": ["/news/"],
+    "title_selectors": [
+        "h1",
+        ".article_title",
+        ".news_title",
+        ".title",
+        ".headline",
+        "#article_title",
+        ".subject",
+        ".view_title"
+    ],
+    "content_selectors": [
+        ".article_txt",
+        ".news_txt",
+        ".view_txt",
+        "#article_text",
+        ".article-content",
+        ".content",
+        "article",
+        ".story_body"
+    ],
+    "min_content_length": 100,
+    "skip_short_content": False,
+    "wait_until": "load",
+}
+
+CHOSUN = {
+    "name": "조선일보",
+    "base_url": "https://www.chosun.com",
+    "categories": [
+        {"name": "정치", "url": "https://www.chosun.com/politics/", "path": "politics"},
+        {"name": "사회", "url": "https://www.chosun.com/national/", "path": "national"},
+        {"name": "경제", "url": "https://www.chosun.com/economy/", "path": "economy"},
+    ],
+    "pagination": "more",
+    "max_expansions": 15,
+    "more_button_selectors": [
+        ".more-news-btn",
+        ".btn-more",
+        ".load-more",
+        ".more-btn",
+        "button:has-text('더보기')",
+        "a:has-text('더보기')",
+        ".story-card-more",
+        ".list-more"
+    ],
+    "link_count_selector": "a[href*='/politics/'], a[href*='/national/'], a[href*='/economy/']",
+    "link_selectors": [
+        "a[href*='/{path}/']",
+        ".story-card a",
+        ".headline a",
+        ".news-item a",
+        ".article-link",
+        "h3 a",
+        "h4 a"
+    ],
+    "link_patterns": ["/{path}/"],
+    "max_links": 40,
+    "content_selectors": [
+        ".article-body",
+        ".news-article-body",
+        ".story-content",
+        "#article-body",
+        ".article-content",
+        ".story-body",
+        ".entry-content"
+    ],
+    "min_content_length": 100,
+    "skip_short_content": False,
+    "wait_until": "load",
+}
+
+ADAPTERS = [HANI, KBS, YTN, CHOSUN]
+ADAPTERS_BY_NAME = {adapter["name"]: adapter for adapter in ADAPTERS}
@@ -0,0 +1,251 @@
+"""
+수집 단계 중복 기사 제거
+
+DB에 저장하기 전에 세 단계로 중복을 거릅니다.
+1. URL 정규화: 추적용 쿼리, 프래그먼트, www./m. 호스트 차이를 없앤 URL로 비교
+2. 본문 해시: 공백을 정리한 본문이 완전히 같은 기사
+3. SimHash: 통신사 기사를 여러 언론사가 조금씩 고쳐 실은 것 같은 거의 같은 본문
+
+최근 기사의 서명만 메모리 인덱스에 두고, 시작할 때 DB의 최근 기사로 채웁니다.
+본문을 추출하지 못한 기사(대체 문구)나 너무 짧은 본문은 서로 다른 기사도 같아 보이므로 URL로만 비교합니다.
+인덱스는 프로세스 메모리에 있어서 --processes 모드(언론사별 워커 프로세스)에서는 쓰지 않습니다.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from crawlers.adapters import ADAPTERS
+from db import get_supabase_client, iter_articles_from_db
+
+# 비교에서 빼는 추적/광고용 쿼리 파라미터 (널리 알려진 것만, utm_*는 접두어로 처리)
+# from/source/ref처럼 일반적인 이름은 언론사에 따라 실제 기사를 가리킬 수 있어서 넣지 않고
+# 언론사별로 필요한 것은 어댑터의 "tracking_params"에 추가합니다 (crawlers/adapters.py).
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "gclsrc", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "ref_src",
+}
+# 모바일/기본 호스트 접두어 (m.news.com, www.news.com → news.com)
+HOST_PREFIXES = ("www.", "m.", "mobile.")
+
+# SimHash 설정: 64비트, 문자 4-gram, 본문 앞부분만 사용
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 4
+SIMHASH_CHARS = 2000
+# 해밍 거리가 이 이하면 거의 같은 기사 (밴드 8개 x 8비트 → 거리 7 이하는 한 밴드 이상 일치)
+NEAR_DUPLICATE_DISTANCE = 6
+SIMHASH_BANDS = 8
+# 이보다 짧은 본문은 본문 해시/SimHash 오탐이 많아 URL로만 비교
+MIN_SIMHASH_CHARS = 200
+# 크롤러가 본문을 추출하지 못했을 때 넣는 대체 문구 (crawlers/site_crawler.py)
+PLACEHOLDER_CONTENT = "본문을 추출할 수 없습니다."
+
+# 인덱스에 유지하는 최근 기사 범위
+RECENT_HOURS = 72
+MAX_RECENT_ARTICLES = 50_000
+
+_whitespace = re.compile(r"\s+")
+
+
+def _bare_host(host):
+    host = (host or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+
+# 어댑터에 선언된 언론사별 추가 추적 파라미터 (정규화한 호스트 → 파라미터 이름 집합)
+HOST_TRACKING_PARAMS = {
+    _bare_host(urlsplit(adapter["base_url"]).hostname): {param.lower() for param in adapter["tracking_params"]}
+    for adapter in ADAPTERS if adapter.get("tracking_params")
+}
+
+
+def canonical_url(url):
+    """비교용 정규화 URL (추적 쿼리/프래그먼트 제거, 쿼리 정렬, 호스트 접두어와 끝 슬래시 제거)"""
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    host = _bare_host(parts.netloc)
+    extra_params = HOST_TRACKING_PARAMS.get(host, ())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and key.lower() not in extra_params and not key.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, urlencode(query), ""))
+
+
+def normalize_text(text):
+    return _whitespace.sub(" ", text or "").strip()
+
+
+def content_hash(text):
+    """공백을 정리한 본문의 해시"""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def simhash(text):
+    """본문 앞부분의 문자 4-gram SimHash (64비트 정수)"""
+    text = normalize_text(text)[:SIMHASH_CHARS].replace(" ", "")
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1))}
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in shingles
+    ]
+    half = len(hashes) / 2
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        if sum((h >> bit) & 1 for h in hashes) > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def comparable_content(content):
+    """본문 해시/SimHash로 비교할 만한 본문인지 (대체 문구나 짧은 본문은 URL로만 비교)"""
+    content = normalize_text(content)
+    return content != PLACEHOLDER_CONTENT and len(content) >= MIN_SIMHASH_CHARS
+
+
+def _signatures(content):
+    """(본문 해시, SimHash) - 비교할 수 없는 본문이면 (None, None)"""
+    if not comparable_content(content):
+        return None, None
+    return content_hash(content), simhash(content)
+
+
+def _bands(fingerprint):
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [(band, (fingerprint >> (band * width)) & mask) for band in range(SIMHASH_BANDS)]
+
+
+class ArticleDeduper:
+    """최근 기사의 URL/본문 해시/SimHash 인덱스 (스레드 안전)"""
+
+    def __init__(self, recent_hours=RECENT_HOURS, max_articles=MAX_RECENT_ARTICLES):
+        self.recent_seconds = recent_hours * 3600
+        self.max_articles = max_articles
+        self._lock = threading.Lock()
+        self._urls = {}       # 정규화 URL → 원본 URL
+        self._hashes = {}     # 본문 해시 → 원본 URL
+        self._bands = {}      # (밴드 번호, 값) → [항목 번호]
+        self._entries = {}    # 항목 번호 → (SimHash 또는 None, URL, 정규화 URL, 본문 해시 또는 None)
+        self._order = deque() # (추가 시각, 항목 번호)
+        self._next_id = 0
+        # (중복 URL, 원본 URL, 이유) 목록 - 이유: 'url' / 'content' / 'near'
+        self.duplicates = []
+        self.stats = {'checked': 0, 'url': 0, 'content': 0, 'near': 0}
+
+    def _evict(self, now):
+        while self._order and (now - self._order[0][0] > self.recent_seconds or len(self._order) > self.max_articles):
+            _, entry_id = self._order.popleft()
+            fingerprint, _, canonical, text_hash = self._entries.pop(entry_id)
+            self._urls.pop(canonical, None)
+            if text_hash is not None:
+                self._hashes.pop(text_hash, None)
+            for band in _bands(fingerprint) if fingerprint is not None else ():
+                members = self._bands.get(band)
+                if members:
+                    members.remove(entry_id)
+                    if not members:
+                        del self._bands[band]
+
+    def _find_near(self, fingerprint):
+        for band in _bands(fingerprint):
+            for entry_id in self._bands.get(band, ()):
+                other, url, _, _ = self._entries[entry_id]
+                if bin(fingerprint ^ other).count("1") <= NEAR_DUPLICATE_DISTANCE:
+                    return url
+        return None
+
+    def _add(self, url, canonical, text_hash, fingerprint, added_at):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._urls[canonical] = url
+        if text_hash is not None:
+            self._hashes[text_hash] = url
+        self._entries[entry_id] = (fingerprint, url, canonical, text_hash)
+        self._order.append((added_at, entry_id))
+        for band in _bands(fingerprint) if fingerprint is not None else ():
+            self._bands.setdefault(band, []).append(entry_id)
+
+    def check(self, article_data):
+        """중복이면 (이유, 원본 URL), 새 기사면 인덱스에 추가하고 None 반환
+
+        중복 기사에는 article_data['duplicate_of']로 원본 URL을 남깁니다.
+        """
+        url = article_data.get('url')
+        content = article_data.get('content') or ''
+        canonical = canonical_url(url)
+        text_hash, fingerprint = _signatures(content)
+
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            self.stats['checked'] += 1
+            result = None
+            if canonical in self._urls:
+                result = ('url', self._urls[canonical])
+            elif text_hash is not None and text_hash in self._hashes:
+                result = ('content', self._hashes[text_hash])
+            elif fingerprint is not None:
+                original = self._find_near(fingerprint)
+                if original:
+                    result = ('near', original)
+            if result is None:
+                self._add(url, canonical, text_hash, fingerprint, now)
+                return None
+            reason, original = result
+            self.stats[reason] += 1
+            self.duplicates.append((url, original, reason))
+        article_data['duplicate_of'] = original
+        return result
+
+    def seed(self, articles):
+        """DB의 최근 기사로 인덱스 채우기 (article dict: url, content)"""
+        now = time.monotonic()
+        with self._lock:
+            for article in articles:
+                text_hash, fingerprint = _signatures(article.get('content') or '')
+                self._add(article.get('url'), canonical_url(article.get('url')), text_hash, fingerprint, now)
+
+    def print_stats(self):
+        stats = self.stats
+        print(
+            f"🧬 중복 기사 필터: 검사 {stats['checked']}개, URL 중복 {stats['url']}개, "
+            f"본문 동일 {stats['content']}개, 유사 본문 {stats['near']}개 제외"
+        )
+
+
+# 프로세스 전체에서 공유하는 인덱스 (언론사 간 중복도 확인)
+_deduper_lock = threading.Lock()
+_shared_deduper = None
+
+
+def load_recent_deduper(recent_hours=RECENT_HOURS):
+    """DB에서 최근 recent_hours시간 기사를 읽어 채운 인덱스 생성 (실패하면 빈 인덱스)"""
+    deduper = ArticleDeduper(recent_hours)
+    try:
+        since = (datetime.now(timezone.utc) - timedelta(hours=recent_hours)).isoformat()
+        count = 0
+        for batch in iter_articles_from_db(get_supabase_client(), columns=["id", "url", "content"], since=since):
+            deduper.seed(batch)
+            count += len(batch)
+        print(f"🧬 중복 기사 인덱스: 최근 {recent_hours}시간 기사 {count}개 로드")
+    except Exception as e:
+        print(f"⚠️ 최근 기사 로드 실패, 빈 중복 인덱스로 진행: {e}")
+    return deduper
+
+
+def get_article_deduper():
+    """프로세스 공유 중복 기사 인덱스 (처음 호출 시 DB에서 최근 기사 로드)"""
+    global _shared_deduper
+    if _shared_deduper is None:
+        with _deduper_lock:
+            if _shared_deduper is None:
+                _shared_deduper = load_recent_deduper()
+    return _shared_deduper
@@ -0,0 +1,365 @@
+"""
+공유 브라우저 기반 비동기 크롤링 엔진
+
+Chromium은 실행 전체에서 한 번만 띄우고, 언론사마다 별도 브라우저 컨텍스트를
+만들어 쿠키/세션을 분리합니다. 모든 언론사와 카테고리는 하나의 페이지 풀
+(동시에 열 수 있는 페이지 수 제한)을 공유합니다.
+
+기사 페이지와 단순 페이지네이션 목록은 HTTP 요청으로 먼저 가져오고,
+정적 파싱으로 아무것도 찾지 못했을 때만 Playwright 페이지를 사용합니다.
+Playwright 페이지에는 언론사별 리소스 차단 정책이 적용되고,
+고정 sleep 대신 wait_policy의 이벤트 기반 대기를 사용합니다.
+이미 저장된 기사 URL은 실행 시작 시 한 번 불러와 페이지 이동 전에 걸러냅니다.
+제목/본문/링크 셀렉터는 과거 적중률이 높은 순서로 시도합니다.
+HTTP 요청과 Playwright 이동은 모두 호스트별 속도 제한 스케줄러를 거칩니다.
+HTTP 응답은 조건부 GET 디스크 캐시를 거치며, 변경 없는 페이지는 저장된 파싱 결과를 재사용합니다.
+"""
+import asyncio
+import time
+import traceback
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from crawlers.http_cache import HttpCache
+from crawlers.http_fetcher import ArticleFetcher, extract_article, extract_links
+from crawlers.resource_policy import (
+    DEFAULT_POLICY, OUTLET_POLICIES, PageTraffic, install_resource_policy, summarize_traffic
+)
+from crawlers.scheduler import CrawlScheduler
+from crawlers.selector_stats import SelectorStats
+from crawlers.known_urls import KnownUrlFilter, load_known_url_filter
+from crawlers.dedup import get_article_deduper
+from crawlers.wait_policy import DEFAULT_WAIT_POLICY, OUTLET_WAIT_POLICIES, WaitStats, Waiter
+
+# 브라우저 최적화 옵션 (이미지/광고 차단은 resource_policy의 요청 라우팅이 담당)
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-plugins',
+    '--disable-extensions',
+    '--no-first-run',
+    '--disable-default-apps'
+]
+
+# 전체 언론사/카테고리가 함께 쓰는 최대 동시 페이지 수
+DEFAULT_MAX_PAGES = 8
+
+
+class CrawlEngine:
+    """브라우저 1개 + 언론사별 컨텍스트 + 공유 페이지 풀"""
+
+    def __init__(self, max_pages=DEFAULT_MAX_PAGES, headless=True, policies=None, wait_policies=None,
+                 known_urls=None, rate_limits=None, http_cache=None, on_article=None, deduper=None):
+        self.max_pages = max_pages
+        self.headless = headless
+        self.policies = OUTLET_POLICIES if policies is None else policies
+        self.wait_policies = OUTLET_WAIT_POLICIES if wait_policies is None else wait_policies
+        self.page_traffic = []
+        self.wait_stats = WaitStats()
+        self.known_urls = KnownUrlFilter() if known_urls is None else known_urls
+        self.selector_stats = SelectorStats.load()
+        self.rate_limits = rate_limits
+        # 기사 하나가 저장될 때마다 호출되는 콜백 (언론사 이름, 기사 dict)
+        self.on_article = on_article
+        # 저장 전 중복 기사 필터 (None이면 URL 필터만 사용)
+        self.deduper = deduper
+        self.scheduler = None
+        self._playwright = None
+        self._browser = None
+        self._contexts = {}
+        self._context_lock = None
+        self._page_slots = None
+        self.fetcher = ArticleFetcher(cache=HttpCache() if http_cache is None else http_cache)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Playwright와 브라우저 시작"""
+        self._context_lock = asyncio.Lock()
+        self._page_slots = asyncio.Semaphore(self.max_pages)
+        self.scheduler = CrawlScheduler(self.rate_limits)
+        await self.fetcher.start()
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=BROWSER_ARGS
+        )
+        print(f"🌐 공유 브라우저 시작 (최대 동시 페이지: {self.max_pages}개)")
+
+    async def close(self):
+        """모든 컨텍스트와 브라우저 종료"""
+        for context in self._contexts.values():
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"컨텍스트 종료 에러: {e}")
+        self._contexts = {}
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        await self.fetcher.close()
+        self.fetcher.print_stats()
+        self.print_traffic()
+        self.wait_stats.print_summary()
+        self.known_urls.print_stats()
+        if self.deduper:
+            self.deduper.print_stats()
+        self.selector_stats.print_summary()
+        if self.scheduler:
+            self.scheduler.print_metrics()
+        self.selector_stats.save()
+
+    async def get_context(self, outlet):
+        """언론사별 브라우저 컨텍스트 반환 (없으면 생성)"""
+        async with self._context_lock:
+            if outlet not in self._contexts:
+                self._contexts[outlet] = await self._browser.new_context()
+            return self._contexts[outlet]
+
+    @asynccontextmanager
+    async def page(self, outlet):
+        """페이지 풀에서 슬롯을 하나 빌려 해당 언론사 컨텍스트의 새 페이지 제공"""
+        async with self._page_slots:
+            context = await self.get_context(outlet)
+            page = await context.new_page()
+            traffic = PageTraffic(outlet)
+            await install_resource_policy(page, self.policies.get(outlet, DEFAULT_POLICY), traffic)
+            try:
+                yield page
+            finally:
+                traffic.url = page.url
+                await page.close()
+                self.page_traffic.append(traffic.to_dict())
+
+    async def fetch_html(self, outlet, url):
+        """스케줄러 차례를 기다린 뒤 HTTP로 HTML 수집 (응답 상태는 스케줄러에 반영)
+
+        Returns:
+            tuple: (HTML bytes, 변경 없음 여부)
+        """
+        async with self.scheduler.slot(outlet, url):
+            try:
+                result = await self.fetcher.fetch_html(url)
+            except Exception as e:
+                response = getattr(e, 'response', None)
+                if response is not None:
+                    self.scheduler.report(url, response.status_code, response.headers.get('Retry-After'))
+                raise
+            self.scheduler.report(url, 200)
+            return result
+
+    async def goto(self, page, outlet, url, wait_until='domcontentloaded'):
+        """스케줄러 차례를 기다린 뒤 Playwright 페이지 이동 (응답 상태는 스케줄러에 반영)"""
+        async with self.scheduler.slot(outlet, url):
+            response = await page.goto(url, wait_until=wait_until)
+            if response is not None:
+                self.scheduler.report(url, response.status, response.headers.get('retry-after'))
+            return response
+
+    def filter_new_urls(self, urls, limit=None):
+        """이미 저장됐거나 이번 실행에서 예약된 URL을 이동 전에 제외"""
+        return self.known_urls.filter_new(urls, limit)
+
+    def waiter(self, outlet):
+        """언론사별 대기 정책이 적용된 Waiter 반환"""
+        return Waiter(outlet, self.wait_policies.get(outlet, DEFAULT_WAIT_POLICY), self.wait_stats)
+
+    def print_traffic(self):
+        """언론사별 Playwright 트래픽(허용/차단) 요약 출력"""
+        for outlet, totals in summarize_traffic(self.page_traffic).items():
+            blocked_types = ", ".join(
+                f"{resource_type} {count}" for resource_type, count in totals['blocked_by_type'].most_common()
+            )
+            print(
+                f"🚦 {outlet} 트래픽: 페이지 {totals['pages']}개, "
+                f"허용 {totals['allowed_requests']}건/{totals['allowed_bytes'] / 1024 / 1024:.1f}MB, "
+                f"차단 {totals['blocked_requests']}건" + (f" ({blocked_types})" if blocked_types else "")
+            )
+            # 차단이 많은 호스트 (광고/분석 도메인 정책 조정용)
+            blocked_hosts = ", ".join(
+                f"{host or '(알 수 없음)'} {count}" for host, count in totals['blocked_by_host'].most_common(5)
+            )
+            if blocked_hosts:
+                print(f"   └─ 차단 상위 호스트: {blocked_hosts}")
+
+    async def fetch_links(self, outlet, url, selectors, wait_until='domcontentloaded', static_only=False):
+        """목록 페이지의 셀렉터별 링크 href 추출: 정적 HTML 우선, 결과가 없으면 Playwright로 폴백
+
+        static_only=True면 폴백하지 않고 빈 결과를 반환합니다.
+        """
+        cache = self.fetcher.cache
+        try:
+            html, unchanged = await self.fetch_html(outlet, url)
+            link_map = cache.get_parsed(url, "links", selectors) if unchanged and cache else None
+            if link_map is None:
+                link_map = extract_links(html, selectors)
+                if cache:
+                    cache.set_parsed(url, "links", selectors, link_map)
+            if any(link_map.values()):
+                self.fetcher.stats['static_hits'] += 1
+                return link_map
+            print(f"↩️ 정적 목록 파싱 결과 없음: {url}")
+        except Exception as e:
+            print(f"↩️ HTTP 목록 수집 실패 ({e}): {url}")
+        if static_only:
+            return {}
+        self.fetcher.stats['fallbacks'] += 1
+        async with self.page(outlet) as page:
+            await self.goto(page, outlet, url, wait_until)
+            await self.waiter(outlet).selector(page, ", ".join(selectors))
+            return await collect_links(page, selectors)
+
+    async def fetch_article(self, outlet, url, content_selectors, title_selectors=None,
+                            min_content_length=0, wait_until='domcontentloaded'):
+        """기사 (제목, 본문) 추출: 정적 HTML 우선, 본문을 못 찾으면 Playwright로 폴백
+
+        셀렉터는 과거 적중률 순서로 시도하고, 어떤 셀렉터가 맞았는지 통계에 기록합니다.
+        """
+        content_selectors = self.selector_stats.order(outlet, "content", content_selectors)
+        if title_selectors:
+            title_selectors = self.selector_stats.order(outlet, "title", title_selectors)
+        cache = self.fetcher.cache
+        signature = [sorted(content_selectors), sorted(title_selectors or []), min_content_length]
+        try:
+            html, unchanged = await self.fetch_html(outlet, url)
+            parsed = cache.get_parsed(url, "article", signature) if unchanged and cache else None
+            if parsed is not None:
+                # 변경 없는 페이지: 저장된 파싱 결과 재사용
+                self.fetcher.stats['static_hits'] += 1
+                return parsed[0], parsed[1]
+            title, content, matched = extract_article(html, content_selectors, title_selectors, min_content_length)
+            if len(content) > min_content_length:
+                self.fetcher.stats['static_hits'] += 1
+                self._record_article_selectors(outlet, content_selectors, title_selectors, matched)
+                if cache:
+                    cache.set_parsed(url, "article", signature, [title, content])
+                return title, content
+            print(f"↩️ 정적 본문 파싱 실패, Playwright로 재시도: {url}")
+        except Exception as e:
+            print(f"↩️ HTTP 기사 수집 실패 ({e}), Playwright로 재시도: {url}")
+        self.fetcher.stats['fallbacks'] += 1
+        async with self.page(outlet) as page:
+            await self.goto(page, outlet, url, wait_until)
+            waiter = self.waiter(outlet)
+            if not await waiter.selector(page, ", ".join(content_selectors)):
+                await waiter.network_idle(page)
+            title, title_hit = await first_text(page, title_selectors, 5) if title_selectors else ("", None)
+            if not title:
+                title = await page.title()
+            content, content_hit = await first_text(page, content_selectors, min_content_length)
+        self._record_article_selectors(
+            outlet, content_selectors, title_selectors, {'title': title_hit, 'content': content_hit}
+        )
+        return title, content
+
+    def _record_article_selectors(self, outlet, content_selectors, title_selectors, matched):
+        self.selector_stats.record(outlet, "content", content_selectors, matched['content'])
+        if title_selectors:
+            self.selector_stats.record(outlet, "title", title_selectors, matched['title'])
+
+    async def run_outlet(self, crawler_func, crawler_name):
+        """개별 언론사 크롤러를 실행하고 시간을 측정"""
+        print(f"\n🚀 {crawler_name} 크롤링 시작...")
+        start_time = time.time()
+
+        try:
+            articles = await crawler_func(self)
+            duration = time.time() - start_time
+            print(f"✅ {crawler_name} 완료! 소요시간: {duration:.1f}초, 수집기사: {len(articles)}개")
+            return articles, duration, None
+
+        except Exception as e:
+            duration = time.time() - start_time
+            print(f"❌ {crawler_name} 실패! 소요시간: {duration:.1f}초, 에러: {str(e)[:100]}")
+            traceback.print_exc()
+            return [], duration, str(e)
+
+    async def run(self, crawlers):
+        """여러 언론사 크롤러를 동시에 실행
+
+        Args:
+            crawlers: (async 크롤러 함수, 언론사 이름) 튜플 리스트
+
+        Returns:
+            dict: 언론사 이름별 (기사 리스트, 소요시간, 에러) 튜플
+        """
+        results = await asyncio.gather(*(
+            self.run_outlet(crawler_func, crawler_name)
+            for crawler_func, crawler_name in crawlers
+        ))
+        return {
+            crawler_name: result
+            for (_, crawler_name), result in zip(crawlers, results)
+        }
+
+
+# 셀렉터 목록을 브라우저 안에서 한 번에 시도 (셀렉터마다 query_selector 왕복하지 않음)
+FIRST_TEXT_JS = """([selectors, minLength]) => {
+    let text = "";
+    for (const selector of selectors) {
+        let element = null;
+        try { element = document.querySelector(selector); } catch (e) { continue; }
+        if (element) {
+            text = (element.innerText || "").trim();
+            if (text.length > minLength) return [text, selector];
+        }
+    }
+    return [text, null];
+}"""
+
+COLLECT_LINKS_JS = """(selectors) => Object.fromEntries(selectors.map(selector => {
+    try {
+        return [selector, Array.from(document.querySelectorAll(selector), el => el.getAttribute('href'))];
+    } catch (e) {
+        return [selector, []];
+    }
+}))"""
+
+
+async def first_text(page, selectors, min_length):
+    """Playwright 페이지에서 셀렉터 목록을 순서대로 시도해 충분히 긴 텍스트 반환
+
+    Returns:
+        tuple: (텍스트, 적중한 셀렉터 또는 None)
+    """
+    try:
+        text, selector = await page.evaluate(FIRST_TEXT_JS, [selectors, min_length])
+        return text, selector
+    except Exception as e:
+        print(f"텍스트 추출 에러: {e}")
+        traceback.print_exc()
+        return "", None
+
+
+async def collect_links(page, selectors):
+    """Playwright 페이지에서 셀렉터별 링크 href 목록을 한 번에 추출"""
+    return await page.evaluate(COLLECT_LINKS_JS, selectors)
+
+
+async def crawl_outlets(crawlers, max_pages=DEFAULT_MAX_PAGES, known_urls=None, rate_limits=None, on_article=None,
+                        dedup=True):
+    """공유 브라우저 하나로 여러 언론사를 크롤링 (dedup=False면 중복 기사 필터를 쓰지 않음)"""
+    if known_urls is None:
+        known_urls = await asyncio.to_thread(load_known_url_filter)
+    deduper = await asyncio.to_thread(get_article_deduper) if dedup else None
+    async with CrawlEngine(max_pages=max_pages, known_urls=known_urls, rate_limits=rate_limits,
+                           on_article=on_article, deduper=deduper) as engine:
+        return await engine.run(crawlers)
+
+
+def run_outlet_sync(crawler_func, crawler_name, max_pages=DEFAULT_MAX_PAGES):
+    """단일 언론사 크롤러를 동기 방식으로 실행 (기존 crawl_xxx() 호환용)"""
+    results = asyncio.run(crawl_outlets([(crawler_func, crawler_name)], max_pages))
+    articles, duration, error = results[crawler_name]
+    if error:
+        raise RuntimeError(error)
+    return articles
@@ -0,0 +1,155 @@
+"""
+조건부 GET 디스크 캐시
+
+URL별로 응답 본문과 검증자(ETag, Last-Modified)를 디스크에 저장해 두고,
+다음 요청 때 If-None-Match / If-Modified-Since를 보냅니다.
+304(변경 없음) 응답이면 저장된 본문을 쓰고, 파싱 결과까지 저장되어 있으면 재파싱도 생략합니다.
+전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다 (LRU, 파일 mtime 기준).
+
+항목마다 파일이 따로 있어서 여러 프로세스가 같은 캐시 디렉토리를 써도 됩니다.
+"""
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "http")
+)
+DEFAULT_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+
+def _cache_key(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class HttpCache:
+    """URL 키 기반, 크기 제한 LRU 디스크 캐시"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._sizes = {}
+        self._total_bytes = 0
+        self._scan()
+
+    def _paths(self, key):
+        return (
+            os.path.join(self.cache_dir, f"{key}.body"),
+            os.path.join(self.cache_dir, f"{key}.json"),
+        )
+
+    def _scan(self):
+        """시작 시 디렉토리를 훑어 항목별 크기 파악"""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".body"):
+                key = name[:-5]
+                try:
+                    self._sizes[key] = os.path.getsize(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+        self._total_bytes = sum(self._sizes.values())
+
+    def _read_meta(self, key):
+        _, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key, meta):
+        _, meta_path = self._paths(key)
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def conditional_headers(self, url):
+        """저장된 검증자로 조건부 요청 헤더 생성"""
+        meta = self._read_meta(_cache_key(url))
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """304 응답 시 저장된 본문 반환 (사용 시각 갱신)"""
+        key = _cache_key(url)
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        now = time.time()
+        for path in (body_path, meta_path):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        return body
+
+    def store(self, url, headers, body):
+        """검증자가 있는 200 응답만 저장 (검증자가 없으면 조건부 요청을 할 수 없음)"""
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        if not etag and not last_modified:
+            return False
+        key = _cache_key(url)
+        body_path, _ = self._paths(key)
+        tmp_path = f"{body_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, body_path)
+        # 본문이 바뀌었으니 이전 파싱 결과는 버림
+        self._write_meta(key, {'url': url, 'etag': etag, 'last_modified': last_modified, 'parsed': {}})
+        self._total_bytes += len(body) - self._sizes.get(key, 0)
+        self._sizes[key] = len(body)
+        self._evict()
+        return True
+
+    def get_parsed(self, url, kind, signature):
+        """같은 조건(signature)으로 저장해 둔 파싱 결과 반환"""
+        meta = self._read_meta(_cache_key(url))
+        if not meta:
+            return None
+        parsed = meta.get('parsed', {}).get(kind)
+        if parsed and parsed.get('signature') == signature:
+            return parsed.get('value')
+        return None
+
+    def set_parsed(self, url, kind, signature, value):
+        key = _cache_key(url)
+        meta = self._read_meta(key)
+        if not meta:
+            return
+        meta.setdefault('parsed', {})[kind] = {'signature': signature, 'value': value}
+        self._write_meta(key, meta)
+
+    def _evict(self):
+        """크기 한도를 넘으면 가장 오래 쓰지 않은 항목부터 삭제"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        def last_used(key):
+            try:
+                return os.path.getmtime(self._paths(key)[0])
+            except OSError:
+                return 0
+
+        for key in sorted(self._sizes, key=last_used):
+            if self._total_bytes <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes -= self._sizes.pop(key)
@@ -0,0 +1,144 @@
+"""
+HTTP 기반 정적 페이지 수집기
+
+기사 본문 셀렉터(.article-text, .article_txt, .news_txt 등)는 서버에서 렌더링되므로
+브라우저 없이 HTTP 요청 + HTML 파싱만으로 추출할 수 있습니다.
+커넥션은 호스트별로 keep-alive 풀에서 재사용하고,
+캐시가 주어지면 조건부 GET으로 변경되지 않은 페이지의 재다운로드를 피합니다.
+"""
+import importlib.util
+
+import httpx
+from bs4 import BeautifulSoup
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+}
+
+# lxml이 설치되어 있으면 더 빠른 파서 사용
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+
+def parse_html(html):
+    """HTML(bytes/str)을 파싱하고 본문 추출에 방해되는 태그 제거"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    return soup
+
+
+def select_text(soup, selectors, min_length=0):
+    """셀렉터 목록을 순서대로 시도해 min_length보다 긴 텍스트 반환
+
+    충분히 긴 텍스트가 없으면 마지막으로 찾은 텍스트를 반환합니다.
+
+    Returns:
+        tuple: (텍스트, 적중한 셀렉터 또는 None)
+    """
+    text = ""
+    for selector in selectors:
+        element = soup.select_one(selector)
+        if element:
+            text = element.get_text("\n", strip=True)
+            if len(text) > min_length:
+                return text, selector
+    return text, None
+
+
+def extract_article(html, content_selectors, title_selectors=None, min_content_length=0, title_min_length=5):
+    """정적 HTML에서 제목/본문 추출
+
+    Returns:
+        tuple: (제목, 본문, {'title': 적중 셀렉터, 'content': 적중 셀렉터})
+    """
+    soup = parse_html(html)
+    title, title_hit = select_text(soup, title_selectors, title_min_length) if title_selectors else ("", None)
+    if not title and soup.title:
+        title = soup.title.get_text(strip=True)
+    content, content_hit = select_text(soup, content_selectors, min_content_length)
+    return title, content, {'title': title_hit, 'content': content_hit}
+
+
+def extract_links(html, selectors):
+    """정적 HTML에서 셀렉터별 링크 href 목록 추출"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return {
+        selector: [element.get("href") for element in soup.select(selector)]
+        for selector in selectors
+    }
+
+
+class ArticleFetcher:
+    """keep-alive 커넥션 풀을 사용하는 비동기 HTTP 수집기"""
+
+    def __init__(self, max_connections=20, max_keepalive=10, timeout=10.0, cache=None):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.timeout = timeout
+        self._client = None
+        self.cache = cache
+        self.stats = {
+            'requests': 0,
+            'bytes': 0,
+            'not_modified': 0,
+            'errors': 0,
+            'static_hits': 0,
+            'fallbacks': 0,
+        }
+
+    async def start(self):
+        """HTTP 클라이언트(커넥션 풀) 생성"""
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=self.timeout,
+            follow_redirects=True,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+            ),
+        )
+
+    async def close(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch_html(self, url):
+        """URL의 HTML을 bytes로 반환 (인코딩 판별은 파서에 맡김)
+
+        Returns:
+            tuple: (HTML bytes, 변경 없음 여부) - 304 응답이면 캐시 본문과 True
+        """
+        self.stats['requests'] += 1
+        try:
+            headers = self.cache.conditional_headers(url) if self.cache else {}
+            response = await self._client.get(url, headers=headers)
+            if response.status_code == 304 and self.cache:
+                body = self.cache.load_body(url)
+                if body is not None:
+                    self.stats['not_modified'] += 1
+                    return body, True
+                # 캐시 본문이 지워졌으면 조건 없이 다시 요청
+                response = await self._client.get(url)
+            response.raise_for_status()
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        self.stats['bytes'] += len(response.content)
+        if self.cache:
+            self.cache.store(url, response.headers, response.content)
+        return response.content, False
+
+    def print_stats(self):
+        stats = self.stats
+        print(
+            f"📡 HTTP 수집 통계: 요청 {stats['requests']}건, "
+            f"{stats['bytes'] / 1024 / 1024:.1f}MB, 변경 없음(304) {stats['not_modified']}건, 에러 {stats['errors']}건, "
+            f"정적 파싱 성공 {stats['static_hits']}건, Playwright 폴백 {stats['fallbacks']}건"
+        )
@@ -0,0 +1,166 @@
+"""
+크롤링 → DB 저장 스트리밍 파이프라인
+
+크롤러는 추출한 기사를 제한된 크기의 큐에 넣기만 하고,
+별도 저장 태스크가 큐에서 기사를 배치로 꺼내 DB에 씁니다.
+Supabase 왕복은 스레드에서 실행되어 페이지 수집과 겹쳐 진행되고,
+큐가 가득 차면 크롤러가 기다리는 방식으로 속도를 맞춥니다 (backpressure).
+write_batch로 spool_articles_bulk를 넘기면 배치는 로컬 스풀에만 기록되고
+DB 반영은 스풀의 백그라운드 스레드가 맡습니다 (db/spool.py).
+스풀에 기록한 기사는 나중에 중복으로 건너뛰거나 실패할 수 있어서 saved가 아니라 spooled에 따로 모읍니다.
+"""
+import asyncio
+import time
+import traceback
+
+from db import save_articles_bulk
+from db.storage import ARTICLE_INSERTED, ARTICLE_FAILED, ARTICLE_SKIPPED, ARTICLE_SPOOLED
+
+# 배치 하나의 최대 기사 수
+DEFAULT_BATCH_SIZE = 20
+# 저장 대기 큐의 최대 길이 (가득 차면 크롤러가 대기)
+DEFAULT_QUEUE_SIZE = 100
+# 배치가 덜 찼어도 이 시간(초)이 지나면 저장
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+class ArticleWriter:
+    """큐에서 기사를 배치로 꺼내 DB에 저장하는 저장 단계"""
+
+    def __init__(self, supabase, name="", batch_size=DEFAULT_BATCH_SIZE, queue_size=DEFAULT_QUEUE_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, write_batch=save_articles_bulk, on_saved=None, deduper=None):
+        self.supabase = supabase
+        self.name = name
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.write_batch = write_batch
+        # 기사 하나가 DB에 저장될 때마다 호출되는 콜백 (기사 dict, 스풀에만 기록된 기사는 제외)
+        self.on_saved = on_saved
+        # 큐에 넣기 전에 중복 기사를 거르는 필터 (crawlers/dedup.py)
+        self.deduper = deduper
+        self.saved = []
+        # 스풀에 기록만 되고 DB 반영은 아직 모르는 기사
+        self.spooled = []
+        self.stats = {
+            'batches': 0,
+            'articles': 0,
+            'skipped': 0,
+            'failed': 0,
+            'spooled': 0,
+            'duplicates': 0,
+            'max_batch': 0,
+            'write_time': 0.0,
+            'max_write_time': 0.0,
+            'put_wait': 0.0,
+        }
+        self._queue = None
+        self._task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, article_data):
+        """기사를 저장 큐에 추가 (큐가 가득 차면 자리가 날 때까지 대기, 중복 기사는 버림)"""
+        if self.deduper:
+            duplicate = self.deduper.check(article_data)
+            if duplicate:
+                self.stats['duplicates'] += 1
+                print(f"🧬 중복 기사 제외 ({duplicate[0]}): {article_data.get('url')} → {duplicate[1]}")
+                return
+        start = time.monotonic()
+        await self._queue.put(article_data)
+        self.stats['put_wait'] += time.monotonic() - start
+
+    async def close(self):
+        """남은 기사를 모두 저장하고 저장 태스크 종료"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self.print_stats()
+
+    async def _next_batch(self):
+        """첫 기사를 기다린 뒤 batch_size개 또는 flush_interval까지 모아서 반환 (종료 신호면 done=True)"""
+        item = await self._queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self):
+        done = False
+        while not done:
+            batch, done = await self._next_batch()
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch):
+        start = time.monotonic()
+        try:
+            results = await asyncio.to_thread(self.write_batch, self.supabase, batch)
+        except Exception as e:
+            print(f"❌ 배치 저장 에러 ({len(batch)}개): {e}")
+            traceback.print_exc()
+            results = [ARTICLE_FAILED] * len(batch)
+        elapsed = time.monotonic() - start
+
+        stats = self.stats
+        stats['batches'] += 1
+        stats['articles'] += len(batch)
+        stats['max_batch'] = max(stats['max_batch'], len(batch))
+        stats['write_time'] += elapsed
+        stats['max_write_time'] = max(stats['max_write_time'], elapsed)
+
+        saved_count = 0
+        spooled_count = 0
+        for article_data, status in zip(batch, results):
+            if status == ARTICLE_INSERTED:
+                saved_count += 1
+                self.saved.append(article_data)
+                if self.on_saved:
+                    self.on_saved(article_data)
+            elif status == ARTICLE_SPOOLED:
+                spooled_count += 1
+                stats['spooled'] += 1
+                self.spooled.append(article_data)
+            elif status == ARTICLE_SKIPPED:
+                stats['skipped'] += 1
+            else:
+                stats['failed'] += 1
+        if spooled_count:
+            print(f"📮 {self.name} 배치 스풀 기록: {spooled_count}/{len(batch)}개, {elapsed:.2f}초")
+        else:
+            print(f"💾 {self.name} 배치 저장: {saved_count}/{len(batch)}개, {elapsed:.2f}초")
+
+    def print_stats(self):
+        stats = self.stats
+        avg_batch = stats['articles'] / stats['batches'] if stats['batches'] else 0
+        avg_time = stats['write_time'] / stats['batches'] if stats['batches'] else 0
+        print(
+            f"💾 {self.name} 저장 단계: 배치 {stats['batches']}개 (평균 {avg_batch:.1f}개, 최대 {stats['max_batch']}개), "
+            f"저장 {len(self.saved)}개, 스풀 기록 {stats['spooled']}개 (DB 반영 전), 중복 {stats['skipped'] + stats['duplicates']}개, 실패 {stats['failed']}개, "
+            f"배치 지연 평균 {avg_time:.2f}초 / 최대 {stats['max_write_time']:.2f}초, "
+            f"큐 대기 {stats['put_wait']:.1f}초"
+        )
@@ -0,0 +1,95 @@
+"""
+크롤링 전 기존 URL 필터
+
+크롤링 시작 시 이미 저장된 기사 URL을 한 번만 불러와 두고,
+기사 페이지로 이동하기 전에 후보 URL을 걸러냅니다.
+URL이 아주 많으면 메모리를 아끼기 위해 Bloom 필터를 사용합니다.
+URL은 정규화해서 비교하므로 추적 쿼리나 모바일 주소만 다른 URL도 걸러집니다.
+"""
+import hashlib
+import math
+
+from db import get_supabase_client, load_article_urls_from_db
+from crawlers.dedup import canonical_url
+
+# 이보다 URL이 많으면 정확한 set 대신 Bloom 필터 사용
+BLOOM_THRESHOLD = 200_000
+BLOOM_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """이중 해싱 기반 Bloom 필터"""
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.sha256(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, item):
+        return all(self._bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+class KnownUrlFilter:
+    """이미 저장됐거나 이번 실행에서 이미 예약된 URL 필터"""
+
+    def __init__(self, urls=(), use_bloom=None):
+        urls = list(urls)
+        if use_bloom is None:
+            use_bloom = len(urls) > BLOOM_THRESHOLD
+        if use_bloom:
+            # 실행 중 추가될 URL까지 고려해 여유 있게 잡음
+            self._urls = BloomFilter(capacity=len(urls) * 2)
+        else:
+            self._urls = set()
+        for url in urls:
+            self._urls.add(canonical_url(url))
+        self.use_bloom = use_bloom
+        self.loaded = len(urls)
+        self.checked = 0
+        self.skipped = 0
+
+    def __contains__(self, url):
+        return canonical_url(url) in self._urls
+
+    def add(self, url):
+        self._urls.add(canonical_url(url))
+
+    def filter_new(self, urls, limit=None):
+        """처음 보는 URL만 최대 limit개 남기고, 남긴 URL은 바로 예약(추가)해 중복 이동을 막음"""
+        new_urls = []
+        for url in urls:
+            if limit is not None and len(new_urls) >= limit:
+                break
+            self.checked += 1
+            key = canonical_url(url)
+            if key in self._urls:
+                self.skipped += 1
+                continue
+            self._urls.add(key)
+            new_urls.append(url)
+        return new_urls
+
+    def print_stats(self):
+        kind = "Bloom 필터" if self.use_bloom else "set"
+        print(f"🧹 기존 URL 필터({kind}, {self.loaded}개 로드): 후보 {self.checked}개 중 {self.skipped}개 이동 생략")
+
+
+def load_known_url_filter():
+    """DB에 저장된 URL로 필터 생성 (실패하면 빈 필터로 크롤링 계속)"""
+    try:
+        supabase = get_supabase_client()
+        return KnownUrlFilter(load_article_urls_from_db(supabase))
+    except Exception as e:
+        print(f"⚠️ 기존 URL 로드 실패, 필터 없이 진행: {e}")
+        return KnownUrlFilter()
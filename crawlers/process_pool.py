@@ -0,0 +1,121 @@
+"""
+프로세스 격리 크롤링
+
+언론사마다 별도 워커 프로세스(각자 브라우저 + CrawlEngine)에서 크롤링하고,
+저장된 기사를 큐로 바로바로 부모 프로세스에 보냅니다.
+한 언론사가 멈춰도 워커별 시간 제한이 지나면 그 워커만 종료하고,
+그때까지 받은 기사는 부분 결과로 보고합니다.
+
+워커는 각자 기사를 DB에 저장하므로 언론사 간 중복 기사 필터(crawlers/dedup.py)는 쓰지 않습니다.
+워커마다 따로 만든 인덱스로는 다른 언론사가 실은 같은 통신사 기사를 찾을 수 없어서
+중복 제거가 필요하면 기본 모드(공유 브라우저 하나, 프로세스 하나)로 실행해야 합니다.
+"""
+import asyncio
+import multiprocessing as mp
+import queue
+import time
+import traceback
+from functools import partial
+
+from crawlers.engine import DEFAULT_MAX_PAGES, crawl_outlets
+from crawlers.known_urls import load_known_url_filter
+from crawlers.site_crawler import crawl_site
+from db import close_write_spool
+
+# 언론사 워커 하나의 최대 실행 시간 (초)
+DEFAULT_TIME_LIMIT = 900
+
+# Playwright는 fork된 프로세스에서 불안정하므로 spawn 사용
+_MP_CONTEXT = mp.get_context("spawn")
+
+
+def _outlet_worker(adapter, result_queue, max_pages, rate_limits, known_urls):
+    """워커 프로세스: 언론사 하나를 크롤링하며 기사를 큐로 전송"""
+    name = adapter["name"]
+
+    def on_article(outlet, article_data):
+        result_queue.put(("article", outlet, article_data))
+
+    start_time = time.time()
+    error = None
+    try:
+        results = asyncio.run(crawl_outlets(
+            [(partial(crawl_site, adapter=adapter), name)], max_pages,
+            known_urls=known_urls, rate_limits=rate_limits, on_article=on_article, dedup=False
+        ))
+        error = results[name][2]
+    except Exception as e:
+        traceback.print_exc()
+        error = str(e)
+    # 스풀에 남은 기사를 DB에 반영하고 종료 (시간 안에 못 보낸 항목은 다음 실행 때 replay)
+    close_write_spool()
+    result_queue.put(("done", name, time.time() - start_time, error))
+
+
+def crawl_outlets_in_processes(adapters, max_pages=DEFAULT_MAX_PAGES, rate_limits=None,
+                               time_limit=DEFAULT_TIME_LIMIT, known_urls=None):
+    """언론사별 워커 프로세스로 크롤링하고 기사를 받는 대로 모음
+
+    Args:
+        adapters: 언론사 사양 dict 리스트 (crawlers/adapters.py)
+        max_pages: 워커 하나가 동시에 여는 최대 페이지 수
+        rate_limits: 언론사별 요청 속도 제한
+        time_limit: 워커 하나의 최대 실행 시간 (초), 넘으면 강제 종료
+        known_urls: 이미 저장된 URL 필터 (None이면 한 번 불러와 모든 워커에 전달)
+
+    Returns:
+        dict: 언론사 이름별 (기사 리스트, 소요시간, 에러) 튜플 - CrawlEngine.run()과 같은 형태
+    """
+    if known_urls is None:
+        known_urls = load_known_url_filter()
+    rate_limits = rate_limits or {}
+
+    result_queue = _MP_CONTEXT.Queue()
+    workers = {}
+    articles = {adapter["name"]: [] for adapter in adapters}
+    results = {}
+
+    for adapter in adapters:
+        name = adapter["name"]
+        process = _MP_CONTEXT.Process(
+            target=_outlet_worker,
+            args=(adapter, result_queue, max_pages, {name: rate_limits[name]} if name in rate_limits else {},
+                  known_urls),
+            name=f"crawl-{name}",
+            daemon=True,
+        )
+        process.start()
+        workers[name] = (process, time.time())
+        print(f"🧵 {name} 워커 프로세스 시작 (pid {process.pid})")
+
+    while len(results) < len(workers):
+        try:
+            message = result_queue.get(timeout=1.0)
+        except queue.Empty:
+            message = None
+
+        if message and message[0] == "article":
+            _, name, article_data = message
+            articles[name].append(article_data)
+        elif message and message[0] == "done":
+            _, name, duration, error = message
+            results[name] = (articles[name], duration, error)
+            workers[name][0].join(timeout=10)
+            print(f"🏁 {name} 워커 종료: {len(articles[name])}개 기사, {duration:.1f}초")
+
+        # 시간 제한 초과 또는 보고 없이 죽은 워커 정리
+        now = time.time()
+        for name, (process, started) in workers.items():
+            if name in results:
+                continue
+            if now - started > time_limit:
+                process.terminate()
+                process.join(timeout=10)
+                results[name] = (articles[name], now - started, f"시간 초과 ({time_limit}초)")
+                print(f"⏱️ {name} 워커 시간 초과로 종료: 부분 결과 {len(articles[name])}개")
+            elif not process.is_alive() and result_queue.empty():
+                results[name] = (articles[name], now - started, f"워커 비정상 종료 (exit code {process.exitcode})")
+                print(f"💥 {name} 워커 비정상 종료: 부분 결과 {len(articles[name])}개")
+
+    result_queue.close()
+    return results
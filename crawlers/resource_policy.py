@@ -0,0 +1,152 @@
+"""
+요청 단위 리소스 차단 및 트래픽 집계
+
+Chromium 실행 옵션(--disable-images 등)으로는 이미지/폰트/CSS/광고/분석 스크립트
+요청을 확실히 막을 수 없으므로, Playwright 라우팅으로 요청마다 허용/차단을 결정합니다.
+언론사별로 리소스 타입과 호스트 기준 정책을 둘 수 있고,
+페이지마다 허용/차단된 요청 수와 바이트 수를 기록합니다.
+"""
+from collections import Counter
+from urllib.parse import urlsplit
+
+# 본문 추출에 필요 없는 리소스 타입
+DEFAULT_BLOCKED_TYPES = {"image", "media", "font", "stylesheet"}
+
+# 광고/트래킹/분석 호스트 (하위 도메인 포함)
+DEFAULT_BLOCKED_HOSTS = {
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "google-analytics.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "facebook.net",
+    "scorecardresearch.com",
+    "chartbeat.com",
+    "dable.io",
+    "mobon.net",
+    "realclick.co.kr",
+    "widerplanet.com",
+    "acecounter.com",
+    "tenping.kr",
+    "adop.cc",
+}
+
+
+def _host_matches(host, domains):
+    """host가 domains 중 하나이거나 그 하위 도메인인지 확인"""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class ResourcePolicy:
+    """리소스 타입/호스트 기준 허용·차단 정책
+
+    우선순위: allowed_hosts > blocked_hosts > blocked_types
+    """
+
+    def __init__(self, blocked_types=None, blocked_hosts=None, allowed_hosts=None):
+        self.blocked_types = set(DEFAULT_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.blocked_hosts = set(DEFAULT_BLOCKED_HOSTS if blocked_hosts is None else blocked_hosts)
+        self.allowed_hosts = set(allowed_hosts or [])
+
+    def should_block(self, resource_type, host):
+        if _host_matches(host, self.allowed_hosts):
+            return False
+        if _host_matches(host, self.blocked_hosts):
+            return True
+        return resource_type in self.blocked_types
+
+
+DEFAULT_POLICY = ResourcePolicy()
+
+# 언론사별 정책: 더보기 버튼의 is_visible() 판단에 레이아웃이 필요한 곳은 CSS 허용
+OUTLET_POLICIES = {
+    "한겨레": DEFAULT_POLICY,
+    "KBS뉴스": ResourcePolicy(blocked_types={"image", "media", "font"}),
+    "YTN": ResourcePolicy(blocked_types={"image", "media", "font"}),
+    "조선일보": ResourcePolicy(blocked_types={"image", "media", "font"}),
+}
+
+
+class PageTraffic:
+    """페이지 하나의 요청/바이트 집계"""
+
+    def __init__(self, outlet):
+        self.outlet = outlet
+        self.url = ""
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+        self.blocked_requests = 0
+        self.blocked_by_type = Counter()
+        self.blocked_by_host = Counter()
+
+    def record_blocked(self, resource_type, host):
+        self.blocked_requests += 1
+        self.blocked_by_type[resource_type] += 1
+        self.blocked_by_host[host] += 1
+
+    async def record_finished(self, request):
+        """완료된(허용된) 요청의 전송 바이트 기록"""
+        self.allowed_requests += 1
+        try:
+            sizes = await request.sizes()
+            self.allowed_bytes += (
+                max(sizes.get("responseBodySize", 0), 0)
+                + max(sizes.get("responseHeadersSize", 0), 0)
+            )
+        except Exception:
+            # 페이지가 먼저 닫히면 크기 정보를 얻을 수 없음
+            pass
+
+    def to_dict(self):
+        return {
+            'outlet': self.outlet,
+            'url': self.url,
+            'allowed_requests': self.allowed_requests,
+            'allowed_bytes': self.allowed_bytes,
+            'blocked_requests': self.blocked_requests,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'blocked_by_host': dict(self.blocked_by_host),
+        }
+
+
+async def install_resource_policy(page, policy, traffic):
+    """페이지에 라우팅 핸들러를 달아 정책에 따라 요청을 차단/허용"""
+
+    async def handle_route(route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if policy.should_block(request.resource_type, host):
+            traffic.record_blocked(request.resource_type, host)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle_route)
+    page.on("requestfinished", traffic.record_finished)
+
+
+def summarize_traffic(page_traffic):
+    """페이지별 집계를 언론사별 합계로 정리"""
+    summary = {}
+    for traffic in page_traffic:
+        totals = summary.setdefault(traffic['outlet'], {
+            'pages': 0,
+            'allowed_requests': 0,
+            'allowed_bytes': 0,
+            'blocked_requests': 0,
+            'blocked_by_type': Counter(),
+            'blocked_by_host': Counter(),
+        })
+        totals['pages'] += 1
+        totals['allowed_requests'] += traffic['allowed_requests']
+        totals['allowed_bytes'] += traffic['allowed_bytes']
+        totals['blocked_requests'] += traffic['blocked_requests']
+        totals['blocked_by_type'].update(traffic['blocked_by_type'])
+        totals['blocked_by_host'].update(traffic['blocked_by_host'])
+    return summary
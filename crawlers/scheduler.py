@@ -0,0 +1,160 @@
+"""
+호스트별 요청 속도 제한 및 크롤링 스케줄러
+
+호스트마다 토큰 버킷(초당 요청 수 + 버스트)과 동시 요청 수 제한을 두고,
+429/5xx 응답을 받으면 지수 백오프와 함께 요청 속도를 낮춥니다.
+대기열 길이와 대기 시간을 집계해 동시성 튜닝에 씁니다.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+# 언론사별 설정이 없을 때 쓰는 기본값
+DEFAULT_RATE_LIMIT = {"rate": 2.0, "burst": 4, "max_in_flight": 4}
+
+# 백오프 설정 (초)
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 120.0
+# 백오프 시 속도를 줄이는 비율과 하한
+RATE_DECREASE = 0.5
+MIN_RATE = 0.2
+# 성공 응답마다 설정 속도까지 서서히 회복
+RATE_RECOVERY = 1.1
+
+
+def _is_throttle_status(status):
+    return status == 429 or (status is not None and status >= 500)
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기 (먼저 기다린 요청이 먼저 나감)"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostState:
+    """호스트 하나의 버킷, 동시 요청 제한, 백오프 상태와 지표"""
+
+    def __init__(self, outlet, host, limit):
+        self.outlet = outlet
+        self.host = host
+        self.configured_rate = limit["rate"]
+        self.bucket = TokenBucket(limit["rate"], limit["burst"])
+        self.in_flight = asyncio.Semaphore(limit["max_in_flight"])
+        self.backoff_level = 0
+        self.backoff_until = 0.0
+        # 지표
+        self.queued = 0
+        self.max_queued = 0
+        self.requests = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.throttled = 0
+
+    async def wait_backoff(self):
+        delay = self.backoff_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CrawlScheduler:
+    """언론사별 설정으로 호스트별 요청 속도/동시성을 조절하는 스케줄러"""
+
+    def __init__(self, outlet_limits=None, default_limit=None):
+        self.outlet_limits = outlet_limits or {}
+        self.default_limit = default_limit or DEFAULT_RATE_LIMIT
+        self._hosts = {}
+
+    def _host_state(self, outlet, host):
+        if host not in self._hosts:
+            limit = {**self.default_limit, **self.outlet_limits.get(outlet, {})}
+            self._hosts[host] = HostState(outlet, host, limit)
+        return self._hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, outlet, url):
+        """요청 하나를 보낼 차례가 될 때까지 대기한 뒤 실행 구간 제공"""
+        state = self._host_state(outlet, urlsplit(url).hostname or "")
+        state.queued += 1
+        state.max_queued = max(state.max_queued, state.queued)
+        start = time.monotonic()
+        try:
+            await state.in_flight.acquire()
+        finally:
+            state.queued -= 1
+        try:
+            await state.wait_backoff()
+            await state.bucket.acquire()
+            waited = time.monotonic() - start
+            state.requests += 1
+            state.wait_total += waited
+            state.wait_max = max(state.wait_max, waited)
+            yield
+        finally:
+            state.in_flight.release()
+
+    def report(self, url, status, retry_after=None):
+        """응답 상태 반영: 429/5xx면 백오프 + 감속, 성공이면 백오프 해제 + 서서히 회복"""
+        state = self._hosts.get(urlsplit(url).hostname or "")
+        if state is None:
+            return
+        if _is_throttle_status(status):
+            state.throttled += 1
+            state.backoff_level += 1
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (state.backoff_level - 1)))
+            try:
+                delay = max(delay, float(retry_after)) if retry_after else delay
+            except ValueError:
+                pass
+            state.backoff_until = max(state.backoff_until, time.monotonic() + delay)
+            state.bucket.rate = max(MIN_RATE, state.bucket.rate * RATE_DECREASE)
+            print(f"🐢 {state.host} 응답 {status}: {delay:.0f}초 백오프, 속도 {state.bucket.rate:.2f}/초로 감속")
+        elif status is not None and status < 400:
+            state.backoff_level = 0
+            state.bucket.rate = min(state.configured_rate, state.bucket.rate * RATE_RECOVERY)
+
+    def metrics(self):
+        """호스트별 대기열/대기 시간 지표"""
+        return {
+            host: {
+                'outlet': state.outlet,
+                'queued': state.queued,
+                'max_queued': state.max_queued,
+                'requests': state.requests,
+                'avg_wait': state.wait_total / state.requests if state.requests else 0.0,
+                'max_wait': state.wait_max,
+                'throttled': state.throttled,
+                'rate': state.bucket.rate,
+            }
+            for host, state in self._hosts.items()
+        }
+
+    def print_metrics(self):
+        for host, metric in self.metrics().items():
+            print(
+                f"🚥 {metric['outlet']} ({host}): 요청 {metric['requests']}건, "
+                f"최대 대기열 {metric['max_queued']}, 평균 대기 {metric['avg_wait']:.2f}초, "
+                f"최대 대기 {metric['max_wait']:.2f}초, 429/5xx {metric['throttled']}건, "
+                f"현재 속도 {metric['rate']:.2f}/초"
+            )
@@ -0,0 +1,99 @@
+"""
+셀렉터 적중률 통계
+
+언론사/용도(제목, 본문, 링크)별로 셀렉터마다 시도 횟수와 적중 횟수를 기록하고,
+과거에 가장 잘 맞았던 셀렉터부터 시도하도록 순서를 정합니다.
+통계는 실행이 끝날 때 JSON 파일에 누적 저장됩니다.
+"""
+import json
+import os
+import threading
+
+DEFAULT_STATS_PATH = os.getenv(
+    "SELECTOR_STATS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "selector_stats.json")
+)
+
+
+def _key(outlet, kind):
+    return f"{outlet}|{kind}"
+
+
+class SelectorStats:
+    """(언론사, 용도)별 셀렉터 적중 통계"""
+
+    def __init__(self, path=DEFAULT_STATS_PATH):
+        self.path = path
+        self._stats = {}
+        self._deltas = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATS_PATH):
+        stats = cls(path)
+        stats._stats = stats._read_file()
+        return stats
+
+    def _read_file(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 셀렉터 통계 로드 실패 (새로 시작): {e}")
+            return {}
+
+    def order(self, outlet, kind, selectors):
+        """적중률이 높은 셀렉터부터 정렬 (동률이면 선언 순서 유지)
+
+        시도 기록이 없는 셀렉터는 적중률 0.5로 취급합니다 (라플라스 보정).
+        """
+        stats = self._stats.get(_key(outlet, kind), {})
+
+        def hit_rate(selector):
+            hits, attempts = stats.get(selector, (0, 0))
+            return (hits + 1) / (attempts + 2)
+
+        return sorted(selectors, key=hit_rate, reverse=True)
+
+    def record(self, outlet, kind, ordered_selectors, hit_selector):
+        """ordered_selectors 순서로 시도해 hit_selector에서 멈췄음을 기록 (None이면 전부 실패)"""
+        key = _key(outlet, kind)
+        with self._lock:
+            for target in (self._stats, self._deltas):
+                bucket = target.setdefault(key, {})
+                for selector in ordered_selectors:
+                    hits, attempts = bucket.get(selector, (0, 0))
+                    if selector == hit_selector:
+                        bucket[selector] = [hits + 1, attempts + 1]
+                        break
+                    bucket[selector] = [hits, attempts + 1]
+
+    def save(self):
+        """이번 실행의 증가분을 파일의 최신 내용에 더해 저장 (여러 프로세스가 써도 누락 없음)"""
+        if not self.path or not self._deltas:
+            return
+        with self._lock:
+            merged = self._read_file()
+            for key, bucket in self._deltas.items():
+                merged_bucket = merged.setdefault(key, {})
+                for selector, (hits, attempts) in bucket.items():
+                    old_hits, old_attempts = merged_bucket.get(selector, (0, 0))
+                    merged_bucket[selector] = [old_hits + hits, old_attempts + attempts]
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+                self._stats = merged
+                self._deltas = {}
+            except Exception as e:
+                print(f"⚠️ 셀렉터 통계 저장 실패: {e}")
+
+    def print_summary(self):
+        for key, bucket in sorted(self._deltas.items()):
+            ranked = sorted(bucket.items(), key=lambda item: item[1][0], reverse=True)
+            summary = ", ".join(f"{selector} {hits}/{attempts}" for selector, (hits, attempts) in ranked[:3])
+            print(f"🎯 {key} 셀렉터 적중: {summary}")
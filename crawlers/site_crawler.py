@@ -0,0 +1,245 @@
+"""
+어댑터 사양 기반 범용 언론사 크롤러
+
+adapters.py의 언론사 사양 하나를 받아 카테고리 목록 수집 → 새 URL 필터링 →
+기사 본문 추출까지 CrawlEngine 위에서 수행하고,
+추출한 기사는 ArticleWriter 큐로 넘겨 수집과 겹쳐서 배치로 DB에 저장합니다.
+"""
+import asyncio
+import traceback
+from functools import partial
+
+from db import get_supabase_client, save_articles_bulk, spool_articles_bulk
+from db.spool import WRITE_SPOOL_ENABLED
+from crawlers.engine import collect_links, run_outlet_sync
+from crawlers.ingest import ArticleWriter
+from crawlers.wait_policy import count_links
+
+ARTICLES_PER_CATEGORY = 30
+
+
+def _fill_path(value, category):
+    """셀렉터/패턴의 {path}를 카테고리 path로 치환"""
+    return value.replace("{path}", category.get("path", ""))
+
+
+def _normalize_links(adapter, category, hrefs):
+    """상대 경로를 절대 URL로 바꾸고 링크 패턴에 맞는 URL만 남김 (중복 제거, 순서 유지)"""
+    base_url = adapter["base_url"]
+    patterns = [_fill_path(pattern, category) for pattern in adapter.get("link_patterns", [])]
+    urls = []
+    seen = set()
+    for href in hrefs:
+        if not href:
+            continue
+        if href.startswith("/"):
+            url = base_url + href
+        elif href.startswith(base_url):
+            url = href
+        else:
+            continue
+        if patterns and not any(pattern in url for pattern in patterns):
+            continue
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def _pick_links(engine, adapter, category, link_map):
+    """적중률 순서로 셀렉터를 보면서 처음으로 유효한 URL을 준 셀렉터의 결과 사용"""
+    outlet = adapter["name"]
+    ordered = engine.selector_stats.order(outlet, "links", adapter["link_selectors"])
+    hit = None
+    urls = []
+    for template in ordered:
+        selector = _fill_path(template, category)
+        urls = _normalize_links(adapter, category, link_map.get(selector, []))
+        if urls:
+            hit = template
+            print(f"'{selector}' 셀렉터로 {len(link_map[selector])}개 링크 발견")
+            break
+    engine.selector_stats.record(outlet, "links", ordered, hit)
+    return urls[:adapter.get("max_links", len(urls))]
+
+
+async def _click_more(page, selectors):
+    """보이는 더보기 버튼을 찾아 클릭 (클릭한 셀렉터 반환)"""
+    for selector in selectors:
+        try:
+            more_button = await page.query_selector(selector)
+            if more_button and await more_button.is_visible():
+                await more_button.click()
+                return selector
+        except Exception as e:
+            print(f"더보기 클릭 에러: {e}")
+            traceback.print_exc()
+    return None
+
+
+async def _expand_listing(page, adapter, waiter):
+    """scroll/more 방식 목록을 스크롤과 더보기 클릭으로 확장 (새 링크가 안 늘면 중단)"""
+    count_selector = adapter["link_count_selector"]
+    more_selectors = adapter.get("more_button_selectors", [])
+    target = adapter.get("articles_per_category", ARTICLES_PER_CATEGORY)
+    max_expansions = adapter.get("max_expansions", 5)
+    for i in range(max_expansions):
+        link_count = await count_links(page, count_selector)
+        if adapter["pagination"] == "more":
+            print(f"현재 로드된 기사 개수: {link_count}")
+            if link_count >= target:
+                print(f"{target}개 이상 기사 로드 완료!")
+                break
+            clicked = await _click_more(page, more_selectors)
+            if not clicked:
+                print("더보기 버튼을 찾을 수 없음. 스크롤 시도...")
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        else:
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            clicked = await _click_more(page, more_selectors)
+        if clicked:
+            print(f"더보기 버튼 클릭 {i+1}/{max_expansions} (셀렉터: {clicked})")
+        if not await waiter.new_links(page, count_selector, link_count):
+            # 스크롤/더보기로 더 늘어나는 목록이 없음
+            break
+
+
+async def _collect_expanded_links(engine, adapter, category, selectors):
+    """Playwright로 목록 페이지를 열어 확장한 뒤 셀렉터별 링크 추출"""
+    outlet = adapter["name"]
+    async with engine.page(outlet) as page:
+        await engine.goto(page, outlet, category["url"], adapter.get("wait_until", "domcontentloaded"))
+        waiter = engine.waiter(outlet)
+        await waiter.selector(page, adapter["link_count_selector"])
+        await _expand_listing(page, adapter, waiter)
+        return await collect_links(page, selectors)
+
+
+async def _collect_listing_urls(engine, adapter, category, selectors, target):
+    """scroll/more 목록 URL 수집: 정적 첫 화면만으로 충분하면 Playwright 확장 생략
+
+    목록은 최신순이므로 정적 HTML에 이미 저장된 기사가 섞여 있으면
+    그 아래는 모두 수집된 기사로 보고 스크롤/더보기를 하지 않습니다.
+    """
+    outlet = adapter["name"]
+    if adapter.get("static_listing", True):
+        link_map = await engine.fetch_links(outlet, category["url"], selectors, static_only=True)
+        if any(link_map.values()):
+            urls = _pick_links(engine, adapter, category, link_map)
+            new_count = sum(1 for url in urls if url not in engine.known_urls)
+            if urls and (new_count >= target or new_count < len(urls)):
+                print(f"정적 목록으로 충분 (새 기사 {new_count}개), 목록 확장 생략")
+                return urls
+    link_map = await _collect_expanded_links(engine, adapter, category, selectors)
+    return _pick_links(engine, adapter, category, link_map)
+
+
+async def _crawl_article(engine, writer, adapter, category, article_url):
+    """기사 페이지 하나에서 제목/본문을 추출하고 저장 큐에 추가"""
+    outlet = adapter["name"]
+    min_length = adapter.get("min_content_length", 0)
+    try:
+        title, content = await engine.fetch_article(
+            outlet, article_url, adapter["content_selectors"], adapter.get("title_selectors"),
+            min_content_length=min_length, wait_until=adapter.get("wait_until", "domcontentloaded")
+        )
+        if adapter.get("skip_short_content"):
+            if not title or len(content) <= min_length:
+                print(f"❌ 본문이 부족한 기사 건너뜀: {article_url}")
+                return None
+        else:
+            title = title or "제목 없음"
+            content = content or "본문을 추출할 수 없습니다."
+        article_data = {
+            "title": title,
+            "content": content,
+            "category": category["name"],
+            "url": article_url,
+            "media_outlet": outlet,
+            **adapter.get("extra_fields", {})
+        }
+        await writer.put(article_data)
+        return article_data
+    except Exception as e:
+        print(f"❌ 기사 처리 중 에러 {article_url}: {e}")
+        traceback.print_exc()
+    return None
+
+
+async def _crawl_articles(engine, writer, adapter, category, article_urls, already_collected=0):
+    """기사 URL들을 공유 페이지 풀에서 동시에 수집"""
+    results = await asyncio.gather(*(
+        _crawl_article(engine, writer, adapter, category, article_url)
+        for article_url in article_urls
+    ))
+    collected = []
+    for article_data in results:
+        if article_data:
+            collected.append(article_data)
+            print(f"✅ {already_collected + len(collected)}번째 기사 수집: {article_data['title'][:50]}...")
+    return collected
+
+
+async def _crawl_category(engine, writer, adapter, category):
+    """카테고리 하나의 목록을 모으고 새 기사들을 수집 (저장 큐에 넣은 기사 리스트 반환)"""
+    outlet = adapter["name"]
+    target = adapter.get("articles_per_category", ARTICLES_PER_CATEGORY)
+    selectors = [_fill_path(selector, category) for selector in adapter["link_selectors"]]
+    print(f"\n=== {outlet} {category['name']} 기사 크롤링 시작 ===")
+    collected = []
+    if adapter["pagination"] == "pages":
+        for page_num in range(1, adapter.get("max_pages", 5) + 1):
+            if len(collected) >= target:
+                break
+            url = category["url"].format(page=page_num)
+            print(f"페이지 이동: {url}")
+            try:
+                link_map = await engine.fetch_links(outlet, url, selectors)
+            except Exception as e:
+                print(f"페이지 로딩 에러: {e}")
+                traceback.print_exc()
+                break
+            article_urls = engine.filter_new_urls(
+                _pick_links(engine, adapter, category, link_map), target - len(collected)
+            )
+            print(f"이 페이지에서 {len(article_urls)}개 새로운 기사 URL 발견")
+            collected.extend(await _crawl_articles(engine, writer, adapter, category, article_urls, len(collected)))
+    else:
+        all_urls = await _collect_listing_urls(engine, adapter, category, selectors, target)
+        article_urls = engine.filter_new_urls(all_urls, target)
+        print(f"수집된 기사 URL: {len(all_urls)}개 (새 기사 {len(article_urls)}개)")
+        collected = await _crawl_articles(engine, writer, adapter, category, article_urls)
+    print(f"✅ {outlet} {category['name']} 완료: {len(collected)}개 수집")
+    return collected
+
+
+async def crawl_site(engine, adapter):
+    """공유 엔진에서 언론사 하나의 전 카테고리를 동시에 크롤링
+
+    Returns:
+        list: DB 저장에 성공한 기사 리스트 (스풀에 기록만 된 기사는 제외, DB 반영은 스풀 통계로 확인)
+    """
+    # Supabase 클라이언트 초기화
+    supabase = get_supabase_client()
+    print(f"🔗 {adapter['name']} Supabase 연결 완료")
+
+    outlet = adapter["name"]
+    on_saved = (lambda article_data: engine.on_article(outlet, article_data)) if engine.on_article else None
+    # 스풀을 쓰면 DB 응답을 기다리지 않고 로컬 파일에 기록한 뒤 계속 수집
+    write_batch = spool_articles_bulk if WRITE_SPOOL_ENABLED else save_articles_bulk
+    async with ArticleWriter(supabase, name=outlet, write_batch=write_batch, on_saved=on_saved,
+                             deduper=engine.deduper) as writer:
+        await asyncio.gather(*(
+            _crawl_category(engine, writer, adapter, category) for category in adapter["categories"]
+        ))
+    return writer.saved
+
+
+def site_crawlers(adapters):
+    """CrawlEngine.run()에 넘길 (크롤러 함수, 언론사 이름) 목록 생성"""
+    return [(partial(crawl_site, adapter=adapter), adapter["name"]) for adapter in adapters]
+
+
+def run_site_sync(adapter):
+    """언론사 하나를 동기 방식으로 크롤링 (기존 crawl_xxx() 호환용)"""
+    return run_outlet_sync(partial(crawl_site, adapter=adapter), adapter["name"])
@@ -0,0 +1,108 @@
+"""
+이벤트 기반 대기 정책
+
+goto/스크롤/더보기 클릭 뒤에 고정 시간(time.sleep) 대신
+셀렉터 등장, 네트워크 유휴, "새 링크 등장" 조건을 기다립니다.
+언론사별로 타임아웃을 따로 둘 수 있고, 실제로 기다린 시간을 기록해 튜닝에 씁니다.
+"""
+import time
+from collections import defaultdict
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+
+class WaitPolicy:
+    """대기 종류별 타임아웃 (ms)"""
+
+    def __init__(self, selector_timeout=5000, network_idle_timeout=3000, new_links_timeout=3000):
+        self.selector_timeout = selector_timeout
+        self.network_idle_timeout = network_idle_timeout
+        self.new_links_timeout = new_links_timeout
+
+
+DEFAULT_WAIT_POLICY = WaitPolicy()
+
+# 언론사별 타임아웃: 목록을 JS로 그리는 곳은 조금 더 길게
+OUTLET_WAIT_POLICIES = {
+    "한겨레": WaitPolicy(selector_timeout=4000),
+    "KBS뉴스": WaitPolicy(selector_timeout=6000, new_links_timeout=4000),
+    "YTN": WaitPolicy(selector_timeout=6000, new_links_timeout=4000),
+    "조선일보": WaitPolicy(selector_timeout=8000, new_links_timeout=5000),
+}
+
+
+class WaitStats:
+    """(언론사, 대기 종류)별 실제 대기 시간 집계"""
+
+    def __init__(self):
+        self._records = defaultdict(list)
+
+    def record(self, outlet, kind, seconds, satisfied):
+        self._records[(outlet, kind)].append((seconds, satisfied))
+
+    def summary(self):
+        summary = {}
+        for (outlet, kind), records in self._records.items():
+            durations = [seconds for seconds, _ in records]
+            summary[(outlet, kind)] = {
+                'count': len(records),
+                'total': sum(durations),
+                'avg': sum(durations) / len(durations),
+                'max': max(durations),
+                'timeouts': sum(1 for _, satisfied in records if not satisfied),
+            }
+        return summary
+
+    def print_summary(self):
+        for (outlet, kind), stats in sorted(self.summary().items()):
+            print(
+                f"⏳ {outlet} {kind} 대기: {stats['count']}회, 합계 {stats['total']:.1f}초, "
+                f"평균 {stats['avg']:.2f}초, 최대 {stats['max']:.2f}초, 타임아웃 {stats['timeouts']}회"
+            )
+
+
+class Waiter:
+    """언론사 정책과 집계 객체를 묶은 대기 도우미"""
+
+    def __init__(self, outlet, policy, stats):
+        self.outlet = outlet
+        self.policy = policy
+        self.stats = stats
+
+    async def _timed(self, kind, waitable):
+        start = time.monotonic()
+        satisfied = True
+        try:
+            await waitable
+        except PlaywrightTimeoutError:
+            satisfied = False
+        self.stats.record(self.outlet, kind, time.monotonic() - start, satisfied)
+        return satisfied
+
+    async def selector(self, page, selector):
+        """셀렉터에 해당하는 요소가 DOM에 붙을 때까지 대기"""
+        return await self._timed("selector", page.wait_for_selector(
+            selector, state="attached", timeout=self.policy.selector_timeout
+        ))
+
+    async def network_idle(self, page):
+        """네트워크 요청이 잠잠해질 때까지 대기"""
+        return await self._timed("network_idle", page.wait_for_load_state(
+            "networkidle", timeout=self.policy.network_idle_timeout
+        ))
+
+    async def new_links(self, page, selector, previous_count):
+        """셀렉터에 해당하는 링크 수가 previous_count보다 늘어날 때까지 대기
+
+        Returns:
+            bool: 새 링크가 나타났는지 여부
+        """
+        return await self._timed("new_links", page.wait_for_function(
+            "([selector, count]) => document.querySelectorAll(selector).length > count",
+            arg=[selector, previous_count],
+            timeout=self.policy.new_links_timeout
+        ))
+
+
+async def count_links(page, selector):
+    return await page.eval_on_selector_all(selector, "els => els.length")
@@ -1,22 +1,64 @@
-from .client import init_supabase, get_supabase_client, get_media_outlet_id, get_category_id
+from .client import (
+    init_supabase,
+    get_supabase_client,
+    close_supabase_client,
+    get_client_stats,
+    print_client_stats,
+    get_media_outlet_id,
+    get_category_id,
+    get_outlet_bias
+)
+from .reference_cache import reference_cache, attach_reference_data
+from .storage import StorageBackend
+from .sqlite_store import SQLiteStore
 from .upload_articles import (
     save_article_to_db, 
+    save_articles_bulk,
     load_articles_from_db,
+    iter_articles_from_db,
+    ARTICLE_COLUMNS,
+    ARTICLE_ANALYSIS_COLUMNS,
+    load_article_urls_from_db,
     save_cluster_to_db,
     save_cluster_articles_to_db,
     save_analysis_session_to_db,
-    load_clusters_from_db
+    commit_analysis_session,
+    load_clusters_from_db,
+    load_analysis_watermark,
+    load_article_embeddings,
+    save_article_embeddings
 )
+from .spool import get_write_spool, close_write_spool, spool_articles_bulk
 
 __all__ = [
     'init_supabase',
     'get_supabase_client', 
+    'close_supabase_client',
+    'get_client_stats',
+    'print_client_stats',
     'get_media_outlet_id',
     'get_category_id',
+    'get_outlet_bias',
+    'reference_cache',
+    'attach_reference_data',
+    'StorageBackend',
+    'SQLiteStore',
     'save_article_to_db',
+    'save_articles_bulk',
     'load_articles_from_db',
+    'iter_articles_from_db',
+    'ARTICLE_COLUMNS',
+    'ARTICLE_ANALYSIS_COLUMNS',
+    'load_article_urls_from_db',
     'save_cluster_to_db',
     'save_cluster_articles_to_db',
     'save_analysis_session_to_db',
-    'load_clusters_from_db'
+    'commit_analysis_session',
+    'load_clusters_from_db',
+    'load_analysis_watermark',
+    'load_article_embeddings',
+    'save_article_embeddings',
+    'get_write_spool',
+    'close_write_spool',
+    'spool_articles_bulk'
 ] 
\ No newline at end of file
@@ -1,10 +1,35 @@
+import importlib.util
 import os
+import threading
+
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
+from .reference_cache import reference_cache
+from .sqlite_store import SQLiteStore
 
 # .env 파일 로드 (보안을 위해 환경변수 사용)
 load_dotenv()
 
+# 프로세스 전체에서 공유하는 Supabase 클라이언트 (keep-alive 커넥션 풀 재사용)
+_client_lock = threading.Lock()
+_shared_client = None
+_http_client = None
+_client_stats = {
+    'clients_created': 0,
+    'requests': 0,
+    'connections_opened': 0,
+    'tls_handshakes': 0,
+}
+
+# 저장소 선택: "supabase" (기본) 또는 "sqlite" (로컬 파일, SQLITE_PATH)
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+
+# 공유 HTTP 커넥션 풀 설정
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE = 10
+HTTP_TIMEOUT = 30.0
+
 def _validate_environment():
     """환경변수 검증"""
     url = os.getenv("SUPABASE_URL")
@@ -26,22 +51,87 @@ def _validate_environment():
     
     return url, key
 
-def init_supabase():
-    """Supabase 클라이언트 초기화 및 반환"""
+def _trace_connection(event_name, info):
+    """httpcore trace 이벤트로 새 커넥션 / TLS 핸드셰이크 횟수 집계"""
+    if event_name == "connection.connect_tcp.complete":
+        _client_stats['connections_opened'] += 1
+    elif event_name == "connection.start_tls.complete":
+        _client_stats['tls_handshakes'] += 1
+
+def _count_request(request):
+    _client_stats['requests'] += 1
+    request.extensions["trace"] = _trace_connection
+
+def _create_http_client():
+    """keep-alive 커넥션 풀 (h2가 설치되어 있으면 HTTP/2)"""
+    return httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+        event_hooks={'request': [_count_request]},
+    )
+
+def _create_shared_client():
+    global _http_client
+    if DB_BACKEND == "sqlite":
+        _client_stats['clients_created'] += 1
+        return SQLiteStore()
     url, key = _validate_environment()
-    return create_client(url, key)
+    _http_client = _create_http_client()
+    try:
+        client = create_client(url, key, options=ClientOptions(httpx_client=_http_client))
+    except TypeError:
+        # httpx_client 옵션이 없는 supabase 버전: 클라이언트 내부 세션을 공유
+        _http_client.close()
+        _http_client = None
+        client = create_client(url, key)
+    _client_stats['clients_created'] += 1
+    return client
+
+def init_supabase():
+    """Supabase 클라이언트 초기화 및 반환 (프로세스 공유 클라이언트)"""
+    return get_supabase_client()
 
 def get_supabase_client():
-    """Supabase 클라이언트 반환 (기존 함수와 호환성 유지)"""
-    url, key = _validate_environment()
-    return create_client(url, key)
+    """프로세스 전체에서 공유하는 Supabase 클라이언트 반환 (처음 호출 시 생성, 스레드 안전)
+
+    DB_BACKEND=sqlite면 같은 db 함수들로 쓸 수 있는 로컬 SQLiteStore를 반환합니다.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _client_lock:
+            if _shared_client is None:
+                _shared_client = _create_shared_client()
+    return _shared_client
+
+def close_supabase_client():
+    """공유 클라이언트와 커넥션 풀 정리"""
+    global _shared_client, _http_client
+    with _client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        if isinstance(_shared_client, SQLiteStore):
+            _shared_client.close()
+        _shared_client = None
+        _http_client = None
+
+def get_client_stats():
+    """공유 클라이언트의 커넥션/요청 수 (커넥션 수는 httpx_client 옵션을 지원하는 버전에서만 집계)"""
+    return dict(_client_stats)
+
+def print_client_stats():
+    stats = get_client_stats()
+    print(
+        f"🔗 Supabase 클라이언트: 생성 {stats['clients_created']}회, 요청 {stats['requests']}건, "
+        f"새 커넥션 {stats['connections_opened']}개, TLS 핸드셰이크 {stats['tls_handshakes']}회"
+    )
 
 def get_media_outlet_id(supabase: Client, outlet_name: str):
-    """언론사 이름으로 ID 조회"""
+    """언론사 이름으로 ID 조회 (참조 데이터 캐시 사용)"""
     try:
-        response = supabase.table('media_outlets').select("id").eq('name', outlet_name).execute()
-        if response.data:
-            return response.data[0]['id']
+        outlet_id = reference_cache.outlet_id(supabase, outlet_name)
+        if outlet_id is not None:
+            return outlet_id
         else:
             print(f"❌ 언론사 '{outlet_name}'을 찾을 수 없습니다.")
             return None
@@ -49,12 +139,20 @@ def get_media_outlet_id(supabase: Client, outlet_name: str):
         print(f"❌ 언론사 ID 조회 실패: {e}")
         return None
 
+def get_outlet_bias(supabase: Client, outlet_id):
+    """언론사 ID로 편향(bias) 조회 (참조 데이터 캐시 사용)"""
+    try:
+        return reference_cache.outlet_bias(supabase, outlet_id)
+    except Exception as e:
+        print(f"❌ 언론사 편향 조회 실패: {e}")
+        return None
+
 def get_category_id(supabase: Client, category_name: str):
-    """카테고리 이름으로 ID 조회"""
+    """카테고리 이름으로 ID 조회 (참조 데이터 캐시 사용)"""
     try:
-        response = supabase.table('categories').select("id").eq('name', category_name).execute()
-        if response.data:
-            return response.data[0]['id']
+        category_id = reference_cache.category_id(supabase, category_name)
+        if category_id is not None:
+            return category_id
         else:
             print(f"❌ 카테고리 '{category_name}'을 찾을 수 없습니다.")
             return None
@@ -0,0 +1,10 @@
+-- 기사 일괄 upsert(on_conflict=url)를 위한 URL 유일 제약
+-- 기존 중복 행이 있으면 가장 먼저 저장된 행만 남기고 제거한 뒤 제약을 추가합니다.
+
+DELETE FROM articles a
+USING articles b
+WHERE a.url = b.url
+  AND a.id > b.id;
+
+ALTER TABLE articles
+    ADD CONSTRAINT articles_url_key UNIQUE (url);
@@ -0,0 +1,15 @@
+-- 워터마크 기반 증분 분석
+-- analysis_sessions: 세션이 어느 카테고리를 어느 기사까지 분석했는지 기록
+-- clusters: 새 기사를 기존 클러스터에 배정하기 위한 중심 벡터
+
+ALTER TABLE analysis_sessions
+    ADD COLUMN IF NOT EXISTS category text,
+    ADD COLUMN IF NOT EXISTS mode text,
+    ADD COLUMN IF NOT EXISTS last_article_id bigint,
+    ADD COLUMN IF NOT EXISTS last_published_at timestamptz;
+
+CREATE INDEX IF NOT EXISTS analysis_sessions_watermark_idx
+    ON analysis_sessions (category, last_article_id DESC);
+
+ALTER TABLE clusters
+    ADD COLUMN IF NOT EXISTS centroid jsonb;
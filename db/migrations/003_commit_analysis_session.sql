@@ -0,0 +1,108 @@
+-- 분석 세션 일괄 커밋 (클러스터 + 클러스터-기사 관계 + 세션 기록을 한 트랜잭션으로)
+-- 읽는 쪽에서는 교체 중인 클러스터의 cluster_articles가 비어 보이는 순간이 없습니다.
+
+-- 이전 형식의 클러스터 ID 변환: 카테고리마다 0..k 정수였던 ID는 카테고리끼리 겹치므로
+-- 현재 형식 <카테고리>_<번호>로 바꾼 뒤에 중복을 정리합니다 (다른 카테고리 클러스터가 지워지지 않도록).
+-- 관계는 기사의 카테고리로 어느 클러스터였는지 찾습니다.
+UPDATE cluster_articles ca
+SET cluster_id = cat.name || '_' || ca.cluster_id::text
+FROM articles a
+JOIN categories cat ON cat.id = a.category_id
+WHERE a.id = ca.article_id
+  AND ca.cluster_id::text ~ '^[0-9]+$';
+
+UPDATE clusters
+SET cluster_id = category || '_' || cluster_id::text
+WHERE cluster_id::text ~ '^[0-9]+$'
+  AND category IS NOT NULL;
+
+-- 카테고리를 알 수 없는 이전 클러스터는 행 id로 구분해 남김
+UPDATE clusters
+SET cluster_id = 'legacy_' || id::text
+WHERE cluster_id::text ~ '^[0-9]+$';
+
+-- upsert 대상 유일 키 (같은 카테고리의 같은 번호가 여러 번 저장된 행은 먼저 저장된 것만 남김)
+DELETE FROM clusters a
+USING clusters b
+WHERE a.cluster_id = b.cluster_id
+  AND a.id > b.id;
+CREATE UNIQUE INDEX IF NOT EXISTS clusters_cluster_id_key ON clusters (cluster_id);
+
+DELETE FROM cluster_articles a
+USING cluster_articles b
+WHERE a.cluster_id = b.cluster_id
+  AND a.article_id = b.article_id
+  AND a.ctid > b.ctid;
+CREATE UNIQUE INDEX IF NOT EXISTS cluster_articles_pair_key ON cluster_articles (cluster_id, article_id);
+
+CREATE OR REPLACE FUNCTION commit_analysis_session(
+    p_clusters jsonb,
+    p_links jsonb,
+    p_session jsonb DEFAULT NULL,
+    p_replace_links boolean DEFAULT true
+)
+RETURNS bigint
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_session_id bigint;
+BEGIN
+    INSERT INTO clusters (cluster_id, category, topic, summary, article_count, bias, centroid, created_at, updated_at)
+    SELECT c->>'cluster_id',
+           c->>'category',
+           c->>'topic',
+           c->>'summary',
+           COALESCE((c->>'article_count')::int, 0),
+           c->'bias',
+           c->'centroid',
+           now(),
+           now()
+    FROM jsonb_array_elements(p_clusters) AS c
+    ON CONFLICT (cluster_id) DO UPDATE SET
+        category = EXCLUDED.category,
+        topic = EXCLUDED.topic,
+        summary = EXCLUDED.summary,
+        article_count = EXCLUDED.article_count,
+        bias = COALESCE(EXCLUDED.bias, clusters.bias),
+        centroid = COALESCE(EXCLUDED.centroid, clusters.centroid),
+        updated_at = now();
+
+    -- 새 관계를 먼저 넣고 빠진 관계만 지움
+    INSERT INTO cluster_articles (cluster_id, article_id)
+    SELECT l->>'cluster_id', (l->>'article_id')::bigint
+    FROM jsonb_array_elements(p_links) AS l
+    ON CONFLICT (cluster_id, article_id) DO NOTHING;
+
+    IF p_replace_links THEN
+        DELETE FROM cluster_articles ca
+        WHERE ca.cluster_id IN (SELECT c->>'cluster_id' FROM jsonb_array_elements(p_clusters) AS c)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM jsonb_array_elements(p_links) AS l
+              WHERE l->>'cluster_id' = ca.cluster_id
+                AND (l->>'article_id')::bigint = ca.article_id
+          );
+    END IF;
+
+    IF p_session IS NOT NULL THEN
+        INSERT INTO analysis_sessions (
+            session_name, total_articles, cluster_count, analysis_summary,
+            category, mode, last_article_id, last_published_at, created_at
+        )
+        VALUES (
+            p_session->>'session_name',
+            COALESCE((p_session->>'total_articles')::int, 0),
+            COALESCE((p_session->>'cluster_count')::int, 0),
+            COALESCE(p_session->>'analysis_summary', ''),
+            p_session->>'category',
+            p_session->>'mode',
+            (p_session->>'last_article_id')::bigint,
+            (p_session->>'last_published_at')::timestamptz,
+            now()
+        )
+        RETURNING id INTO v_session_id;
+    END IF;
+
+    RETURN v_session_id;
+END;
+$$;
@@ -0,0 +1,13 @@
+-- 기사 임베딩 저장소
+-- 기사/모델별로 임베딩과 임베딩한 텍스트의 해시를 보관해서
+-- 분석 때 새 기사나 내용이 바뀐 기사만 다시 임베딩합니다.
+-- 벡터는 clusters.centroid와 같이 jsonb 배열로 저장 (pgvector 확장 없이 사용 가능)
+
+CREATE TABLE IF NOT EXISTS article_embeddings (
+    article_id bigint NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    model text NOT NULL,
+    content_hash text NOT NULL,
+    embedding jsonb NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (article_id, model)
+);
@@ -0,0 +1,91 @@
+-- 전체 분석 세션이 같은 카테고리의 이전 클러스터를 정리하도록 commit_analysis_session 확장
+-- 재분석으로 클러스터 수가 줄면(예: 8개 → 5개) 새 세션에 없는 <카테고리>_5..7과 그 관계를
+-- 같은 트랜잭션에서 삭제합니다. 인자가 늘어나므로 003의 함수를 지우고 다시 만듭니다.
+
+DROP FUNCTION IF EXISTS commit_analysis_session(jsonb, jsonb, jsonb, boolean);
+
+CREATE OR REPLACE FUNCTION commit_analysis_session(
+    p_clusters jsonb,
+    p_links jsonb,
+    p_session jsonb DEFAULT NULL,
+    p_replace_links boolean DEFAULT true,
+    p_prune_category text DEFAULT NULL
+)
+RETURNS bigint
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_session_id bigint;
+BEGIN
+    INSERT INTO clusters (cluster_id, category, topic, summary, article_count, bias, centroid, created_at, updated_at)
+    SELECT c->>'cluster_id',
+           c->>'category',
+           c->>'topic',
+           c->>'summary',
+           COALESCE((c->>'article_count')::int, 0),
+           c->'bias',
+           c->'centroid',
+           now(),
+           now()
+    FROM jsonb_array_elements(p_clusters) AS c
+    ON CONFLICT (cluster_id) DO UPDATE SET
+        category = EXCLUDED.category,
+        topic = EXCLUDED.topic,
+        summary = EXCLUDED.summary,
+        article_count = EXCLUDED.article_count,
+        bias = COALESCE(EXCLUDED.bias, clusters.bias),
+        centroid = COALESCE(EXCLUDED.centroid, clusters.centroid),
+        updated_at = now();
+
+    -- 새 관계를 먼저 넣고 빠진 관계만 지움
+    INSERT INTO cluster_articles (cluster_id, article_id)
+    SELECT l->>'cluster_id', (l->>'article_id')::bigint
+    FROM jsonb_array_elements(p_links) AS l
+    ON CONFLICT (cluster_id, article_id) DO NOTHING;
+
+    IF p_replace_links THEN
+        DELETE FROM cluster_articles ca
+        WHERE ca.cluster_id IN (SELECT c->>'cluster_id' FROM jsonb_array_elements(p_clusters) AS c)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM jsonb_array_elements(p_links) AS l
+              WHERE l->>'cluster_id' = ca.cluster_id
+                AND (l->>'article_id')::bigint = ca.article_id
+          );
+    END IF;
+
+    -- 전체 분석: 이 카테고리에서 이번 세션에 없는 이전 클러스터와 그 관계 삭제
+    -- (남겨 두면 증분 분석이 오래된 중심에 새 기사를 합침)
+    IF p_prune_category IS NOT NULL THEN
+        DELETE FROM cluster_articles ca
+        USING clusters c
+        WHERE ca.cluster_id = c.cluster_id
+          AND c.category = p_prune_category
+          AND c.cluster_id NOT IN (SELECT x->>'cluster_id' FROM jsonb_array_elements(p_clusters) AS x);
+        DELETE FROM clusters c
+        WHERE c.category = p_prune_category
+          AND c.cluster_id NOT IN (SELECT x->>'cluster_id' FROM jsonb_array_elements(p_clusters) AS x);
+    END IF;
+
+    IF p_session IS NOT NULL THEN
+        INSERT INTO analysis_sessions (
+            session_name, total_articles, cluster_count, analysis_summary,
+            category, mode, last_article_id, last_published_at, created_at
+        )
+        VALUES (
+            p_session->>'session_name',
+            COALESCE((p_session->>'total_articles')::int, 0),
+            COALESCE((p_session->>'cluster_count')::int, 0),
+            COALESCE(p_session->>'analysis_summary', ''),
+            p_session->>'category',
+            p_session->>'mode',
+            (p_session->>'last_article_id')::bigint,
+            (p_session->>'last_published_at')::timestamptz,
+            now()
+        )
+        RETURNING id INTO v_session_id;
+    END IF;
+
+    RETURN v_session_id;
+END;
+$$;
@@ -0,0 +1,12 @@
+-- 분석 단계용 본문 앞부분 계산 컬럼
+-- PostgREST에서 select=content:content_prefix로 요청하면 서버에서 자른 본문만 전송됩니다.
+-- 분석 단계는 본문 앞부분(analyzer CONTENT_PREFIX_CHARS)만 쓰므로 전체 본문을 받지 않아도 됩니다.
+-- 길이는 db/upload_articles.py의 SERVER_CONTENT_PREFIX_CHARS와 같아야 합니다.
+
+CREATE OR REPLACE FUNCTION content_prefix(articles)
+RETURNS text
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT left($1.content, 1000);
+$$;
@@ -0,0 +1,111 @@
+"""
+언론사/카테고리 참조 데이터 캐시
+
+media_outlets, categories 테이블은 작고 거의 바뀌지 않으므로 프로세스에서 한 번 읽어 두고
+이름 → ID, 언론사 ID → 편향(bias) 조회를 메모리에서 처리합니다.
+TTL이 지나면 다시 읽고, 테이블을 수정했다면 invalidate()로 즉시 버릴 수 있습니다.
+"""
+import threading
+import time
+
+from .storage import StorageBackend
+
+# 참조 데이터를 다시 읽는 주기 (초)
+REFERENCE_TTL = 3600
+# 모르는 이름을 만났을 때 다시 읽는 최소 간격 (초) - 새 언론사 추가 대응
+MISS_RELOAD_INTERVAL = 60
+
+
+class ReferenceCache:
+    """media_outlets / categories 테이블 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl=REFERENCE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._outlets = {}
+        self._categories = {}
+        self._outlet_ids = {}
+        self._category_ids = {}
+
+    def invalidate(self):
+        """캐시를 비워 다음 조회 때 다시 읽도록 함"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _load(self, supabase):
+        if isinstance(supabase, StorageBackend):
+            outlets, categories = supabase.reference_rows()
+        else:
+            outlets = supabase.table('media_outlets').select("id, name, bias").execute().data or []
+            categories = supabase.table('categories').select("id, name").execute().data or []
+        self._outlets = {row['id']: row for row in outlets}
+        self._categories = {row['id']: row for row in categories}
+        self._outlet_ids = {row['name']: row['id'] for row in outlets}
+        self._category_ids = {row['name']: row['id'] for row in categories}
+        self._loaded_at = time.monotonic()
+        print(f"📚 참조 데이터 로드: 언론사 {len(outlets)}개, 카테고리 {len(categories)}개")
+
+    def _ensure(self, supabase, reload_after=None):
+        """TTL이 지났거나 (reload_after초보다 오래됐으면) 테이블을 다시 읽음"""
+        with self._lock:
+            age = None if self._loaded_at is None else time.monotonic() - self._loaded_at
+            limit = self.ttl if reload_after is None else reload_after
+            if age is None or age > limit:
+                self._load(supabase)
+
+    def _lookup(self, supabase, mapping_name, name):
+        self._ensure(supabase)
+        value = getattr(self, mapping_name).get(name)
+        if value is None:
+            self._ensure(supabase, reload_after=MISS_RELOAD_INTERVAL)
+            value = getattr(self, mapping_name).get(name)
+        return value
+
+    def outlet_id(self, supabase, outlet_name):
+        """언론사 이름 → ID (없으면 None)"""
+        return self._lookup(supabase, '_outlet_ids', outlet_name)
+
+    def category_id(self, supabase, category_name):
+        """카테고리 이름 → ID (없으면 None)"""
+        return self._lookup(supabase, '_category_ids', category_name)
+
+    def outlet(self, supabase, outlet_id):
+        """언론사 ID → {'id', 'name', 'bias'} (없으면 None)"""
+        return self._lookup(supabase, '_outlets', outlet_id)
+
+    def outlet_bias(self, supabase, outlet_id):
+        """언론사 ID → 편향 ('left' / 'center' / 'right', 없으면 None)"""
+        outlet = self.outlet(supabase, outlet_id)
+        return outlet.get('bias') if outlet else None
+
+    def category(self, supabase, category_id):
+        """카테고리 ID → {'id', 'name'} (없으면 None)"""
+        return self._lookup(supabase, '_categories', category_id)
+
+    def outlet_ids(self, supabase):
+        """언론사 이름 → ID 전체 매핑"""
+        self._ensure(supabase)
+        return dict(self._outlet_ids)
+
+    def category_ids(self, supabase):
+        """카테고리 이름 → ID 전체 매핑"""
+        self._ensure(supabase)
+        return dict(self._category_ids)
+
+
+# 프로세스 전체에서 공유하는 캐시
+reference_cache = ReferenceCache()
+
+
+def attach_reference_data(supabase, articles):
+    """media_outlet_id / category_id만 읽어 온 기사 행에 조인 결과와 같은 형태의 정보 추가
+
+    서버 조인(media_outlets(name, bias), categories(name)) 대신 캐시로 채웁니다.
+    """
+    for article in articles:
+        outlet = reference_cache.outlet(supabase, article.get('media_outlet_id'))
+        category = reference_cache.category(supabase, article.get('category_id'))
+        article['media_outlets'] = {'name': outlet['name'], 'bias': outlet.get('bias')} if outlet else None
+        article['categories'] = {'name': category['name']} if category else None
+    return articles
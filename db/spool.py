@@ -0,0 +1,317 @@
+"""
+DB 쓰기 지연(write-behind) 스풀
+
+기사 저장 요청을 먼저 로컬 추가 전용(JSONL) 스풀 파일에 기록하고 바로 반환한 뒤,
+백그라운드 스레드가 배치로 모아 DB에 씁니다. 실패한 배치는 지수 백오프로 다시 시도하고,
+DB에 반영된 항목은 스풀에 ack 줄을 남깁니다.
+프로세스가 비정상 종료되어 남은 항목은 다음 실행 때 스풀을 열면서 다시 보냅니다 (replay).
+크롤러는 DB_WRITE_SPOOL=1일 때만 스풀을 씁니다 (기본은 DB에 바로 저장).
+
+스풀 파일 형식 (한 줄에 하나):
+    {"seq": 1, "kind": "articles", "payload": {...}}   # 쓰기 요청
+    {"ack": 1}                                          # DB 반영 완료
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+
+from .storage import ARTICLE_FAILED, ARTICLE_SPOOLED
+from .upload_articles import save_articles_bulk
+
+try:
+    import fcntl
+except ImportError:  # Windows: 다른 프로세스 스풀 소유 여부를 확인하지 못함
+    fcntl = None
+
+DEFAULT_SPOOL_DIR = os.getenv(
+    "DB_SPOOL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".spool")
+)
+# DB_WRITE_SPOOL=1이면 크롤러가 기사를 스풀에 기록
+# 기본값(0)은 바로 DB에 저장하므로 DB 장애 중 저장에 실패한 기사는 보존되지 않음
+WRITE_SPOOL_ENABLED = os.getenv("DB_WRITE_SPOOL", "0") == "1"
+
+# 한 번에 DB로 보내는 최대 항목 수
+FLUSH_BATCH_SIZE = 50
+# 배치가 덜 찼어도 이 시간(초)이 지나면 전송
+FLUSH_INTERVAL = 1.0
+# 실패 시 재시도 대기 (초): RETRY_BASE * 2^(연속 실패 - 1), 최대 RETRY_MAX
+RETRY_BASE = 1.0
+RETRY_MAX = 60.0
+# 이 횟수만큼 실패한 항목은 failed-writes.jsonl로 옮기고 포기
+MAX_ATTEMPTS = 8
+# 종료 시 남은 항목을 보내려고 기다리는 최대 시간 (초)
+CLOSE_TIMEOUT = 30.0
+
+
+def _flush_articles(supabase, payloads):
+    """기사 배치 저장 → 항목별 완료 여부 (DB 요청 실패만 재시도, 중복/누락 데이터는 완료 처리)"""
+    return [status != ARTICLE_FAILED for status in save_articles_bulk(supabase, payloads)]
+
+
+# 스풀 항목 종류별 배치 저장 함수 (supabase, payload 리스트) → 항목별 성공 여부 리스트
+SPOOL_WRITERS = {
+    'articles': _flush_articles,
+}
+
+
+class WriteSpool:
+    """프로세스마다 하나씩 쓰는 추가 전용 스풀 파일 + 백그라운드 전송 스레드"""
+
+    def __init__(self, supabase, spool_dir=DEFAULT_SPOOL_DIR, batch_size=FLUSH_BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, max_attempts=MAX_ATTEMPTS):
+        self.supabase = supabase
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.path = os.path.join(spool_dir, f"writes-{os.getpid()}-{int(time.time() * 1000)}.jsonl")
+        self.stats = {
+            'spooled': 0,
+            'replayed': 0,
+            'flushed': 0,
+            'batches': 0,
+            'retries': 0,
+            'dead': 0,
+        }
+        self._cond = threading.Condition()
+        self._pending = {}  # seq → {'kind', 'payload', 'attempts'} (삽입 순서 유지)
+        self._seq = 0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._batch_deadline = None
+        self._closing = False
+        self._stopped = False
+
+        os.makedirs(spool_dir, exist_ok=True)
+        # 복구 대상 glob(writes-*.jsonl)에 걸리지 않는 이름으로 만들고 잠근 뒤 제자리로 옮김
+        # (동시에 시작한 다른 프로세스가 잠그기 전의 새 파일을 고아로 보고 가져가지 않도록)
+        tmp_path = os.path.join(spool_dir, f".writes-{os.getpid()}-{int(time.time() * 1000)}.tmp")
+        self._file = open(tmp_path, "w", encoding="utf-8")
+        if fcntl:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        orphans = self._claim_orphans()
+        os.rename(tmp_path, self.path)
+        self._replay(orphans)
+
+        self._thread = threading.Thread(target=self._run, name="db-write-spool", daemon=True)
+        self._thread.start()
+
+    # 시작 시 복구
+    def _claim_orphans(self):
+        """다른 프로세스가 쓰고 있지 않은 스풀 파일에서 ack 안 된 항목을 읽음
+
+        Returns:
+            list: (경로, 잠금 중인 파일 또는 None, 남은 항목 리스트)
+        """
+        orphans = []
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, "writes-*.jsonl"))):
+            handle = open(path, "r", encoding="utf-8")
+            if fcntl:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    handle.close()  # 실행 중인 다른 프로세스의 스풀
+                    continue
+            entries = {}
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 기록 도중 종료되어 잘린 마지막 줄
+                if 'ack' in record:
+                    entries.pop(record['ack'], None)
+                elif 'seq' in record:
+                    entries[record['seq']] = record
+            orphans.append((path, handle, list(entries.values())))
+        return orphans
+
+    def _replay(self, orphans):
+        """남은 항목을 새 스풀 파일로 옮긴 뒤 이전 파일 삭제"""
+        records = [record for _, _, entries in orphans for record in entries]
+        for record in records:
+            self._append(record['kind'], record['payload'], record.get('attempts', 0))
+        self._sync()
+        for path, handle, _ in orphans:
+            os.remove(path)
+            handle.close()
+        if records:
+            self.stats['replayed'] = len(records)
+            print(f"♻️ 지난 실행에서 남은 DB 쓰기 {len(records)}건 다시 전송 예정")
+
+    # 기록
+    def _append(self, kind, payload, attempts=0):
+        self._seq += 1
+        record = {'seq': self._seq, 'kind': kind, 'payload': payload}
+        if attempts:
+            record['attempts'] = attempts
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._pending[self._seq] = {'kind': kind, 'payload': payload, 'attempts': attempts}
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append_many(self, kind, payloads):
+        """쓰기 요청을 스풀에 기록 (디스크 동기화 후 반환, DB 응답은 기다리지 않음)"""
+        if kind not in SPOOL_WRITERS:
+            raise ValueError(f"알 수 없는 스풀 항목 종류: {kind}")
+        with self._cond:
+            for payload in payloads:
+                self._append(kind, payload)
+            self._sync()
+            self.stats['spooled'] += len(payloads)
+            self._cond.notify()
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._pending)
+
+    # 전송
+    def _next_batch(self):
+        """전송할 같은 종류의 항목을 최대 batch_size개 모아 반환 (종료 시 None)"""
+        with self._cond:
+            while True:
+                if self._stopped or (self._closing and not self._pending):
+                    return None
+                now = time.monotonic()
+                if not self._pending:
+                    self._cond.wait()
+                elif now < self._retry_at:
+                    self._cond.wait(self._retry_at - now)
+                elif len(self._pending) < self.batch_size and not self._closing and (
+                        self._batch_deadline is None or now < self._batch_deadline):
+                    # 배치가 찰 때까지 최대 flush_interval만큼 더 모음
+                    if self._batch_deadline is None:
+                        self._batch_deadline = now + self.flush_interval
+                    self._cond.wait(self._batch_deadline - now)
+                else:
+                    self._batch_deadline = None
+                    first = next(iter(self._pending.values()))['kind']
+                    batch = []
+                    for seq, entry in self._pending.items():
+                        if entry['kind'] == first:
+                            batch.append((seq, entry))
+                            if len(batch) >= self.batch_size:
+                                break
+                    return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            kind = batch[0][1]['kind']
+            try:
+                results = SPOOL_WRITERS[kind](self.supabase, [entry['payload'] for _, entry in batch])
+            except Exception as e:
+                print(f"❌ 스풀 배치 전송 에러 ({kind} {len(batch)}건): {e}")
+                results = [False] * len(batch)
+            self._finish(batch, results)
+
+    def _finish(self, batch, results):
+        """성공한 항목은 ack, 실패한 항목은 재시도 횟수를 올리고 백오프"""
+        dead = []
+        with self._cond:
+            if self._file.closed:
+                return  # close() 시간 제한이 지난 뒤 끝난 배치: 다음 실행 때 replay
+            failed = 0
+            for (seq, entry), ok in zip(batch, results):
+                if not ok:
+                    entry['attempts'] += 1
+                    if entry['attempts'] < self.max_attempts:
+                        failed += 1
+                        continue
+                    dead.append(entry)
+                self._file.write(json.dumps({'ack': seq}) + "\n")
+                del self._pending[seq]
+            self._file.flush()
+            self.stats['batches'] += 1
+            self.stats['flushed'] += len(batch) - failed - len(dead)
+            self.stats['dead'] += len(dead)
+            if failed:
+                self._failures += 1
+                self.stats['retries'] += failed
+                delay = min(RETRY_MAX, RETRY_BASE * 2 ** (self._failures - 1))
+                self._retry_at = time.monotonic() + delay
+                print(f"⚠️ DB 쓰기 {failed}건 실패, {delay:.0f}초 후 재시도 (스풀 대기 {len(self._pending)}건)")
+            else:
+                self._failures = 0
+                self._retry_at = 0.0
+            if not self._pending:
+                # 모두 반영되면 스풀 파일을 비워 다음 복구 때 읽을 양을 줄임
+                self._file.seek(0)
+                self._file.truncate()
+        if dead:
+            self._write_dead(dead)
+
+    def _write_dead(self, entries):
+        path = os.path.join(self.spool_dir, "failed-writes.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        print(f"❌ DB 쓰기 {len(entries)}건이 {self.max_attempts}회 실패해 {path}에 보관")
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """남은 항목 전송을 timeout초까지 기다린 뒤 종료 (못 보낸 항목은 다음 실행 때 replay)"""
+        with self._cond:
+            if self._file.closed:
+                return
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            remaining = len(self._pending)
+            self._sync()
+            self._file.close()
+        if not remaining:
+            os.remove(self.path)
+        self.print_stats()
+
+    def print_stats(self):
+        stats = self.stats
+        print(
+            f"📮 DB 쓰기 스풀: 기록 {stats['spooled']}건, 복구 {stats['replayed']}건, 반영 {stats['flushed']}건 "
+            f"(배치 {stats['batches']}개), 재시도 {stats['retries']}건, 포기 {stats['dead']}건, "
+            f"남음 {len(self._pending)}건"
+        )
+
+
+# 프로세스 전체에서 공유하는 스풀 (처음 사용할 때 생성)
+_spool_lock = threading.Lock()
+_shared_spool = None
+
+
+def get_write_spool(supabase):
+    """프로세스 공유 스풀 반환 (처음 호출 시 지난 실행의 남은 항목을 replay)"""
+    global _shared_spool
+    if _shared_spool is None:
+        with _spool_lock:
+            if _shared_spool is None:
+                _shared_spool = WriteSpool(supabase)
+                atexit.register(close_write_spool)
+    return _shared_spool
+
+
+def close_write_spool(timeout=CLOSE_TIMEOUT):
+    """공유 스풀의 남은 쓰기를 전송하고 닫음"""
+    global _shared_spool
+    with _spool_lock:
+        spool, _shared_spool = _shared_spool, None
+    if spool is not None:
+        spool.close(timeout)
+
+
+def spool_articles_bulk(supabase, articles):
+    """save_articles_bulk 대신 쓰는 스풀 기록 (ArticleWriter의 write_batch로 사용)
+
+    Returns:
+        list: 모두 ARTICLE_SPOOLED (DB 반영은 백그라운드에서 진행)
+    """
+    get_write_spool(supabase).append_many('articles', articles)
+    return [ARTICLE_SPOOLED] * len(articles)
@@ -0,0 +1,380 @@
+"""
+로컬 SQLite 저장소 (DB_BACKEND=sqlite)
+
+Supabase와 같은 테이블 구조를 표준 라이브러리 sqlite3로 구현해서
+네트워크 없이 전체 파이프라인과 벤치마크를 돌릴 수 있게 합니다.
+분석 단계의 대량 읽기도 REST API를 거치지 않고 로컬 파일에서 처리합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from .storage import StorageBackend, ARTICLE_INSERTED, ARTICLE_SKIPPED, ARTICLE_INVALID
+
+DEFAULT_SQLITE_PATH = os.getenv(
+    "SQLITE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "local_db", "blindspot.sqlite3")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_outlets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    bias TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    ascii TEXT
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE,
+    media_outlet_id INTEGER REFERENCES media_outlets(id),
+    category_id INTEGER REFERENCES categories(id),
+    published_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S+00:00', 'now')),
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S+00:00', 'now'))
+);
+CREATE INDEX IF NOT EXISTS articles_category_idx ON articles (category_id, id);
+CREATE INDEX IF NOT EXISTS articles_published_idx ON articles (published_at);
+CREATE TABLE IF NOT EXISTS clusters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cluster_id TEXT NOT NULL UNIQUE,
+    category TEXT,
+    topic TEXT,
+    summary TEXT,
+    article_count INTEGER DEFAULT 0,
+    bias TEXT,
+    centroid TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS cluster_articles (
+    cluster_id TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (cluster_id, article_id)
+);
+CREATE TABLE IF NOT EXISTS analysis_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_name TEXT,
+    total_articles INTEGER,
+    cluster_count INTEGER,
+    analysis_summary TEXT,
+    category TEXT,
+    mode TEXT,
+    last_article_id INTEGER,
+    last_published_at TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS analysis_sessions_watermark_idx ON analysis_sessions (category, last_article_id);
+CREATE TABLE IF NOT EXISTS article_embeddings (
+    article_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    embedding TEXT NOT NULL,
+    created_at TEXT,
+    PRIMARY KEY (article_id, model)
+);
+"""
+
+# 크롤러가 다루는 언론사/카테고리 기본 데이터 (Supabase 참조 테이블과 같은 값)
+SEED_OUTLETS = [("한겨레", "left"), ("KBS뉴스", "center"), ("YTN", "center"), ("조선일보", "right")]
+SEED_CATEGORIES = [("정치", "politics"), ("경제", "economy"), ("사회", "society")]
+
+ARTICLE_FIELDS = {
+    "id": "a.id",
+    "title": "a.title",
+    "content": "a.content",
+    "url": "a.url",
+    "published_at": "a.published_at",
+    "media_outlet_id": "a.media_outlet_id",
+    "category_id": "a.category_id",
+}
+
+
+def _now():
+    """현재 시각 UTC ISO 문자열 (스키마 기본값, Supabase timestamptz와 같은 형식)"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class SQLiteStore(StorageBackend):
+    """db 함수들과 같은 API를 제공하는 로컬 SQLite 저장소 (스레드 간 공유 가능)"""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.executemany("INSERT OR IGNORE INTO media_outlets (name, bias) VALUES (?, ?)", SEED_OUTLETS)
+            self._conn.executemany("INSERT OR IGNORE INTO categories (name, ascii) VALUES (?, ?)", SEED_CATEGORIES)
+        print(f"🗄️ 로컬 SQLite 저장소 사용: {path}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    # 참조 데이터
+    def reference_rows(self):
+        return (
+            self._query("SELECT id, name, bias FROM media_outlets"),
+            self._query("SELECT id, name FROM categories"),
+        )
+
+    def _name_to_id(self, table):
+        return {row['name']: row['id'] for row in self._query(f"SELECT id, name FROM {table}")}
+
+    # 기사
+    def save_article(self, article_data=None, **kwargs):
+        article_data = article_data if isinstance(article_data, dict) else kwargs
+        statuses = self.save_articles_bulk([article_data])
+        if statuses[0] == ARTICLE_INSERTED:
+            print(f"✅ DB 저장 성공: {article_data['title'][:50]}...")
+            return True
+        if statuses[0] == ARTICLE_SKIPPED:
+            print(f"⚠️ 이미 존재하는 URL (건너뜀): {str(article_data.get('title'))[:30]}...")
+        return False
+
+    def save_articles_bulk(self, articles):
+        outlet_ids = self._name_to_id('media_outlets')
+        category_ids = self._name_to_id('categories')
+        statuses = []
+        with self._lock, self._conn:
+            for article_data in articles:
+                media_outlet_id = outlet_ids.get(article_data.get('media_outlet'))
+                category_id = category_ids.get(article_data.get('category'))
+                url = article_data.get('url')
+                if not all([article_data.get('title'), article_data.get('content'), url, media_outlet_id, category_id]):
+                    print(f"❌ 필수 데이터 누락 또는 알 수 없는 언론사/카테고리: {url}")
+                    statuses.append(ARTICLE_INVALID)
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO articles (title, content, url, media_outlet_id, category_id) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (article_data['title'], article_data['content'], url, media_outlet_id, category_id)
+                )
+                statuses.append(ARTICLE_INSERTED if cursor.rowcount else ARTICLE_SKIPPED)
+        return statuses
+
+    def iter_articles(self, columns=None, since=None, until=None, categories=None, outlets=None,
+                      content_chars=None, batch_size=1000, after_id=None):
+        columns = [column for column in (columns or ARTICLE_FIELDS) if column in ARTICLE_FIELDS]
+        if "id" not in columns:
+            columns.insert(0, "id")
+        select = [f"{ARTICLE_FIELDS[column]} AS {column}" for column in columns]
+        if content_chars is not None and "content" in columns:
+            select[columns.index("content")] = f"substr(a.content, 1, {int(content_chars)}) AS content"
+        select += ["m.name AS _outlet_name", "m.bias AS _outlet_bias", "c.name AS _category_name"]
+
+        where = []
+        params = []
+        if since is not None:
+            where.append("a.published_at >= ?")
+            params.append(str(since))
+        if until is not None:
+            where.append("a.published_at < ?")
+            params.append(str(until))
+        if categories:
+            where.append(f"c.name IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        if outlets:
+            where.append(f"m.name IN ({', '.join('?' * len(outlets))})")
+            params.extend(outlets)
+
+        last_id = after_id
+        while True:
+            conditions = where + (["a.id > ?"] if last_id is not None else [])
+            sql = (
+                f"SELECT {', '.join(select)} FROM articles a "
+                "LEFT JOIN media_outlets m ON m.id = a.media_outlet_id "
+                "LEFT JOIN categories c ON c.id = a.category_id"
+                + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+                + " ORDER BY a.id LIMIT ?"
+            )
+            rows = self._query(sql, params + ([last_id] if last_id is not None else []) + [batch_size])
+            if not rows:
+                return
+            for row in rows:
+                outlet_name = row.pop('_outlet_name')
+                outlet_bias = row.pop('_outlet_bias')
+                category_name = row.pop('_category_name')
+                row['media_outlets'] = {'name': outlet_name, 'bias': outlet_bias} if outlet_name else None
+                row['categories'] = {'name': category_name} if category_name else None
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['id']
+
+    def load_article_urls(self, page_size=1000):
+        urls = {row['url'] for row in self._query("SELECT url FROM articles")}
+        print(f"📊 저장된 기사 URL {len(urls)}개 로드 완료")
+        return urls
+
+    # 클러스터 / 분석 세션
+    def _upsert_cluster(self, cluster_data):
+        bias = cluster_data.get('bias')
+        centroid = cluster_data.get('centroid')
+        now = _now()
+        self._conn.execute(
+            "INSERT INTO clusters (cluster_id, category, topic, summary, article_count, bias, centroid, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (cluster_id) DO UPDATE SET category = COALESCE(excluded.category, clusters.category), topic = excluded.topic, "
+            "summary = excluded.summary, article_count = excluded.article_count, "
+            "bias = COALESCE(excluded.bias, clusters.bias), centroid = COALESCE(excluded.centroid, clusters.centroid), "
+            "updated_at = excluded.updated_at",
+            (
+                str(cluster_data['cluster_id']), cluster_data.get('category'), cluster_data.get('topic'),
+                cluster_data.get('summary'), cluster_data.get('article_count', 0),
+                json.dumps(bias, ensure_ascii=False) if bias is not None else None,
+                json.dumps([float(value) for value in centroid]) if centroid is not None else None,
+                now, now,
+            )
+        )
+
+    def _replace_links(self, cluster_ids, links, replace):
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO cluster_articles (cluster_id, article_id) VALUES (?, ?)",
+            [(str(link['cluster_id']), link['article_id']) for link in links]
+        )
+        if not replace:
+            return
+        keep = {}
+        for link in links:
+            keep.setdefault(str(link['cluster_id']), []).append(link['article_id'])
+        for cluster_id in cluster_ids:
+            article_ids = keep.get(str(cluster_id), [])
+            self._conn.execute(
+                f"DELETE FROM cluster_articles WHERE cluster_id = ? "
+                f"AND article_id NOT IN ({', '.join('?' * len(article_ids))})",
+                [str(cluster_id)] + article_ids
+            )
+
+    def _insert_session(self, session_data):
+        cursor = self._conn.execute(
+            "INSERT INTO analysis_sessions (session_name, total_articles, cluster_count, analysis_summary, "
+            "category, mode, last_article_id, last_published_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                session_data.get('session_name', f"분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}"),
+                session_data.get('total_articles', 0), session_data.get('cluster_count', 0),
+                session_data.get('analysis_summary', ''), session_data.get('category'), session_data.get('mode'),
+                session_data.get('last_article_id'), session_data.get('last_published_at'), _now(),
+            )
+        )
+        return cursor.lastrowid
+
+    def save_cluster(self, cluster_data):
+        if not cluster_data or cluster_data.get('cluster_id') is None or not cluster_data.get('topic'):
+            print(f"❌ 클러스터 데이터 누락: {cluster_data}")
+            return False
+        with self._lock, self._conn:
+            self._upsert_cluster(cluster_data)
+        print(f"✅ 클러스터 저장 성공: cluster_id={cluster_data['cluster_id']}")
+        return True
+
+    def save_cluster_articles(self, cluster_id, article_ids, replace=True):
+        if not cluster_id or not article_ids:
+            print(f"[경고] cluster_articles 저장 건너뜀: cluster_id={cluster_id}, article_ids={article_ids}")
+            return
+        links = [{'cluster_id': cluster_id, 'article_id': article_id} for article_id in article_ids]
+        with self._lock, self._conn:
+            self._replace_links([cluster_id], links, replace)
+        print(f"✅ 클러스터-기사 관계 저장 성공: cluster_id={cluster_id}, 기사 {len(article_ids)}개")
+        return True
+
+    def save_analysis_session(self, session_data):
+        with self._lock, self._conn:
+            session_id = self._insert_session(session_data)
+        print(f"✅ 분석 세션 저장 성공: {session_data.get('session_name')}")
+        return session_id
+
+    def _prune_clusters(self, category, keep_ids):
+        """category의 클러스터 중 keep_ids에 없는 것과 그 관계 삭제 (삭제한 수 반환)"""
+        keep_ids = [str(cluster_id) for cluster_id in keep_ids]
+        condition = f"category = ? AND cluster_id NOT IN ({', '.join('?' * len(keep_ids))})"
+        self._conn.execute(
+            f"DELETE FROM cluster_articles WHERE cluster_id IN (SELECT cluster_id FROM clusters WHERE {condition})",
+            [category] + keep_ids
+        )
+        return self._conn.execute(f"DELETE FROM clusters WHERE {condition}", [category] + keep_ids).rowcount
+
+    def commit_analysis_session(self, clusters, links, session=None, replace_links=True, prune_category=None):
+        with self._lock, self._conn:
+            for cluster_data in clusters:
+                self._upsert_cluster(cluster_data)
+            self._replace_links([cluster['cluster_id'] for cluster in clusters], links, replace_links)
+            if prune_category is not None:
+                pruned = self._prune_clusters(prune_category, [cluster['cluster_id'] for cluster in clusters])
+                if pruned:
+                    print(f"🧹 [{prune_category}] 이번 세션에 없는 이전 클러스터 {pruned}개 삭제")
+            session_id = self._insert_session(session) if session else None
+        print(f"✅ 분석 세션 커밋: 클러스터 {len(clusters)}개, 관계 {len(links)}개 (트랜잭션)")
+        return session_id
+
+    def load_clusters(self, category=None, with_centroids=False):
+        columns = "id, cluster_id, category, topic, summary, article_count, created_at, updated_at"
+        if with_centroids:
+            columns += ", bias, centroid"
+        sql = f"SELECT {columns} FROM clusters"
+        params = ()
+        if category is not None:
+            sql += " WHERE category = ?"
+            params = (category,)
+        rows = self._query(sql + " ORDER BY cluster_id", params)
+        for row in rows:
+            for key in ('bias', 'centroid'):
+                if row.get(key):
+                    row[key] = json.loads(row[key])
+        print(f"📊 총 {len(rows)}개 클러스터 로드 완료")
+        return rows
+
+    def load_analysis_watermark(self, category=None):
+        sql = "SELECT MAX(last_article_id) AS last_article_id FROM analysis_sessions"
+        params = ()
+        if category is not None:
+            sql += " WHERE category = ?"
+            params = (category,)
+        rows = self._query(sql, params)
+        return rows[0]['last_article_id'] if rows else None
+
+    # 기사 임베딩
+    def load_article_embeddings(self, article_ids, model):
+        stored = {}
+        article_ids = list(article_ids)
+        for start in range(0, len(article_ids), 500):
+            chunk = article_ids[start:start + 500]
+            rows = self._query(
+                f"SELECT article_id, content_hash, embedding FROM article_embeddings "
+                f"WHERE model = ? AND article_id IN ({', '.join('?' * len(chunk))})",
+                [model] + chunk
+            )
+            for row in rows:
+                stored[row['article_id']] = (row['content_hash'], json.loads(row['embedding']))
+        return stored
+
+    def save_article_embeddings(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO article_embeddings (article_id, model, content_hash, embedding, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (row['article_id'], row['model'], row['content_hash'],
+                     json.dumps([float(value) for value in row['embedding']]), _now())
+                    for row in rows
+                ]
+            )
+        if rows:
+            print(f"✅ 기사 임베딩 {len(rows)}개 저장")
+        return True
+
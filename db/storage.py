@@ -0,0 +1,88 @@
+"""
+저장소 백엔드 인터페이스
+
+db 모듈의 함수들은 첫 인자로 Supabase 클라이언트를 받습니다.
+그 자리에 StorageBackend 구현체(예: SQLiteStore)가 오면 같은 이름의 메서드로 위임하므로,
+호출하는 쪽 코드는 그대로 두고 설정(DB_BACKEND)만으로 저장소를 바꿀 수 있습니다.
+"""
+import abc
+import functools
+
+# save_articles_bulk의 행별 결과
+ARTICLE_INSERTED = "inserted"
+ARTICLE_SKIPPED = "skipped"    # 이미 저장된 URL (또는 같은 배치 안의 중복)
+ARTICLE_INVALID = "invalid"    # 필수 데이터 누락 / 알 수 없는 언론사·카테고리
+ARTICLE_FAILED = "failed"      # DB 요청 실패
+ARTICLE_SPOOLED = "spooled"    # 쓰기 스풀에 기록됨 (DB 반영은 백그라운드, db/spool.py)
+
+
+class StorageBackend(abc.ABC):
+    """Supabase 대신 쓸 수 있는 저장소가 구현할 메서드 목록
+
+    반환 형식은 같은 이름의 db 함수(save_article_to_db 등)와 같습니다.
+    메서드를 하나라도 빠뜨린 구현체는 생성할 때 TypeError가 납니다.
+    """
+
+    @abc.abstractmethod
+    def save_article(self, article_data=None, **kwargs):
+        """기사 하나 저장 (save_article_to_db)"""
+
+    @abc.abstractmethod
+    def save_articles_bulk(self, articles):
+        """기사 배치 저장 → 행별 ARTICLE_* 상태 리스트 (save_articles_bulk)"""
+
+    @abc.abstractmethod
+    def iter_articles(self, **filters):
+        """기사를 배치 단위로 반환하는 제너레이터 (iter_articles_from_db)"""
+
+    @abc.abstractmethod
+    def load_article_urls(self, page_size=1000):
+        """저장된 기사 URL 집합 (load_article_urls_from_db)"""
+
+    @abc.abstractmethod
+    def save_cluster(self, cluster_data):
+        """클러스터 하나 upsert (save_cluster_to_db)"""
+
+    @abc.abstractmethod
+    def save_cluster_articles(self, cluster_id, article_ids, replace=True):
+        """클러스터-기사 관계 저장 (save_cluster_articles_to_db)"""
+
+    @abc.abstractmethod
+    def save_analysis_session(self, session_data):
+        """분석 세션 기록 → 세션 ID (save_analysis_session_to_db)"""
+
+    @abc.abstractmethod
+    def commit_analysis_session(self, clusters, links, session=None, replace_links=True, prune_category=None):
+        """클러스터 + 관계 + 세션 기록을 한 트랜잭션으로 저장 → 세션 ID (commit_analysis_session)"""
+
+    @abc.abstractmethod
+    def load_clusters(self, category=None, with_centroids=False):
+        """클러스터 목록 (load_clusters_from_db)"""
+
+    @abc.abstractmethod
+    def load_analysis_watermark(self, category=None):
+        """마지막으로 분석한 기사 id (load_analysis_watermark)"""
+
+    @abc.abstractmethod
+    def load_article_embeddings(self, article_ids, model):
+        """{article_id: (content_hash, 벡터)} (load_article_embeddings)"""
+
+    @abc.abstractmethod
+    def save_article_embeddings(self, rows):
+        """기사 임베딩 upsert (save_article_embeddings)"""
+
+    @abc.abstractmethod
+    def reference_rows(self):
+        """(언론사 행 리스트, 카테고리 행 리스트)"""
+
+
+def backend_method(method_name):
+    """첫 인자가 StorageBackend면 method_name 메서드로 위임하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(client, *args, **kwargs):
+            if isinstance(client, StorageBackend):
+                return getattr(client, method_name)(*args, **kwargs)
+            return func(client, *args, **kwargs)
+        return wrapper
+    return decorator
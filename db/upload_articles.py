@@ -1,6 +1,9 @@
 from .client import get_supabase_client, get_media_outlet_id, get_category_id
+from .reference_cache import reference_cache, attach_reference_data
+from .storage import backend_method, ARTICLE_INSERTED, ARTICLE_SKIPPED, ARTICLE_INVALID, ARTICLE_FAILED
 from datetime import datetime
 
+@backend_method("save_article")
 def save_article_to_db(supabase, article_data=None, **kwargs):
     """기사를 Supabase에 저장 (모든 방식 지원)"""
     try:
@@ -70,6 +73,71 @@ def save_article_to_db(supabase, article_data=None, **kwargs):
         print(f"❌ DB 저장 중 에러: {e}")
         return False
 
+@backend_method("save_articles_bulk")
+def save_articles_bulk(supabase, articles):
+    """기사 여러 개를 한 번의 upsert로 저장 (url 충돌 시 건너뜀)
+
+    언론사/카테고리 ID는 참조 데이터 캐시에서 로컬로 매핑하므로
+    배치 하나에 요청은 upsert 1번입니다. articles.url에 UNIQUE 제약이 필요합니다
+    (db/migrations/001_articles_url_unique.sql).
+
+    Args:
+        articles: save_article_to_db와 같은 형식의 기사 dict 리스트
+
+    Returns:
+        list: 입력 순서대로 행별 결과 ("inserted" / "skipped" / "invalid" / "failed")
+    """
+    statuses = [ARTICLE_INVALID] * len(articles)
+    if not articles:
+        return statuses
+    try:
+        outlet_ids = reference_cache.outlet_ids(supabase)
+        category_ids = reference_cache.category_ids(supabase)
+    except Exception as e:
+        print(f"❌ 언론사/카테고리 조회 실패: {e}")
+        return [ARTICLE_FAILED] * len(articles)
+
+    rows = []
+    row_index = {}
+    for i, article_data in enumerate(articles):
+        url = article_data.get('url')
+        media_outlet_id = outlet_ids.get(article_data.get('media_outlet'))
+        category_id = category_ids.get(article_data.get('category'))
+        if not all([article_data.get('title'), article_data.get('content'), url, media_outlet_id, category_id]):
+            print(f"❌ 필수 데이터 누락 또는 알 수 없는 언론사/카테고리: {url}")
+            continue
+        if url in row_index:
+            statuses[i] = ARTICLE_SKIPPED
+            continue
+        row_index[url] = i
+        rows.append({
+            "title": article_data['title'],
+            "content": article_data['content'],
+            "url": url,
+            "media_outlet_id": media_outlet_id,
+            "category_id": category_id,
+            "published_at": "NOW()"
+        })
+    if not rows:
+        return statuses
+
+    try:
+        response = supabase.table('articles').upsert(rows, on_conflict='url', ignore_duplicates=True).execute()
+    except Exception as e:
+        print(f"❌ 기사 일괄 저장 중 에러: {e}")
+        for i in row_index.values():
+            statuses[i] = ARTICLE_FAILED
+        return statuses
+
+    # ignore_duplicates면 실제로 삽입된 행만 반환됨
+    inserted_urls = {row.get('url') for row in response.data or []}
+    for url, i in row_index.items():
+        statuses[i] = ARTICLE_INSERTED if url in inserted_urls else ARTICLE_SKIPPED
+    inserted = sum(1 for status in statuses if status == ARTICLE_INSERTED)
+    print(f"✅ 기사 일괄 저장: {inserted}개 저장, {len(rows) - inserted}개 중복 건너뜀 (요청 {len(articles)}개)")
+    return statuses
+
+@backend_method("save_cluster")
 def save_cluster_to_db(supabase, cluster_data):
     """클러스터 분석 결과를 Supabase에 저장 (bias 정보 포함)"""
     try:
@@ -108,6 +176,10 @@ def save_cluster_to_db(supabase, cluster_data):
         if bias_info and isinstance(bias_info, dict):
             db_data["bias"] = bias_info
         
+        # 클러스터 중심 벡터 (증분 분석에서 새 기사 배정에 사용)
+        if cluster_data.get('centroid') is not None:
+            db_data["centroid"] = [float(value) for value in cluster_data['centroid']]
+        
         if existing.data and isinstance(existing.data, list) and existing.data:
             print(f"⚠️ 이미 존재하는 클러스터 (업데이트): cluster_id={cluster_id}")
             db_data["updated_at"] = "NOW()"
@@ -128,7 +200,7 @@ def save_cluster_to_db(supabase, cluster_data):
                 raise
         
         print(f"🔍 [디버깅] DB 저장 데이터:")
-        print(f"  - db_data: {db_data}")
+        print(f"  - db_data: { {key: value for key, value in db_data.items() if key != 'centroid'} }")
         
         if response is not None and hasattr(response, 'data') and response.data:
             topic_str = str(topic)[:30] if topic else ''
@@ -143,15 +215,17 @@ def save_cluster_to_db(supabase, cluster_data):
         print(f"❌ 클러스터 저장 중 에러: {e}")
         return False
 
-def save_cluster_articles_to_db(supabase, cluster_id, article_ids):
-    """클러스터에 속한 기사들의 관계를 저장"""
+@backend_method("save_cluster_articles")
+def save_cluster_articles_to_db(supabase, cluster_id, article_ids, replace=True):
+    """클러스터에 속한 기사들의 관계를 저장 (replace=False면 기존 관계는 두고 추가만)"""
     try:
         if not cluster_id or not article_ids:
             print(f"[경고] cluster_articles 저장 건너뜀: cluster_id={cluster_id}, article_ids={article_ids}")
             return
         
         # 기존 관계 삭제 (같은 cluster_id의 모든 관계)
-        supabase.table('cluster_articles').delete().eq('cluster_id', cluster_id).execute()
+        if replace:
+            supabase.table('cluster_articles').delete().eq('cluster_id', cluster_id).execute()
         
         # 새로운 관계 추가
         cluster_article_data = []
@@ -177,6 +251,125 @@ def save_cluster_articles_to_db(supabase, cluster_id, article_ids):
         print(f"❌ 클러스터-기사 관계 저장 중 에러: {e}")
         return False
 
+# 서버 함수가 없을 때 PostgREST가 돌려주는 에러 코드 (스키마 캐시에 함수 없음 / 함수 없음 / 404)
+MISSING_FUNCTION_CODES = {'PGRST202', '42883', '404'}
+# upsert의 on_conflict 대상 유일 키가 없을 때의 에러 코드
+MISSING_CONFLICT_KEY_CODES = {'42P10'}
+
+def _error_code(error):
+    """PostgREST 에러(postgrest.APIError)의 코드 문자열 (코드가 없으면 None)"""
+    code = getattr(error, 'code', None)
+    return str(code) if code is not None else None
+
+def _prune_stale_clusters(supabase, category, keep_ids):
+    """category의 클러스터 중 keep_ids에 없는 것과 그 관계 삭제 (RPC를 쓸 수 없을 때, 원자적이지 않음)"""
+    rows = supabase.table('clusters').select('cluster_id').eq('category', category).execute().data or []
+    keep_ids = set(keep_ids)
+    stale_ids = [row['cluster_id'] for row in rows if row['cluster_id'] not in keep_ids]
+    if stale_ids:
+        supabase.table('cluster_articles').delete().in_('cluster_id', stale_ids).execute()
+        supabase.table('clusters').delete().in_('cluster_id', stale_ids).execute()
+        print(f"🧹 [{category}] 이번 세션에 없는 이전 클러스터 {len(stale_ids)}개 삭제")
+
+def _commit_session_bulk(supabase, clusters, links, session, replace_links, prune_category=None):
+    """RPC를 쓸 수 없을 때: 클러스터/관계를 일괄 upsert한 뒤 빠진 관계만 삭제 (원자적이지 않음)"""
+    # PostgREST는 한 요청의 행들을 키 합집합으로 맞추고 빠진 컬럼을 NULL로 쓰므로
+    # 키 구성이 같은 클러스터끼리 나눠 upsert (값이 없는 bias/centroid가 기존 값을 지우지 않도록)
+    groups = {}
+    for cluster in clusters:
+        groups.setdefault(tuple(sorted(cluster)), []).append({**cluster, "updated_at": "NOW()"})
+    for rows in groups.values():
+        supabase.table('clusters').upsert(rows, on_conflict='cluster_id').execute()
+    if links:
+        # 새 관계를 먼저 넣어 cluster_articles가 비는 순간이 없도록 함
+        supabase.table('cluster_articles').upsert(
+            links, on_conflict='cluster_id,article_id', ignore_duplicates=True
+        ).execute()
+    if replace_links:
+        keep = {}
+        for link in links:
+            keep.setdefault(link['cluster_id'], []).append(link['article_id'])
+        for cluster in clusters:
+            query = supabase.table('cluster_articles').delete().eq('cluster_id', cluster['cluster_id'])
+            article_ids = keep.get(cluster['cluster_id'])
+            if article_ids:
+                query = query.not_.in_('article_id', article_ids)
+            query.execute()
+    if prune_category is not None:
+        _prune_stale_clusters(supabase, prune_category, [cluster['cluster_id'] for cluster in clusters])
+    return save_analysis_session_to_db(supabase, session) if session else None
+
+def _commit_session_legacy(supabase, clusters, links, session, replace_links, prune_category=None):
+    """유일 키 마이그레이션 전: 클러스터별 저장 (기존 방식)"""
+    links_by_cluster = {}
+    for link in links:
+        links_by_cluster.setdefault(link['cluster_id'], []).append(link['article_id'])
+    for cluster in clusters:
+        save_cluster_to_db(supabase, cluster)
+        article_ids = links_by_cluster.get(cluster['cluster_id'])
+        if article_ids:
+            save_cluster_articles_to_db(supabase, cluster['cluster_id'], article_ids, replace=replace_links)
+    if prune_category is not None:
+        _prune_stale_clusters(supabase, prune_category, [cluster['cluster_id'] for cluster in clusters])
+    return save_analysis_session_to_db(supabase, session) if session else None
+
+@backend_method("commit_analysis_session")
+def commit_analysis_session(supabase, clusters, links, session=None, replace_links=True, prune_category=None):
+    """분석 세션 하나의 클러스터, 클러스터-기사 관계, 세션 기록을 한 번에 저장
+
+    기본은 서버 함수 commit_analysis_session (db/migrations/003) 한 번 호출로
+    트랜잭션 안에서 처리합니다. 함수가 없으면 일괄 upsert로, 유일 키도 없으면
+    클러스터별 저장으로 물러납니다. 그 밖의 에러(시간 초과, 네트워크 등)는 서버에서
+    이미 커밋되었을 수 있어서 다른 방식으로 다시 쓰지 않고 그대로 올립니다.
+
+    Args:
+        clusters: save_cluster_to_db와 같은 형식의 클러스터 dict 리스트
+        links: {'cluster_id', 'article_id'} dict 리스트
+        session: save_analysis_session_to_db와 같은 형식의 세션 dict (없으면 기록 안 함)
+        replace_links: True면 links에 없는 기존 관계 삭제, False면 추가만
+        prune_category: 전체 분석이면 그 카테고리 이름 - clusters에 없는 이 카테고리의 이전 클러스터와
+            관계를 함께 삭제 (db/migrations/005, 증분 분석이 오래된 클러스터에 병합하지 않도록)
+
+    Returns:
+        int: 세션 ID (세션을 기록하지 않았거나 실패하면 None)
+    """
+    clusters = [
+        {key: value for key, value in cluster.items() if value is not None}
+        for cluster in clusters
+    ]
+    for cluster in clusters:
+        if cluster.get('centroid') is not None:
+            cluster['centroid'] = [float(value) for value in cluster['centroid']]
+    session = dict(session) if session else None
+    if session is not None:
+        session.setdefault('session_name', f"분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    params = {
+        'p_clusters': clusters,
+        'p_links': links,
+        'p_session': session,
+        'p_replace_links': replace_links,
+    }
+    if prune_category is not None:
+        params['p_prune_category'] = prune_category
+    try:
+        response = supabase.rpc('commit_analysis_session', params).execute()
+        print(f"✅ 분석 세션 커밋: 클러스터 {len(clusters)}개, 관계 {len(links)}개 (트랜잭션)")
+        return response.data
+    except Exception as e:
+        if _error_code(e) not in MISSING_FUNCTION_CODES:
+            raise
+        print(f"⚠️ 세션 커밋 함수 없음 (db/migrations/003/005 미적용), 일괄 저장으로 진행: {e}")
+    try:
+        session_id = _commit_session_bulk(supabase, clusters, links, session, replace_links, prune_category)
+        print(f"✅ 분석 세션 일괄 저장: 클러스터 {len(clusters)}개, 관계 {len(links)}개")
+        return session_id
+    except Exception as e:
+        if _error_code(e) not in MISSING_CONFLICT_KEY_CODES:
+            raise
+        print(f"⚠️ 유일 키 없음, 클러스터별 저장으로 진행: {e}")
+    return _commit_session_legacy(supabase, clusters, links, session, replace_links, prune_category)
+
+@backend_method("save_analysis_session")
 def save_analysis_session_to_db(supabase, session_data):
     """분석 세션 정보를 저장"""
     try:
@@ -193,6 +386,11 @@ def save_analysis_session_to_db(supabase, session_data):
             "created_at": "NOW()"
         }
         
+        # 증분 분석용 워터마크 (이 세션까지 분석한 마지막 기사)
+        for key in ('category', 'mode', 'last_article_id', 'last_published_at'):
+            if session_data.get(key) is not None:
+                db_data[key] = session_data[key]
+        
         response = supabase.table('analysis_sessions').insert(db_data).execute()
         
         if response.data:
@@ -210,43 +408,195 @@ def save_analysis_session_to_db(supabase, session_data):
         print(f"❌ 분석 세션 저장 중 에러: {e}")
         return None
 
-def load_articles_from_db(supabase):
-    """Supabase에서 모든 기사 데이터 로드"""
+# 기사 로드 시 기본 컬럼 (언론사/카테고리는 ID만 가져오고 이름과 편향은 참조 데이터 캐시로 채움)
+ARTICLE_COLUMNS = ["id", "title", "content", "url", "published_at", "media_outlet_id", "category_id"]
+# 분석 단계용 컬럼 (임베딩에는 제목 + 본문 앞부분만 사용)
+ARTICLE_ANALYSIS_COLUMNS = ["id", "title", "content", "published_at", "media_outlet_id", "category_id"]
+
+# 서버에서 잘라 주는 본문 길이 (db/migrations/006의 content_prefix와 같아야 함)
+SERVER_CONTENT_PREFIX_CHARS = 1000
+# 컬럼이 없을 때의 에러 코드 (Postgres undefined_column / PostgREST 스키마 캐시)
+MISSING_COLUMN_CODES = {'42703', 'PGRST204'}
+# content_prefix 계산 컬럼을 쓸 수 있는지 (없다고 확인되면 False)
+_server_content_prefix = True
+
+def _article_select(columns, content_chars):
+    """select 문자열 (본문 앞부분만 필요하면 content 대신 서버에서 자른 content_prefix를 content로 받음)"""
+    if (content_chars is None or content_chars > SERVER_CONTENT_PREFIX_CHARS
+            or "content" not in columns or not _server_content_prefix):
+        return ", ".join(columns)
+    return ", ".join("content:content_prefix" if column == "content" else column for column in columns)
+
+@backend_method("iter_articles")
+def iter_articles_from_db(supabase, columns=None, since=None, until=None, categories=None, outlets=None,
+                          content_chars=None, batch_size=1000, after_id=None):
+    """기사를 id 순 keyset 페이지네이션으로 batch_size개씩 읽어 배치 단위로 반환 (제너레이터)
+
+    Args:
+        columns: 가져올 컬럼 목록 (기본 ARTICLE_COLUMNS, id는 항상 포함)
+        since / until: published_at 범위 (since 이상, until 미만, ISO 문자열 또는 datetime)
+        categories / outlets: 카테고리 / 언론사 이름 목록으로 필터
+        content_chars: 본문을 앞에서부터 이 길이만 가져옴. SERVER_CONTENT_PREFIX_CHARS 이하면
+            서버의 계산 컬럼 content_prefix(db/migrations/006)로 잘라 받아서 전송량도 줄이고,
+            마이그레이션 전이거나 더 길면 전체 본문을 받아 클라이언트에서 자름 (메모리만 절약)
+        after_id: 이 id보다 큰 기사만 로드
+
+    Yields:
+        list: 기사 dict 배치 (media_outlets / categories 정보 포함)
+    """
+    global _server_content_prefix
+    columns = list(columns or ARTICLE_COLUMNS)
+    if "id" not in columns:
+        columns.insert(0, "id")
+    query_columns = _article_select(columns, content_chars)
+
+    category_ids = outlet_ids = None
+    if categories:
+        mapping = reference_cache.category_ids(supabase)
+        category_ids = [mapping[name] for name in categories if name in mapping]
+        if not category_ids:
+            return
+    if outlets:
+        mapping = reference_cache.outlet_ids(supabase)
+        outlet_ids = [mapping[name] for name in outlets if name in mapping]
+        if not outlet_ids:
+            return
+
+    last_id = after_id
+    while True:
+        query = supabase.table('articles').select(query_columns)
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        if since is not None:
+            query = query.gte('published_at', str(since))
+        if until is not None:
+            query = query.lt('published_at', str(until))
+        if category_ids is not None:
+            query = query.in_('category_id', category_ids)
+        if outlet_ids is not None:
+            query = query.in_('media_outlet_id', outlet_ids)
+        try:
+            rows = query.order('id').limit(batch_size).execute().data or []
+        except Exception as e:
+            if _error_code(e) not in MISSING_COLUMN_CODES or query_columns == ", ".join(columns):
+                raise
+            print(f"⚠️ content_prefix 계산 컬럼 없음 (db/migrations/006 미적용), 전체 본문을 받아서 자름: {e}")
+            _server_content_prefix = False
+            query_columns = ", ".join(columns)
+            continue
+        if not rows:
+            return
+        if content_chars is not None:
+            for row in rows:
+                if row.get('content'):
+                    row['content'] = row['content'][:content_chars]
+        if "media_outlet_id" in columns or "category_id" in columns:
+            attach_reference_data(supabase, rows)
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]['id']
+
+def load_articles_from_db(supabase, **filters):
+    """Supabase에서 기사 데이터 로드 (필터/컬럼 옵션은 iter_articles_from_db와 같음, 없으면 전체)"""
     try:
-        # 기사와 언론사, 카테고리 정보를 JOIN해서 가져오기
-        response = supabase.table('articles').select("""
-            id,
-            title,
-            content,
-            url,
-            published_at,
-            media_outlets(name, bias),
-            categories(name)
-        """).execute()
-        
-        print(f"📊 총 {len(response.data)}개 기사 로드 완료")
-        return response.data
+        articles = []
+        for batch in iter_articles_from_db(supabase, **filters):
+            articles.extend(batch)
+        
+        print(f"📊 총 {len(articles)}개 기사 로드 완료")
+        return articles
         
     except Exception as e:
         print(f"❌ 기사 로드 실패: {e}")
         return []
 
-def load_clusters_from_db(supabase):
-    """Supabase에서 클러스터 데이터 로드"""
+@backend_method("load_article_urls")
+def load_article_urls_from_db(supabase, page_size=1000):
+    """이미 저장된 모든 기사 URL을 페이지 단위로 로드 (크롤링 전 중복 필터용)"""
+    urls = set()
+    try:
+        start = 0
+        while True:
+            response = supabase.table('articles').select("url").order('id').range(start, start + page_size - 1).execute()
+            rows = response.data or []
+            urls.update(row['url'] for row in rows if row.get('url'))
+            if len(rows) < page_size:
+                break
+            start += page_size
+        print(f"📊 저장된 기사 URL {len(urls)}개 로드 완료")
+        return urls
+    except Exception as e:
+        print(f"❌ 기사 URL 로드 실패: {e}")
+        return urls
+
+@backend_method("load_analysis_watermark")
+def load_analysis_watermark(supabase, category=None):
+    """마지막 분석 세션의 워터마크(분석한 마지막 기사 id) 조회 (없으면 None)"""
     try:
-        response = supabase.table('clusters').select("""
-            id,
-            cluster_id,
-            topic,
-            summary,
-            article_count,
-            created_at,
-            updated_at
-        """).order('cluster_id').execute()
+        query = supabase.table('analysis_sessions').select("last_article_id").not_.is_('last_article_id', 'null')
+        if category is not None:
+            query = query.eq('category', category)
+        response = query.order('last_article_id', desc=True).limit(1).execute()
+        if response.data:
+            return response.data[0]['last_article_id']
+        return None
+    except Exception as e:
+        print(f"❌ 분석 워터마크 조회 실패: {e}")
+        return None
+
+@backend_method("load_clusters")
+def load_clusters_from_db(supabase, category=None, with_centroids=False):
+    """Supabase에서 클러스터 데이터 로드 (category로 필터, with_centroids면 중심 벡터와 편향성 포함)"""
+    try:
+        columns = "id, cluster_id, category, topic, summary, article_count, created_at, updated_at"
+        if with_centroids:
+            columns += ", bias, centroid"
+        query = supabase.table('clusters').select(columns)
+        if category is not None:
+            query = query.eq('category', category)
+        response = query.order('cluster_id').execute()
         
         print(f"📊 총 {len(response.data)}개 클러스터 로드 완료")
         return response.data
         
     except Exception as e:
         print(f"❌ 클러스터 로드 실패: {e}")
-        return [] 
\ No newline at end of file
+        return [] 
+
+# 한 번의 in_ 필터로 조회하는 기사 id 수 (요청 URL 길이 제한)
+EMBEDDING_LOOKUP_CHUNK = 200
+
+@backend_method("load_article_embeddings")
+def load_article_embeddings(supabase, article_ids, model):
+    """저장된 기사 임베딩 조회 (db/migrations/004)
+
+    Returns:
+        dict: article_id → (content_hash, 벡터 리스트), 조회 실패 시 빈 dict
+    """
+    stored = {}
+    article_ids = list(article_ids)
+    try:
+        for start in range(0, len(article_ids), EMBEDDING_LOOKUP_CHUNK):
+            chunk = article_ids[start:start + EMBEDDING_LOOKUP_CHUNK]
+            response = supabase.table('article_embeddings').select("article_id, content_hash, embedding") \
+                .eq('model', model).in_('article_id', chunk).execute()
+            for row in response.data or []:
+                stored[row['article_id']] = (row['content_hash'], row['embedding'])
+        return stored
+    except Exception as e:
+        print(f"❌ 기사 임베딩 조회 실패: {e}")
+        return stored
+
+@backend_method("save_article_embeddings")
+def save_article_embeddings(supabase, rows):
+    """기사 임베딩 저장 (rows: {'article_id', 'model', 'content_hash', 'embedding'} 리스트, 같은 기사/모델은 덮어씀)"""
+    if not rows:
+        return True
+    try:
+        supabase.table('article_embeddings').upsert(rows, on_conflict='article_id,model').execute()
+        print(f"✅ 기사 임베딩 {len(rows)}개 저장")
+        return True
+    except Exception as e:
+        print(f"❌ 기사 임베딩 저장 실패: {e}")
+        return False
@@ -1,67 +1,50 @@
-import threading
+import asyncio
+import sys
 import time
 from datetime import datetime
-from crawlers.crawl_hani import crawl_hani
-from crawlers.crawl_kbs import crawl_kbs
-from crawlers.crawl_ytn import crawl_ytn
-from crawlers.crawl_chosun import crawl_chosun
+from crawlers.engine import crawl_outlets, DEFAULT_MAX_PAGES
+from crawlers.adapters import ADAPTERS
+from crawlers.site_crawler import site_crawlers
+from crawlers.process_pool import crawl_outlets_in_processes, DEFAULT_TIME_LIMIT
+from db import print_client_stats, get_supabase_client, get_write_spool, close_write_spool
+from db.spool import WRITE_SPOOL_ENABLED
 
-def run_crawler_with_timer(crawler_func, crawler_name):
-    """개별 크롤러를 실행하고 시간을 측정"""
-    print(f"\n🚀 {crawler_name} 크롤링 시작...")
-    start_time = time.time()
-    
-    try:
-        articles = crawler_func()
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        print(f"✅ {crawler_name} 완료! 소요시간: {duration:.1f}초, 수집기사: {len(articles)}개")
-        return articles, duration, None
-        
-    except Exception as e:
-        end_time = time.time()
-        duration = end_time - start_time
-        print(f"❌ {crawler_name} 실패! 소요시간: {duration:.1f}초, 에러: {str(e)[:100]}")
-        return [], duration, str(e)
+# 크롤러 정보 (async 크롤러 함수, 언론사 이름) - 언론사 사양은 crawlers/adapters.py
+CRAWLERS = site_crawlers(ADAPTERS)
+
+# 언론사별 요청 속도 제한 (호스트 단위 토큰 버킷)
+# rate: 초당 요청 수, burst: 순간 최대 요청 수, max_in_flight: 동시 요청 수
+OUTLET_RATE_LIMITS = {
+    "한겨레": {"rate": 2.0, "burst": 4, "max_in_flight": 4},
+    "KBS뉴스": {"rate": 2.0, "burst": 4, "max_in_flight": 3},
+    "YTN": {"rate": 1.5, "burst": 3, "max_in_flight": 3},
+    "조선일보": {"rate": 1.0, "burst": 2, "max_in_flight": 2},
+}
+
+def crawl_all_parallel(max_pages=DEFAULT_MAX_PAGES, use_processes=False, time_limit=DEFAULT_TIME_LIMIT):
+    """모든 크롤러를 병렬 실행
 
-def crawl_all_parallel():
-    """모든 크롤러를 병렬로 실행"""
+    기본은 공유 브라우저 하나에서 비동기로 실행하고, use_processes=True면
+    언론사마다 별도 워커 프로세스에서 실행합니다 (워커별 time_limit초 제한, 부분 결과 보고).
+    """
     print("=" * 60)
     print("🔥 BlindSpot 뉴스 크롤링 시작 (병렬 처리)")
     print("=" * 60)
     
     total_start_time = time.time()
     
-    # 크롤러 정보
-    crawlers = [
-        (crawl_hani, "한겨레"),
-        (crawl_kbs, "KBS뉴스"), 
-        (crawl_ytn, "YTN"),
-        (crawl_chosun, "조선일보")
-    ]
+    if WRITE_SPOOL_ENABLED:
+        # 지난 실행에서 DB에 반영하지 못한 스풀 항목을 먼저 다시 전송
+        get_write_spool(get_supabase_client())
     
-    # 병렬 실행을 위한 스레드 생성
-    threads = []
-    results = {}
-    
-    def thread_wrapper(crawler_func, crawler_name):
-        """스레드에서 실행될 함수"""
-        result = run_crawler_with_timer(crawler_func, crawler_name)
-        results[crawler_name] = result
-    
-    # 모든 크롤러를 동시에 시작
-    for crawler_func, crawler_name in crawlers:
-        thread = threading.Thread(
-            target=thread_wrapper, 
-            args=(crawler_func, crawler_name)
+    if use_processes:
+        # 언론사별 워커 프로세스, 기사는 큐로 스트리밍
+        results = crawl_outlets_in_processes(
+            ADAPTERS, max_pages=max_pages, rate_limits=OUTLET_RATE_LIMITS, time_limit=time_limit
         )
-        threads.append(thread)
-        thread.start()
-    
-    # 모든 스레드가 완료될 때까지 대기
-    for thread in threads:
-        thread.join()
+    else:
+        # 브라우저 1개, 언론사별 컨텍스트, 공유 페이지 풀로 동시 실행
+        results = asyncio.run(crawl_outlets(CRAWLERS, max_pages=max_pages, rate_limits=OUTLET_RATE_LIMITS))
     
     total_end_time = time.time()
     total_duration = total_end_time - total_start_time
@@ -74,11 +57,15 @@ def crawl_all_parallel():
     all_articles = []
     total_articles = 0
     
-    for crawler_name in ["한겨레", "KBS뉴스", "YTN", "조선일보"]:
+    for _, crawler_name in CRAWLERS:
         if crawler_name in results:
             articles, duration, error = results[crawler_name]
             
-            if error:
+            if error and articles:
+                print(f"⚠️  {crawler_name}: 부분 결과 {len(articles)}개 기사, {duration:.1f}초 (에러: {error[:50]}...)")
+                all_articles.extend(articles)
+                total_articles += len(articles)
+            elif error:
                 print(f"❌ {crawler_name}: 실패 (에러: {error[:50]}...)")
             else:
                 print(f"✅ {crawler_name}: {len(articles)}개 기사, {duration:.1f}초")
@@ -91,6 +78,8 @@ def crawl_all_parallel():
     print(f"   총 수집 기사: {total_articles}개")
     print(f"   총 소요 시간: {total_duration:.1f}초")
     print(f"   평균 속도: {total_articles/total_duration:.1f}개/초")
+    close_write_spool()
+    print_client_stats()
     
     # 언론사별/카테고리별 통계
     print(f"\n📈 상세 통계:")
@@ -118,8 +107,8 @@ if __name__ == "__main__":
     start_timestamp = datetime.now()
     print(f"⏰ 크롤링 시작 시간: {start_timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # 병렬 크롤링 실행
-    articles = crawl_all_parallel()
+    # 병렬 크롤링 실행 (--processes: 언론사별 워커 프로세스)
+    articles = crawl_all_parallel(use_processes="--processes" in sys.argv)
     
     # 종료 시간 기록
     end_timestamp = datetime.now()
@@ -1,7 +1,11 @@
 import os
+import sys
 from dotenv import load_dotenv
 import openai
-from db import init_supabase, load_articles_from_db, save_cluster_to_db, save_cluster_articles_to_db, save_analysis_session_to_db
+from db import init_supabase, load_articles_from_db, commit_analysis_session
+from db import reference_cache, ARTICLE_ANALYSIS_COLUMNS
+from analyzer.embed_articles import CONTENT_PREFIX_CHARS
+from analyzer.text_prep import token_usage
 from analyzer import cluster_articles, analyze_cluster_topics, calculate_all_clusters_bias
 from datetime import datetime
 from collections import Counter, defaultdict
@@ -13,25 +17,27 @@ supabase = init_supabase()
 openai_client = openai.OpenAI(api_key=api_key)
 openai_model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
 
-# 1. DB에서 기사 불러오기
-articles = load_articles_from_db(supabase)
-print(f"기사 {len(articles)}개 불러옴")
-
-if not articles:
-    print("DB에 기사가 없습니다. 테스트를 종료합니다.")
+# --incremental: 지난 분석 이후 기사만 기존 클러스터에 병합 (run_pipeline.py와 같은 로직)
+if "--incremental" in sys.argv:
+    from run_pipeline import BlindSpotPipeline
+    BlindSpotPipeline(api_key).step2_analyze_incremental()
+    token_usage.print_summary()
     exit()
 
-# 2. 카테고리별로 기사 분리
+# 1~2. DB에서 카테고리별로 기사 불러오기 (분석에 필요한 컬럼 + 본문 앞부분만)
 articles_by_category = {}
-for article in articles:
-    # 실제 구조에 맞게 category 이름 추출
-    category = None
-    if 'categories' in article and isinstance(article['categories'], dict):
-        category = article['categories'].get('name')
-    elif 'category' in article:
-        category = article['category']
-    if category:
-        articles_by_category.setdefault(category, []).append(article)
+for category in reference_cache.category_ids(supabase):
+    articles_in_cat = load_articles_from_db(
+        supabase, columns=ARTICLE_ANALYSIS_COLUMNS, categories=[category], content_chars=CONTENT_PREFIX_CHARS
+    )
+    if articles_in_cat:
+        articles_by_category[category] = articles_in_cat
+article_total = sum(len(articles_in_cat) for articles_in_cat in articles_by_category.values())
+print(f"기사 {article_total}개 불러옴")
+
+if not article_total:
+    print("DB에 기사가 없습니다. 테스트를 종료합니다.")
+    exit()
 
 print(f"[DEBUG] articles_by_category keys: {list(articles_by_category.keys())}")
 
@@ -60,11 +66,12 @@ for category, articles_in_cat in articles_by_category.items():
     print(f"[DEBUG] [{category}] 클러스터링 및 DB 저장 시도")
     n_cat_clusters = calculate_optimal_clusters(len(articles_in_cat))
     print(f"[DEBUG] {category} n_clusters: {n_cat_clusters}")
-    result = cluster_articles(openai_client, articles_in_cat, n_cat_clusters)
+    result = cluster_articles(openai_client, articles_in_cat, n_cat_clusters, supabase=supabase)
     if result is None:
         print(f"{category} 클러스터링 실패")
         continue
-    clustered_articles, cluster_centers = result
+    clustered_articles, cluster_centers, embedding_matrix = result
+    embedding_matrix.close()  # 이후 단계는 벡터를 쓰지 않음 (memory-map 파일 정리)
     print(f"[DEBUG] {category} 클러스터 개수: {n_cat_clusters}, 실제 클러스터링된 기사 수: {len(clustered_articles)}")
     # 클러스터별로 기사 리스트로 변환
     clusters_dict = {}
@@ -84,6 +91,9 @@ for category, articles_in_cat in articles_by_category.items():
     # 편향성 계산
     cluster_bias_analysis = calculate_all_clusters_bias(clustered_articles)
     
+    # 카테고리의 클러스터/관계/세션 기록은 마지막에 한 번에 커밋
+    cluster_rows = []
+    links = []
     for cluster_id, articles_in_cluster in clusters_dict.items():
         unique_cluster_id = f"{category}_{cluster_id}"
         print(f"[DB 저장 시도] category={category}, cluster_id={unique_cluster_id}, article_count={len(articles_in_cluster)}")
@@ -100,7 +110,8 @@ for category, articles_in_cat in articles_by_category.items():
             'topic': cluster_info.get('topic_analysis', f'클러스터 {cluster_id}'),
             'summary': cluster_info.get('summary', ''),
             'article_count': len(articles_in_cluster),
-            'bias': bias_info  # 편향성 정보 추가
+            'bias': bias_info,  # 편향성 정보 추가
+            'centroid': cluster_centers[cluster_id]  # 증분 분석용 중심 벡터
         }
         print(f"🔍 [디버깅] 최종 cluster_data:")
         print(f"  - cluster_id: {cluster_data['cluster_id']}")
@@ -108,13 +119,12 @@ for category, articles_in_cat in articles_by_category.items():
         print(f"  - topic: {str(cluster_data['topic'])[:50]}...")
         print(f"  - summary: '{cluster_data['summary']}'")
         print(f"  - article_count: {cluster_data['article_count']}")
-        print("저장 시도:", cluster_data)
+        print("저장 시도:", {key: value for key, value in cluster_data.items() if key != 'centroid'})
         print(f"클러스터 {unique_cluster_id} 예시:", articles_in_cluster[:1])
         print("타입:", type(articles_in_cluster))
-        save_cluster_to_db(supabase, cluster_data)
+        cluster_rows.append(cluster_data)
         article_ids = [a.get('id') for a in articles_in_cluster if a.get('id')]
-        if article_ids:
-            save_cluster_articles_to_db(supabase, unique_cluster_id, article_ids)
+        links.extend({'cluster_id': unique_cluster_id, 'article_id': article_id} for article_id in article_ids)
         # 언론사/편향 집계
         media_counter = Counter()
         bias_counter = Counter()
@@ -181,10 +191,25 @@ for category, articles_in_cat in articles_by_category.items():
             'bias_judgement': bias_judgement,
             'article_ids': article_ids
         })
+    # 클러스터 + 관계 + 증분 분석 워터마크(이 카테고리를 어느 기사까지 분석했는지)를 한 번에 저장
+    published = [a['published_at'] for a in articles_in_cat if a.get('published_at')]
+    try:
+        commit_analysis_session(supabase, cluster_rows, links, {
+            'session_name': f"full_{category}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            'total_articles': len(articles_in_cat),
+            'cluster_count': n_cat_clusters,
+            'category': category,
+            'mode': 'full',
+            'last_article_id': max(a['id'] for a in articles_in_cat),
+            'last_published_at': max(published) if published else None,
+        }, prune_category=category)  # 이번 세션에 없는 이 카테고리의 이전 클러스터 삭제
+    except Exception as e:
+        print(f"❌ [{category}] 분석 결과 DB 저장 실패: {e}")
 
 # 모든 카테고리/클러스터 저장 후 markdown 리포트 저장
 if report_clusters:
     save_markdown_report(report_clusters, all_article_ids)
+token_usage.print_summary()
 
 # bias 한글 변환 함수
 def bias_map(bias):
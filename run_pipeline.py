@@ -21,8 +21,14 @@ load_dotenv()
 
 # 모듈 import
 from main_crawler import crawl_all_parallel
-from db import init_supabase, load_articles_from_db, save_cluster_to_db, save_cluster_articles_to_db, save_analysis_session_to_db
+from db import init_supabase, load_articles_from_db, commit_analysis_session
+from db import reference_cache, ARTICLE_ANALYSIS_COLUMNS, load_analysis_watermark, load_clusters_from_db
+from db import print_client_stats
 from analyzer import cluster_articles, analyze_cluster_topics, analyze_media_bias, generate_report, calculate_all_clusters_bias
+from analyzer.embed_articles import CONTENT_PREFIX_CHARS
+from analyzer.text_prep import token_usage
+from analyzer.bias_calculator import calculate_cluster_bias_percentage
+from analyzer.incremental import merge_new_articles, merge_bias
 from utils import save_markdown_report
 
 class BlindSpotPipeline:
@@ -60,59 +66,84 @@ class BlindSpotPipeline:
         
         return articles
     
-    def step2_analyze_articles(self, n_clusters=None):
-        """2단계: 기사 분석 (카테고리별 클러스터링)"""
+    def load_articles_by_category(self, since=None, after_ids=None):
+        """카테고리별로 분석용 기사를 차례로 로드 (필요한 컬럼 + 본문 앞부분만, 한 카테고리씩)
+
+        after_ids가 주어지면 카테고리별로 그 id 이후 기사만 로드합니다.
+        """
+        for category in reference_cache.category_ids(self.supabase):
+            articles_in_cat = load_articles_from_db(
+                self.supabase, columns=ARTICLE_ANALYSIS_COLUMNS, categories=[category],
+                content_chars=CONTENT_PREFIX_CHARS, since=since,
+                after_id=(after_ids or {}).get(category)
+            )
+            if articles_in_cat:
+                yield category, articles_in_cat
+
+    def build_session(self, category, articles, cluster_count, mode):
+        """카테고리 분석 세션 기록과 워터마크(분석한 마지막 기사)"""
+        published = [a['published_at'] for a in articles if a.get('published_at')]
+        return {
+            'session_name': f"{mode}_{category}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            'total_articles': len(articles),
+            'cluster_count': cluster_count,
+            'category': category,
+            'mode': mode,
+            'last_article_id': max(a['id'] for a in articles),
+            'last_published_at': max(published) if published else None,
+        }
+
+    def analyze_category(self, category, articles_in_cat, n_clusters=None):
+        """카테고리 하나 전체 분석: 클러스터링 → 주제/편향 분석 → DB 저장 → 워터마크 기록"""
+        print(f"\n[{category}] 기사 {len(articles_in_cat)}개 클러스터링 시작!")
+        n_cat_clusters = self.calculate_optimal_clusters(len(articles_in_cat)) if n_clusters is None else n_clusters
+        print(f"[DEBUG] {category} n_clusters: {n_cat_clusters}")
+        result = cluster_articles(self.openai_client, articles_in_cat, n_cat_clusters, supabase=self.supabase)
+        if result is None:
+            print(f"{category} 클러스터링 실패")
+            return None
+        clustered_articles, cluster_centers, embedding_matrix = result
+        embedding_matrix.close()  # 이후 단계는 벡터를 쓰지 않음 (memory-map 파일 정리)
+        print(f"[DEBUG] {category} 클러스터 개수: {n_cat_clusters}, 실제 클러스터링된 기사 수: {len(clustered_articles)}")
+        cluster_topics = analyze_cluster_topics(self.openai_client, clustered_articles)
+        bias_analysis = analyze_media_bias(cluster_topics)
+        report = generate_report(bias_analysis)
+        session = self.build_session(category, articles_in_cat, n_cat_clusters, "full")
+        self.save_analysis_results_to_db(clustered_articles, cluster_topics, bias_analysis, category, cluster_centers, session)
+        return {
+            'category': category,
+            'clustered_articles': clustered_articles,
+            'cluster_topics': cluster_topics,
+            'bias_analysis': bias_analysis,
+            'report': report
+        }
+
+    def step2_analyze_articles(self, n_clusters=None, since=None):
+        """2단계: 기사 분석 (카테고리별 클러스터링)
+
+        Args:
+            n_clusters: 클러스터 수 (None이면 기사 수로 자동 계산)
+            since: 이 시각 이후 published_at 기사만 분석 (None이면 전체)
+        """
         print("\n" + "="*60)
         print("🧠 2단계: 기사 분석 시작 (카테고리별)")
         print("="*60)
         
-        # DB에서 기사 로드
+        # DB에서 카테고리별로 기사 로드
         print("📊 DB에서 기사 데이터 로드 중...")
-        articles = load_articles_from_db(self.supabase)
-        
-        if not articles:
-            print("❌ 분석할 기사가 없습니다.")
-            return None
-        
-        print(f"📊 총 {len(articles)}개 기사 로드 완료")
-        
-        # 카테고리별로 기사 분리
-        articles_by_category = {}
-        for article in articles:
-            category = None
-            if 'categories' in article and isinstance(article['categories'], dict):
-                category = article['categories'].get('name')
-            elif 'category' in article:
-                category = article['category']
-            if category:
-                articles_by_category.setdefault(category, []).append(article)
+        loaded_count = 0
 
         all_results = []
         report_clusters = []
         all_article_ids = set()
-        for category, articles_in_cat in articles_by_category.items():
-            if not articles_in_cat:
-                continue
-            print(f"\n[{category}] 기사 {len(articles_in_cat)}개 클러스터링 시작!")
-            n_cat_clusters = self.calculate_optimal_clusters(len(articles_in_cat)) if n_clusters is None else n_clusters
-            print(f"[DEBUG] {category} n_clusters: {n_cat_clusters}")
-            result = cluster_articles(self.openai_client, articles_in_cat, n_cat_clusters)
+        for category, articles_in_cat in self.load_articles_by_category(since):
+            loaded_count += len(articles_in_cat)
+            result = self.analyze_category(category, articles_in_cat, n_clusters)
             if result is None:
-                print(f"{category} 클러스터링 실패")
                 continue
-            clustered_articles, cluster_centers = result
-            print(f"[DEBUG] {category} 클러스터 개수: {n_cat_clusters}, 실제 클러스터링된 기사 수: {len(clustered_articles)}")
-            cluster_topics = analyze_cluster_topics(self.openai_client, clustered_articles)
-            bias_analysis = analyze_media_bias(cluster_topics)
-            report = generate_report(bias_analysis)
-            all_results.append({
-                'category': category,
-                'clustered_articles': clustered_articles,
-                'cluster_topics': cluster_topics,
-                'bias_analysis': bias_analysis,
-                'report': report
-            })
-            self.save_analysis_results_to_db(clustered_articles, cluster_topics, bias_analysis, category)
+            all_results.append(result)
+            clustered_articles = result['clustered_articles']
+            cluster_topics = result['cluster_topics']
             # 리포트용 데이터 누적 (run_cluster_save.py와 동일하게)
             for cluster_id, articles_in_cluster in enumerate(clustered_articles):
                 cluster_info = cluster_topics.get(cluster_id, {})
@@ -186,53 +217,168 @@ class BlindSpotPipeline:
                     'bias_judgement': bias_judgement,
                     'article_ids': article_ids
                 })
+        if not loaded_count:
+            print("❌ 분석할 기사가 없습니다.")
+            return None
+        print(f"📊 총 {loaded_count}개 기사 분석")
         if report_clusters:
             save_markdown_report(report_clusters, all_article_ids)
         return all_results
     
-    def save_analysis_results_to_db(self, clustered_articles, cluster_topics, bias_analysis, category=None):
-        """분석 결과를 데이터베이스에 저장 (편향성 정보 포함)"""
-        try:
-            print("📊 클러스터 정보 저장 중...")
+    def step2_analyze_incremental(self):
+        """2단계 (증분): 카테고리별 마지막 분석 이후 기사만 기존 클러스터에 병합
+
+        워터마크나 중심 벡터가 있는 클러스터가 없는 카테고리는 전체 분석으로 처리합니다.
+        """
+        print("\n" + "="*60)
+        print("🧠 2단계: 증분 기사 분석 시작 (카테고리별)")
+        print("="*60)
+
+        watermarks = {
+            category: load_analysis_watermark(self.supabase, category)
+            for category in reference_cache.category_ids(self.supabase)
+        }
+        results = []
+        for category, new_articles in self.load_articles_by_category(after_ids=watermarks):
+            clusters = load_clusters_from_db(self.supabase, category=category, with_centroids=True)
+            if watermarks.get(category) is None or not any(c.get('centroid') for c in clusters):
+                print(f"[{category}] 이전 분석 기록이 없어 전체 분석으로 진행")
+                if watermarks.get(category) is not None:
+                    # new_articles는 워터마크 이후 기사뿐이라 카테고리 전체를 다시 로드
+                    # (그대로 분석하면 기존 클러스터와 관계를 새 기사만으로 덮어씀)
+                    new_articles = load_articles_from_db(
+                        self.supabase, columns=ARTICLE_ANALYSIS_COLUMNS, categories=[category],
+                        content_chars=CONTENT_PREFIX_CHARS
+                    )
+                result = self.analyze_category(category, new_articles)
+                if result:
+                    results.append(result)
+                continue
+            print(f"\n[{category}] 워터마크 id {watermarks[category]} 이후 새 기사 {len(new_articles)}개")
+            merge_result = merge_new_articles(self.openai_client, new_articles, clusters, supabase=self.supabase)
+            if merge_result is None:
+                print(f"{category} 증분 병합 실패")
+                continue
+            session = self.build_session(
+                category, new_articles, len(merge_result['merged']) + len(merge_result['new_clusters']), "incremental"
+            )
+            report = self.save_merged_clusters(category, clusters, merge_result, session)
+            results.append({'category': category, 'report': report, **merge_result})
+        if not results:
+            print("✅ 지난 분석 이후 새 기사가 없습니다.")
+        return results
+
+    def save_merged_clusters(self, category, clusters, merge_result, session=None):
+        """증분 병합 결과 저장: 기존 클러스터는 수/중심/편향만 갱신, 새 클러스터는 주제 분석 후
+        세션 기록과 함께 한 번에 커밋 (기존 관계는 두고 추가만)
+
+        Returns:
+            str: 새 클러스터 리포트 (새 클러스터가 없으면 None)
+        """
+        clusters_by_id = {cluster['cluster_id']: cluster for cluster in clusters}
+        cluster_rows = []
+        links = []
+        for cluster_id, merged in merge_result['merged'].items():
+            cluster = clusters_by_id[cluster_id]
+            new_bias = calculate_cluster_bias_percentage(merged['articles'])['bias']
+            cluster_rows.append({
+                'cluster_id': cluster_id,
+                'category': category,
+                'topic': cluster.get('topic'),
+                'summary': cluster.get('summary'),
+                'article_count': merged['article_count'],
+                'bias': merge_bias(cluster.get('bias'), cluster.get('article_count') or 0,
+                                   new_bias, len(merged['articles'])),
+                'centroid': merged['centroid'],
+            })
+            links.extend({'cluster_id': cluster_id, 'article_id': a['id']} for a in merged['articles'] if a.get('id'))
+
+        report = None
+        if merge_result['new_clusters']:
+            report = self._add_new_clusters(category, clusters_by_id, merge_result['new_clusters'], cluster_rows, links)
+        commit_analysis_session(self.supabase, cluster_rows, links, session, replace_links=False)
+        return report
+
+    def _add_new_clusters(self, category, clusters_by_id, new_clusters, cluster_rows, links):
+        """증분 병합에서 남은 기사로 만든 새 클러스터를 주제 분석해 저장 목록에 추가 (리포트 반환)"""
+        # 새 클러스터 번호는 기존 번호 다음부터
+        next_index = 1 + max(
+            (int(str(cid).rsplit('_', 1)[-1]) for cid in clusters_by_id if str(cid).rsplit('_', 1)[-1].isdigit()),
+            default=-1
+        )
+        clustered_articles = []
+        centers = []
+        for offset, new_cluster in enumerate(new_clusters):
+            centers.append(new_cluster['centroid'])
+            for article in new_cluster['articles']:
+                clustered_articles.append({**article, 'cluster_id': next_index + offset})
+        centers = [None] * next_index + centers
+        cluster_topics = analyze_cluster_topics(self.openai_client, clustered_articles)
+        bias_analysis = analyze_media_bias(cluster_topics)
+        new_rows, new_links = self.build_cluster_rows(clustered_articles, cluster_topics, category, centers)
+        cluster_rows.extend(new_rows)
+        links.extend(new_links)
+        return generate_report(bias_analysis)
+
+    def build_cluster_rows(self, clustered_articles, cluster_topics, category=None, cluster_centers=None):
+        """클러스터링 결과를 clusters 행과 cluster_articles 관계 목록으로 변환 (편향성 정보 포함)
+
+        category가 있으면 클러스터 ID를 "카테고리_번호"로 저장하고 (run_cluster_save.py와 동일),
+        cluster_centers가 있으면 중심 벡터도 저장합니다.
+        """
+        # 클러스터별 편향성 계산
+        cluster_bias_analysis = calculate_all_clusters_bias(clustered_articles)
+        
+        # 클러스터별 기사 리스트로 변환
+        clusters_dict = {}
+        for article in clustered_articles:
+            cid = article['cluster_id']
+            if cid not in clusters_dict:
+                clusters_dict[cid] = []
+            clusters_dict[cid].append(article)
+        
+        cluster_rows = []
+        links = []
+        for cluster_id, articles_in_cluster in clusters_dict.items():
+            cluster_info = cluster_topics.get(cluster_id, {})
+            # summary만 체크
+            if not cluster_info.get('summary'):
+                print(f"❌ 파싱 실패: cluster_id={cluster_id}, summary='{cluster_info.get('summary')}'")
+                continue
             
-            # 클러스터별 편향성 계산
-            cluster_bias_analysis = calculate_all_clusters_bias(clustered_articles)
+            # 편향성 정보 가져오기
+            bias_info = cluster_bias_analysis.get(cluster_id, {}).get('bias')
             
-            # 클러스터별 기사 리스트로 변환
-            clusters_dict = {}
-            for article in clustered_articles:
-                cid = article['cluster_id']
-                if cid not in clusters_dict:
-                    clusters_dict[cid] = []
-                clusters_dict[cid].append(article)
-                
-            for cluster_id, articles_in_cluster in clusters_dict.items():
-                cluster_info = cluster_topics.get(cluster_id, {})
-                # summary만 체크
-                if not cluster_info.get('summary'):
-                    print(f"❌ 파싱 실패: cluster_id={cluster_id}, summary='{cluster_info.get('summary')}'")
-                    continue
-                
-                # 편향성 정보 가져오기
-                bias_info = cluster_bias_analysis.get(cluster_id, {}).get('bias')
-                
-                cluster_data = {
-                    'cluster_id': cluster_id,
-                    'category': category,
-                    'topic': cluster_info.get('topic', f'클러스터 {cluster_id}'),
-                    'summary': cluster_info.get('summary', ''),
-                    'article_count': len(articles_in_cluster),
-                    'bias': bias_info  # 편향성 정보 추가
-                }
-                
-                print("저장 시도:", cluster_data)
-                save_cluster_to_db(self.supabase, cluster_data)
+            db_cluster_id = f"{category}_{cluster_id}" if category else cluster_id
+            cluster_data = {
+                'cluster_id': db_cluster_id,
+                'category': category,
+                'topic': cluster_info.get('topic', f'클러스터 {cluster_id}'),
+                'summary': cluster_info.get('summary', ''),
+                'article_count': len(articles_in_cluster),
+                'bias': bias_info  # 편향성 정보 추가
+            }
+            
+            print("저장 시도:", cluster_data)
+            if cluster_centers is not None:
+                cluster_data['centroid'] = cluster_centers[cluster_id]
+            cluster_rows.append(cluster_data)
 
-                # 기사 ID 저장
-                article_ids = [a.get('id') for a in articles_in_cluster if a.get('id')]
-                if article_ids:
-                    save_cluster_articles_to_db(self.supabase, cluster_id, article_ids)
-                    
+            # 기사 ID
+            links.extend({'cluster_id': db_cluster_id, 'article_id': a['id']} for a in articles_in_cluster if a.get('id'))
+        return cluster_rows, links
+
+    def save_analysis_results_to_db(self, clustered_articles, cluster_topics, bias_analysis, category=None,
+                                    cluster_centers=None, session=None):
+        """분석 결과를 데이터베이스에 저장 (편향성 정보 포함)
+
+        클러스터, 클러스터-기사 관계, 세션 기록을 commit_analysis_session으로 한 번에 씁니다.
+        """
+        try:
+            print("📊 클러스터 정보 저장 중...")
+            cluster_rows, links = self.build_cluster_rows(clustered_articles, cluster_topics, category, cluster_centers)
+            # 전체 분석이므로 이번 세션에 없는 이 카테고리의 이전 클러스터는 함께 삭제
+            commit_analysis_session(self.supabase, cluster_rows, links, session, prune_category=category)
             print(f"✅ [{category}] 클러스터 및 편향성 정보 DB 저장 완료!")
             return True
         except Exception as e:
@@ -255,8 +401,8 @@ class BlindSpotPipeline:
         print(f"✅ 리포트 저장 완료: {report_filename}")
         return report_filename
     
-    def run_full_pipeline(self, n_clusters=None):
-        """전체 파이프라인 실행"""
+    def run_full_pipeline(self, n_clusters=None, incremental=False):
+        """전체 파이프라인 실행 (incremental=True면 2단계를 증분 분석으로)"""
         print("🚀 BlindSpot 전체 파이프라인 시작!")
         print(f"⏰ 시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
@@ -267,11 +413,24 @@ class BlindSpotPipeline:
             articles = self.step1_crawl_articles()
             
             # 2단계: 분석
-            analysis_results = self.step2_analyze_articles(n_clusters)
+            if incremental:
+                analysis_results = self.step2_analyze_incremental()
+            else:
+                analysis_results = self.step2_analyze_articles(n_clusters)
+            reports = [result['report'] for result in analysis_results or [] if result.get('report')]
+            
+            if incremental and analysis_results is not None and not reports:
+                # 기존 클러스터에만 병합되어 새 리포트가 없는 경우
+                return {
+                    'success': True,
+                    'articles_count': len(articles),
+                    'report_filename': None,
+                    'total_duration': time.time() - total_start_time
+                }
             
-            if analysis_results:
+            if reports:
                 # 리포트 저장
-                report_filename = self.save_report(analysis_results[0]['report'])
+                report_filename = self.save_report(reports[0])
                 
                 total_end_time = time.time()
                 total_duration = total_end_time - total_start_time
@@ -283,12 +442,14 @@ class BlindSpotPipeline:
                 print(f"⏱️ 총 소요 시간: {total_duration:.1f}초")
                 print(f"📊 수집된 기사: {len(articles)}개")
                 print(f"📋 분석 리포트: {report_filename}")
+                print_client_stats()
+                token_usage.print_summary()
                 
                 # 리포트 내용 출력
                 print("\n" + "="*60)
                 print("📋 분석 결과 미리보기")
                 print("="*60)
-                print(analysis_results[0]['report'][:1000] + "...")
+                print(reports[0][:1000] + "...")
                 
                 return {
                     'success': True,
@@ -323,9 +484,9 @@ def main():
     # OpenAI 모델명은 환경변수에서 불러오기
     openai_model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
     
-    # 파이프라인 실행
+    # 파이프라인 실행 (--incremental: 지난 분석 이후 기사만 기존 클러스터에 병합)
     pipeline = BlindSpotPipeline(api_key)
-    result = pipeline.run_full_pipeline(n_clusters)
+    result = pipeline.run_full_pipeline(n_clusters, incremental="--incremental" in sys.argv)
     
     if result['success']:
         print(f"\n🎉 성공적으로 완료되었습니다!")